@@ -11,12 +11,78 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
+    admin_emails: str = ""  # comma-separated accounts allowed to read the /telemetry endpoints
 
-    # Gemini API (deprecated, keeping for backwards compatibility)
+    # LLM provider
+    llm_provider: str = "groq"  # 'groq', 'gemini' or 'fake' (offline load testing)
+    llm_model: str = ""  # empty uses the provider's default model
+
+    # Gemini API (used when llm_provider is 'gemini')
     gemini_api_key: str = ""
 
-    # Groq API
-    groq_api_key: str
+    # Groq API (required when llm_provider is 'groq')
+    groq_api_key: str = ""
+
+    # Fake LLM provider (latency is log-normal around the median; sigma 0 makes it fixed)
+    llm_fake_latency_ms: float = 300.0
+    llm_fake_latency_sigma: float = 0.5
+    llm_fake_tokens_per_second: float = 250.0
+    llm_fake_completion_tokens: int = 350
+    llm_fake_error_rate: float = 0.0  # fraction of calls failing with a 503
+    llm_fake_rate_limit_rate: float = 0.0  # fraction of calls failing with a 429
+    llm_fake_seed: int = 0
+
+    # LLM HTTP connection pool (shared by every Groq call in the process)
+    llm_pool_max_connections: int = 20
+    llm_pool_max_keepalive: int = 10
+    llm_pool_keepalive_expiry_seconds: float = 60.0
+    llm_timeout_seconds: float = 60.0
+    llm_connect_timeout_seconds: float = 5.0
+
+    # LLM call telemetry (write-behind buffer flushed to llm_call_logs)
+    llm_telemetry_enabled: bool = True
+    llm_telemetry_buffer_size: int = 10000
+    llm_telemetry_batch_size: int = 200
+    llm_telemetry_flush_seconds: float = 2.0
+
+    # Application generation
+    llm_generation_strategy: str = "per_section"  # 'per_section' or 'single_call' (one JSON completion)
+    llm_section_concurrency: int = 4  # sections generated in parallel per request (1 = sequential)
+    llm_batch_concurrency: int = 8  # LLM calls in flight for one /applications/generate-batch request
+    generation_job_workers: int = 2  # background generation jobs run at once
+    generation_job_max_attempts: int = 5  # jobs are requeued while the LLM provider is unavailable
+
+    # Admission control for LLM-heavy endpoints (generate, regenerate, refine, suggestions)
+    llm_admission_max_concurrent: int = 8  # requests doing LLM work at once
+    llm_admission_max_queue: int = 32  # requests allowed to wait for a slot; beyond this they get a 503
+    llm_admission_max_queued_per_user: int = 4  # one user's share of the queue
+    llm_admission_queue_timeout_seconds: float = 20.0  # waiting longer than this returns a 503
+
+    # LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 512  # in-memory LRU size, SQLite keeps the rest
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+
+    # Idempotency-Key support on /applications/generate
+    idempotency_key_ttl_hours: int = 24
+    idempotency_claim_lease_seconds: int = 300  # an unfinished request older than this can be taken over by a retry
+
+    # Compiled grant prompt blocks kept in memory
+    prompt_grant_cache_size: int = 256
+
+    # In-process grant catalog cache (parsed grants and serialized /grants responses)
+    grant_catalog_cache_max_mb: float = 64.0  # 0 disables it; ETags still use the catalog version
+    grant_catalog_poll_seconds: float = 1.0  # how often each worker checks for grant changes
+
+    # LLM upstream governor (shared rate limits, retries and circuit breaker)
+    llm_requests_per_minute: int = 30
+    llm_tokens_per_minute: int = 12000  # adapted at runtime from x-ratelimit-* headers
+    llm_max_retries: int = 3
+    llm_retry_base_delay_seconds: float = 0.5
+    llm_retry_max_delay_seconds: float = 20.0
+    llm_rate_limit_max_wait_seconds: float = 30.0  # fail with 503 instead of queueing longer
+    llm_circuit_failure_threshold: int = 5
+    llm_circuit_reset_seconds: float = 30.0
 
     # Grants.gov API
     grants_gov_api_key: str = ""
@@ -1,3 +1,6 @@
+import os
+from datetime import datetime, timezone
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -5,6 +8,9 @@ from app.config import get_settings
 
 settings = get_settings()
 
+# backend/, where alembic.ini and migrations/ live
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Create SQLite engine
 engine = create_engine(
     settings.database_url,
@@ -18,6 +24,16 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """
+    Current UTC time for onupdate timestamps
+
+    CURRENT_TIMESTAMP only has whole seconds on SQLite, too coarse to tell
+    two edits apart in ETags and cache keys.
+    """
+    return datetime.now(timezone.utc)
+
+
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
@@ -28,10 +44,35 @@ def get_db():
 
 
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables, apply pending migrations and install the full-text grant search index"""
+    from app.services.grant_search import install_grant_search
+
     Base.metadata.create_all(bind=engine)
+    run_migrations()
+    install_grant_search(engine)
     print("Database tables created successfully!")
 
 
+def run_migrations(bind=None):
+    """
+    Upgrade the database to the latest Alembic revision
+
+    create_all only creates missing tables; migrations bring existing tables
+    (indexes, constraints, data fixes) up to date.
+
+    Args:
+        bind: Engine to migrate (defaults to the application engine)
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.attributes["configure_logger"] = False
+    with (bind or engine).begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
 if __name__ == "__main__":
     init_db()
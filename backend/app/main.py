@@ -2,7 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
 from app.database import init_db
-from app.routers import auth, profile, grants, applications
+from app.routers import auth, profile, grants, applications, telemetry
+from app.services.generation_jobs import start_job_workers, stop_job_workers
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_client import close_llm_clients
+from app.services.llm_telemetry import stop_llm_telemetry
 
 settings = get_settings()
 
@@ -31,6 +35,27 @@ app.include_router(auth.router)
 app.include_router(profile.router)
 app.include_router(grants.router)
 app.include_router(applications.router)
+app.include_router(telemetry.router)
+
+
+@app.on_event("startup")
+def start_background_workers():
+    """Start generation job workers, resume unfinished jobs and drop expired LLM cache rows"""
+    get_llm_cache().prune_expired()
+    start_job_workers()
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    """Stop generation job workers and flush buffered LLM telemetry"""
+    stop_job_workers()
+    stop_llm_telemetry()
+
+
+@app.on_event("shutdown")
+async def close_llm_connections():
+    """Close the pooled LLM client connections"""
+    await close_llm_clients()
 
 
 @app.get("/")
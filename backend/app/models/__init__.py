@@ -1,6 +1,11 @@
 from app.models.user import User, UserProfile
 from app.models.grant import Grant, GrantMatch, ScraperJob
-from app.models.application import Application, ApplicationAttachment, SuccessTemplate
+from app.models.application import (
+    Application, ApplicationAttachment, ApplicationSectionState, SuccessTemplate, GenerationJob
+)
+from app.models.llm_cache import LLMCacheEntry
+from app.models.llm_telemetry import LLMCallLog
+from app.models.idempotency import IdempotencyKey
 
 __all__ = [
     "User",
@@ -10,5 +15,10 @@ __all__ = [
     "ScraperJob",
     "Application",
     "ApplicationAttachment",
+    "ApplicationSectionState",
     "SuccessTemplate",
+    "GenerationJob",
+    "LLMCacheEntry",
+    "LLMCallLog",
+    "IdempotencyKey",
 ]
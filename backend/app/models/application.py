@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow
+from app.models.types import JSONText
 
 
 class Application(Base):
@@ -15,7 +16,7 @@ class Application(Base):
     status = Column(String, default="draft")  # 'draft', 'in_review', 'submitted', 'won', 'lost'
 
     # Content - store as JSON text
-    sections = Column(Text)  # JSON with all application sections
+    sections = Column(JSONText)  # JSON with all application sections
 
     # Output
     output_format = Column(String)  # 'pdf', 'docx'
@@ -29,12 +30,13 @@ class Application(Base):
 
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     # Relationships
     user = relationship("User", back_populates="applications")
     grant = relationship("Grant", back_populates="applications")
     attachments = relationship("ApplicationAttachment", back_populates="application", cascade="all, delete-orphan")
+    section_states = relationship("ApplicationSectionState", back_populates="application", cascade="all, delete-orphan")
 
 
 class ApplicationAttachment(Base):
@@ -53,6 +55,24 @@ class ApplicationAttachment(Base):
     application = relationship("Application", back_populates="attachments")
 
 
+class ApplicationSectionState(Base):
+    __tablename__ = "application_section_states"
+    __table_args__ = (UniqueConstraint("application_id", "section_name"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
+    section_name = Column(String, nullable=False)
+
+    fingerprint = Column(String)  # inputs the section was generated from; NULL when generation failed
+    user_edited = Column(Boolean, default=False)  # edited or refined since generation, kept on regenerate
+
+    generated_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    application = relationship("Application", back_populates="section_states")
+
+
 class SuccessTemplate(Base):
     __tablename__ = "success_templates"
 
@@ -68,3 +88,30 @@ class SuccessTemplate(Base):
 
     # Relationships
     application = relationship("Application")
+
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    grant_id = Column(Integer, ForeignKey("grants.id"), nullable=False)
+    application_id = Column(Integer, ForeignKey("applications.id"))  # set once the application is saved
+
+    # Status
+    status = Column(String, default="queued", index=True)  # 'queued', 'running', 'completed', 'failed'
+    attempts = Column(Integer, default=0)
+    error_message = Column(Text)
+
+    # Inputs and progress - store as JSON text
+    org_data = Column(JSONText)  # JSON: organization data used for generation
+    section_status = Column(JSONText)  # JSON: {section_name: 'pending' | 'completed' | 'failed'}
+    sections = Column(JSONText)  # JSON: sections completed so far, kept so restarts can resume
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+
+    # Relationships
+    application = relationship("Application")
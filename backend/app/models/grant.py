@@ -1,11 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow
+from app.models.types import JSONText
 
 
 class Grant(Base):
     __tablename__ = "grants"
+    # Listing filters combined with the deadline ordering (added to existing databases by a migration)
+    __table_args__ = (
+        Index("ix_grants_status_deadline", "status", "deadline"),
+        Index("ix_grants_source_type_deadline", "source_type", "deadline"),
+        Index("ix_grants_status_source_type_deadline", "status", "source_type", "deadline"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -27,8 +34,8 @@ class Grant(Base):
     application_opens = Column(DateTime(timezone=True))
 
     # Requirements
-    eligibility_criteria = Column(Text)  # JSON
-    required_documents = Column(Text)  # JSON array
+    eligibility_criteria = Column(JSONText)  # JSON
+    required_documents = Column(JSONText)  # JSON array
 
     # Application Info
     application_url = Column(String)
@@ -37,12 +44,12 @@ class Grant(Base):
 
     # Targeting
     geographic_restriction = Column(String)  # 'statewide', 'rural', specific counties
-    target_populations = Column(Text)  # JSON array
-    funding_priorities = Column(Text)  # JSON array
+    target_populations = Column(JSONText)  # JSON array
+    funding_priorities = Column(JSONText)  # JSON array
 
     # Metadata
     discovered_at = Column(DateTime(timezone=True), server_default=func.now())
-    last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
     status = Column(String, default="active")  # 'active', 'closed', 'archived'
 
     # Relationships
@@ -52,6 +59,11 @@ class Grant(Base):
 
 class GrantMatch(Base):
     __tablename__ = "grant_matches"
+    # One row per (user, grant), upserted by the matcher; listed best first (added by a migration)
+    __table_args__ = (
+        Index("uq_grant_matches_user_grant", "user_id", "grant_id", unique=True),
+        Index("ix_grant_matches_user_overall", "user_id", "overall_score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -64,9 +76,11 @@ class GrantMatch(Base):
     overall_score = Column(Float)  # weighted composite
 
     # Explanation
-    match_reasons = Column(Text)  # JSON array of why it matches
+    match_reasons = Column(JSONText)  # JSON array of why it matches
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    scored_at = Column(DateTime(timezone=True))  # when the scores were last computed
+    catalog_version = Column(Integer)  # grant catalog version they were computed from
 
     # Relationships
     user = relationship("User", back_populates="grant_matches")
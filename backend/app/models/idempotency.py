@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String, nullable=False)  # client-supplied Idempotency-Key header
+    request_hash = Column(String, nullable=False)  # sha256 of the request body, to reject key reuse
+
+    application_id = Column(Integer, ForeignKey("applications.id"))  # NULL while the request is in progress
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    claimed_at = Column(DateTime(timezone=True))  # start of the current attempt; its lease runs from here
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache_entries"
+
+    key = Column(String, primary_key=True)  # sha256 of (model, temperature, messages, max_tokens)
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
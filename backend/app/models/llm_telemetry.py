@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class LLMCallLog(Base):
+    __tablename__ = "llm_call_logs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # What was called
+    operation = Column(String, nullable=False, index=True)  # 'section', 'single_call', 'stream_section', 'refine', 'suggestion'
+    section = Column(String, index=True)  # section or personalization field name
+    user_id = Column(Integer, index=True)
+    model = Column(String)
+
+    # Outcome
+    cache_status = Column(String)  # 'hit', 'miss', 'bypass', 'disabled'
+    outcome = Column(String, nullable=False)  # 'success', 'error', 'cancelled'
+    error_type = Column(String)
+    error_message = Column(Text)
+
+    # Timing (milliseconds)
+    latency_ms = Column(Float)
+    ttft_ms = Column(Float)  # time to first token, streaming calls only
+
+    # Token usage reported by the provider
+    prompt_tokens = Column(Integer)
+    completion_tokens = Column(Integer)
+    total_tokens = Column(Integer)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -0,0 +1,32 @@
+"""
+Column types shared by the models
+"""
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+from app.utils import json_codec
+
+
+class JSONText(TypeDecorator):
+    """
+    JSON value stored as TEXT, encoded and decoded with the shared orjson codec
+
+    Attributes hold the decoded value (list, dict, ...); None is stored as SQL
+    NULL. SQLite has no JSON storage type, so the column stays TEXT and the
+    FTS index and raw SQL keep seeing the JSON text.
+
+    Changes are detected by assignment only: copy the value, change the copy
+    and assign it back. Mutating the loaded list or dict in place is not saved.
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return json_codec.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or value == "":
+            return None
+        return json_codec.loads(value)
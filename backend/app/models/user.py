@@ -1,7 +1,8 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow
+from app.models.types import JSONText
 
 
 class User(Base):
@@ -55,16 +56,16 @@ class UserProfile(Base):
     # Licensing & Accreditation
     licensed = Column(Boolean, default=False)
     license_number = Column(String)
-    accreditations = Column(Text)  # JSON array
+    accreditations = Column(JSONText)  # JSON array
 
     # Target Populations
-    populations_served = Column(Text)  # JSON array: low-income, disabilities, etc.
+    populations_served = Column(JSONText)  # JSON array: low-income, disabilities, etc.
     rural_or_urban = Column(String)
 
     # Additional flexible fields
-    additional_info = Column(Text)  # JSON for custom fields
+    additional_info = Column(JSONText)  # JSON for custom fields
 
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     # Relationships
     user = relationship("User", back_populates="profile")
@@ -1,62 +1,147 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models.user import User
 from app.models.grant import Grant
-from app.models.application import Application
+from app.models.application import Application, GenerationJob
+from app.models.idempotency import IdempotencyKey
 from app.schemas.application import (
     ApplicationGenerateRequest,
     ApplicationGenerateResponse,
+    ApplicationBatchGenerateRequest,
+    ApplicationBatchGenerateResponse,
+    ApplicationBatchResult,
     ApplicationRefineRequest,
+    ApplicationRegenerateRequest,
+    ApplicationRegenerateResponse,
     ApplicationResponse,
-    ApplicationListResponse
+    ApplicationListResponse,
+    GenerationJobBatchRequest,
+    GenerationJobBatchResponse,
+    GenerationJobResponse
+)
+from app.services.llm_service import (
+    SECTION_PROMPTS,
+    agenerate_grant_application,
+    generate_grant_applications,
+    is_section_fallback,
+    section_fingerprint,
+    stream_grant_application,
+    arefine_section,
+    PERSONALIZATION_FIELDS,
+    personalization_org_data,
+    agenerate_personalization_suggestion,
+    agenerate_personalization_suggestions
 )
-from app.services.llm_service import generate_grant_application, refine_section, generate_personalization_suggestion
 from app.services.auth_service import get_current_user
-from typing import Dict, Any
-from pydantic import BaseModel
-import json
+from app.services.admission import llm_admission
+from app.services.application_service import grant_prompt_data, record_generated_sections, mark_sections_edited
+from app.services.generation_jobs import create_generation_job, create_generation_jobs
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.http_cache import weak_etag, not_modified_response, set_validators
+from app.services.llm_governor import LLMUnavailableError
+from app.services.idempotency import (
+    request_hash,
+    claim_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key
+)
+from app.utils import json_codec
+from typing import Dict, Any, Awaitable, List, Optional, Tuple, TypeVar
+from pydantic import BaseModel, Field
+import asyncio
+import math
 from datetime import datetime
 
+T = TypeVar("T")
+
 router = APIRouter(prefix="/applications", tags=["applications"])
 
+# How often a handler waiting on the LLM checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+async def _cancel_on_disconnect(http_request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await LLM work, cancelling it as soon as the client disconnects
+
+    Raises:
+        HTTPException: 499 when the client went away (nobody receives the response)
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                print(f"Client disconnected from {http_request.url.path}; cancelling LLM calls")
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def _llm_unavailable(error: LLMUnavailableError) -> HTTPException:
+    """503 telling the client when the LLM provider is worth trying again"""
+    retry_after = max(1, math.ceil(error.retry_after or 0))
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"The AI service is busy or unavailable. Please try again in {retry_after} seconds.",
+        headers={"Retry-After": str(retry_after)}
+    )
+
 
-@router.post("/generate", response_model=ApplicationGenerateResponse, status_code=status.HTTP_201_CREATED)
-def generate_application(
+@router.post(
+    "/generate",
+    response_model=ApplicationGenerateResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(llm_admission)]
+)
+async def generate_application(
     request: ApplicationGenerateRequest,
+    http_request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Generate a grant application using AI based on grant details and organization data
+
+    With an Idempotency-Key header, retrying the same request returns the
+    application created by the first one (200, Idempotent-Replayed: true)
+    instead of generating again. Section calls are cancelled if the client
+    disconnects before generation finishes. Database work runs in worker
+    threads so the event loop is never blocked on SQLite.
     """
-    # Fetch the grant
-    grant = db.query(Grant).filter(Grant.id == request.grant_id).first()
-    if not grant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Grant with id {request.grant_id} not found"
-        )
+    user_id = current_user.id
+    body_hash = request_hash(request.model_dump()) if idempotency_key else None
 
-    # Prepare grant data for LLM
-    # Parse JSON fields
-    eligibility_criteria = json.loads(grant.eligibility_criteria) if grant.eligibility_criteria else []
-    funding_priorities = json.loads(grant.funding_priorities) if grant.funding_priorities else []
-    required_documents = json.loads(grant.required_documents) if grant.required_documents else []
-
-    grant_data = {
-        "title": grant.title,
-        "source_name": grant.source_name,
-        "source_type": grant.source_type,
-        "description": grant.description,
-        "amount_min": grant.amount_min,
-        "amount_max": grant.amount_max,
-        "deadline": grant.deadline.isoformat() if grant.deadline else None,
-        "eligibility_criteria": eligibility_criteria,
-        "funding_priorities": funding_priorities,
-        "required_documents": required_documents,
-        "geographic_restriction": grant.geographic_restriction
-    }
+    def load() -> Tuple[Dict[str, Any], Optional[ApplicationGenerateResponse]]:
+        """Grant data for the prompt, and the earlier response if the Idempotency-Key was used before"""
+        grant = db.query(Grant).filter(Grant.id == request.grant_id).first()
+        if not grant:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Grant with id {request.grant_id} not found"
+            )
+        grant_data = grant_prompt_data(grant)
+        if idempotency_key:
+            existing = claim_idempotency_key(db, user_id, idempotency_key, body_hash)
+            if existing:
+                return grant_data, _replay_generate(db, existing, body_hash, grant, current_user, response)
+        return grant_data, None
+
+    grant_data, replayed = await asyncio.to_thread(load)
+    if replayed:
+        return replayed
+
+    async def release_key() -> None:
+        if idempotency_key:
+            await asyncio.to_thread(release_idempotency_key, db, user_id, idempotency_key)
 
     # Prepare org data for LLM
     org_data = {
@@ -73,19 +158,22 @@ def generate_application(
     try:
         print(f"Generating application for grant: {grant_data.get('title')}")
         print(f"Organization: {org_data.get('organization_name')}")
-        sections = generate_grant_application(grant_data, org_data)
+        sections = await _cancel_on_disconnect(
+            http_request,
+            agenerate_grant_application(grant_data, org_data, use_cache=request.use_cache, user_id=user_id)
+        )
         print(f"Generated sections: {list(sections.keys())}")
+    except LLMUnavailableError as e:
+        await release_key()
+        raise _llm_unavailable(e)
+    except (HTTPException, asyncio.CancelledError):
+        await release_key()
+        raise
     except Exception as e:
         print(f"Error generating application: {e}")
         import traceback
         traceback.print_exc()
-        error_msg = str(e)
-        # Check for quota errors
-        if "429" in error_msg or "quota" in error_msg.lower():
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Gemini API quota exceeded. The free tier has daily limits. Please try again later or upgrade your Gemini API plan at https://ai.google.dev/pricing"
-            )
+        await release_key()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate application: {str(e)}"
@@ -93,51 +181,399 @@ def generate_application(
 
     # Check if there's an error in the response
     if "error" in sections:
+        await release_key()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"AI generation error: {sections.get('error')}"
         )
 
-    # Create application record in database
+    def save() -> ApplicationGenerateResponse:
+        # Create application record in database
+        application = Application(
+            user_id=user_id,
+            grant_id=request.grant_id,
+            status="draft",
+            sections=sections,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+
+        db.add(application)
+        db.flush()
+        record_generated_sections(db, application.id, sections, grant_data, org_data)
+        if idempotency_key:
+            complete_idempotency_key(db, user_id, idempotency_key, application.id)
+        db.commit()
+        db.refresh(application)
+
+        return ApplicationGenerateResponse(
+            id=application.id,
+            grant_id=application.grant_id,
+            grant_title=grant_data.get("title"),
+            status=application.status,
+            sections=application.sections or {},
+            created_at=application.created_at
+        )
+
+    return await asyncio.to_thread(save)
+
+
+def _replay_generate(
+    db: Session,
+    existing: IdempotencyKey,
+    body_hash: str,
+    grant: Grant,
+    current_user: User,
+    response: Response
+) -> ApplicationGenerateResponse:
+    """Answer a generate request whose Idempotency-Key was already used"""
+    if existing.request_hash != body_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request"
+        )
+    if existing.application_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still in progress",
+            headers={"Retry-After": "5"}
+        )
+
+    application = db.query(Application).filter(
+        Application.id == existing.application_id,
+        Application.user_id == current_user.id
+    ).first()
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The application created for this Idempotency-Key no longer exists"
+        )
+
+    response.status_code = status.HTTP_200_OK
+    response.headers["Idempotent-Replayed"] = "true"
+    return ApplicationGenerateResponse(
+        id=application.id,
+        grant_id=grant.id,
+        grant_title=grant.title,
+        status=application.status,
+        sections=application.sections or {},
+        created_at=application.created_at
+    )
+
+
+@router.post(
+    "/generate-batch",
+    response_model=ApplicationBatchGenerateResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(llm_admission)]
+)
+def generate_applications_batch(
+    request: ApplicationBatchGenerateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate applications for one organization against several grants
+
+    All LLM calls in the batch share one bounded pool, and the drafts are
+    inserted together in a single transaction. Grants that fail are reported
+    per grant without affecting the others.
+
+    The response only comes once every grant is done, so a batch is limited
+    to 5 grants, about what the default LLM rate limit gets through in one
+    request. Use POST /applications/jobs/batch for larger batches or to
+    follow progress grant by grant.
+    """
+    grant_ids = list(dict.fromkeys(request.grant_ids))
+    grants = {grant.id: grant for grant in db.query(Grant).filter(Grant.id.in_(grant_ids))}
+    if not grants:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="None of the requested grants were found"
+        )
+
+    org_data = request.org_data.model_dump()
+
+    def report_progress(grant_id: int, result: Any) -> None:
+        outcome = "failed" if isinstance(result, Exception) else "completed"
+        print(f"  Batch: grant {grant_id} {outcome}")
+
+    grant_data = {grant_id: grant_prompt_data(grant) for grant_id, grant in grants.items()}
+    generated = generate_grant_applications(
+        grant_data,
+        org_data,
+        use_cache=request.use_cache,
+        on_grant_complete=report_progress,
+        user_id=current_user.id
+    )
+
+    now = datetime.utcnow()
+    applications = {
+        grant_id: Application(
+            user_id=current_user.id,
+            grant_id=grant_id,
+            status="draft",
+            sections=sections,
+            created_at=now,
+            updated_at=now
+        )
+        for grant_id, sections in generated.items() if not isinstance(sections, Exception)
+    }
+    if not applications:
+        unavailable = next(
+            (error for error in generated.values() if isinstance(error, LLMUnavailableError)), None
+        )
+        if unavailable:
+            raise _llm_unavailable(unavailable)
+
+    # One transaction for every draft in the batch
+    db.add_all(applications.values())
+    db.flush()
+    for grant_id, application in applications.items():
+        record_generated_sections(db, application.id, generated[grant_id], grant_data[grant_id], org_data)
+    db.commit()
+
+    results = []
+    for grant_id in grant_ids:
+        grant = grants.get(grant_id)
+        if not grant:
+            results.append(ApplicationBatchResult(grant_id=grant_id, status="not_found", error="Grant not found"))
+            continue
+        sections = generated[grant_id]
+        if isinstance(sections, Exception):
+            results.append(ApplicationBatchResult(
+                grant_id=grant_id, status="failed", grant_title=grant.title, error=str(sections)
+            ))
+            continue
+        results.append(ApplicationBatchResult(
+            grant_id=grant_id,
+            status="completed",
+            application_id=applications[grant_id].id,
+            grant_title=grant.title,
+            failed_sections=[name for name, content in sections.items() if is_section_fallback(content)]
+        ))
+
+    return ApplicationBatchGenerateResponse(
+        results=results,
+        completed=len(applications),
+        failed=len(results) - len(applications)
+    )
+
+
+def _sse_event(event: Dict[str, Any]) -> str:
+    """Format an event dictionary as a Server-Sent Events message"""
+    payload = {key: value for key, value in event.items() if key != "event"}
+    return f"event: {event['event']}\ndata: {json_codec.dumps(payload)}\n\n"
+
+
+@router.post(
+    "/generate/stream",
+    dependencies=[Depends(llm_admission)]
+)
+def generate_application_stream(
+    request: ApplicationGenerateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate a grant application, streaming progress as Server-Sent Events
+
+    Emits an `application` event with the new draft id, then `section_start`,
+    `delta` and `section_complete` events as each section streams in, and a final
+    `done` event. Each section is saved to the draft as soon as it completes.
+    """
+    grant = db.query(Grant).filter(Grant.id == request.grant_id).first()
+    if not grant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Grant with id {request.grant_id} not found"
+        )
+
+    grant_data = grant_prompt_data(grant)
+    org_data = request.org_data.model_dump()
+
+    # Create the draft up front so completed sections have somewhere to go
     application = Application(
         user_id=current_user.id,
         grant_id=grant.id,
         status="draft",
-        sections=json.dumps(sections),  # Store as JSON string
+        sections={},
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
-
     db.add(application)
     db.commit()
-    db.refresh(application)
+    application_id = application.id
+
+    def event_stream():
+        # The request session is not safe to use once the response has started
+        stream_db = SessionLocal()
+        try:
+            yield _sse_event({"event": "application", "application_id": application_id, "grant_id": grant.id})
+
+            completed = {}
+            for event in stream_grant_application(grant_data, org_data, user_id=current_user.id):
+                # Sections skipped because the provider was unavailable stay out of the draft
+                if event["event"] == "section_complete" and event["content"] is not None:
+                    completed[event["section"]] = event["content"]
+                    draft = stream_db.query(Application).filter(Application.id == application_id).first()
+                    draft.sections = {name: completed[name] for name in SECTION_PROMPTS if name in completed}
+                    draft.updated_at = datetime.utcnow()
+                    record_generated_sections(
+                        stream_db, application_id, {event["section"]: event["content"]}, grant_data, org_data
+                    )
+                    stream_db.commit()
+                yield _sse_event(event)
+
+            yield _sse_event({"event": "done", "application_id": application_id})
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Stop reverse proxies from buffering the stream
+        }
+    )
 
-    return ApplicationGenerateResponse(
-        id=application.id,
-        grant_id=grant.id,
-        grant_title=grant.title,
-        status=application.status,
-        sections=json.loads(application.sections) if application.sections else {},
-        created_at=application.created_at
+
+def _job_response(job: GenerationJob) -> GenerationJobResponse:
+    """Build the status response for a generation job"""
+    section_status = job.section_status or {}
+    return GenerationJobResponse(
+        id=job.id,
+        grant_id=job.grant_id,
+        status=job.status,
+        application_id=job.application_id,
+        section_status=section_status,
+        completed_sections=sum(1 for value in section_status.values() if value != "pending"),
+        total_sections=len(section_status),
+        error_message=job.error_message,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at
     )
 
 
+@router.post("/jobs", response_model=GenerationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_generation_job_endpoint(
+    request: ApplicationGenerateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Queue a grant application for background generation
+
+    Returns immediately with the job; poll GET /applications/jobs/{job_id} for
+    per-section progress and the application id once it completes.
+    """
+    grant = db.query(Grant).filter(Grant.id == request.grant_id).first()
+    if not grant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Grant with id {request.grant_id} not found"
+        )
+
+    job = create_generation_job(db, current_user.id, grant.id, request.org_data.model_dump())
+    return _job_response(job)
+
+
+@router.post("/jobs/batch", response_model=GenerationJobBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_generation_jobs_batch(
+    request: GenerationJobBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Queue background generation for one organization against several grants
+
+    Returns immediately with one job per grant found; poll
+    GET /applications/jobs/{job_id} for each grant's progress and application.
+    """
+    grant_ids = list(dict.fromkeys(request.grant_ids))
+    found = {grant_id for (grant_id,) in db.query(Grant.id).filter(Grant.id.in_(grant_ids))}
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="None of the requested grants were found"
+        )
+
+    jobs = create_generation_jobs(
+        db, current_user.id, [grant_id for grant_id in grant_ids if grant_id in found], request.org_data.model_dump()
+    )
+    return GenerationJobBatchResponse(
+        jobs=[_job_response(job) for job in jobs],
+        not_found=[grant_id for grant_id in grant_ids if grant_id not in found]
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=GenerationJobResponse)
+def get_generation_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the status and per-section progress of a generation job
+    """
+    job = db.query(GenerationJob).filter(
+        GenerationJob.id == job_id,
+        GenerationJob.user_id == current_user.id
+    ).first()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Generation job with id {job_id} not found"
+        )
+
+    return _job_response(job)
+
+
 @router.get("", response_model=ApplicationListResponse)
 def list_applications(
-    page: int = 1,
-    page_size: int = 20,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page"),
+    include_total: Optional[bool] = Query(None, description="Count all applications (default: only without a cursor)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    List all applications for the current user
-    """
-    offset = (page - 1) * page_size
+    List all applications for the current user, newest first
 
+    Pass next_cursor back as cursor to get the following page without an
+    OFFSET scan; page still works for compatibility. The total is counted on
+    the first request only unless include_total is set.
+    """
     # Get applications with grant info
     query = db.query(Application).filter(Application.user_id == current_user.id)
-    total = query.count()
-    applications = query.order_by(Application.created_at.desc()).offset(offset).limit(page_size).all()
+    if include_total is None:
+        include_total = cursor is None
+    total = query.count() if include_total else None
+
+    # Ids are assigned in creation order. created_at is not used as the sort key:
+    # its server default is stored without microseconds, so it doesn't compare
+    # reliably with a datetime bound from a cursor.
+    query = query.order_by(Application.id.desc())
+    if cursor:
+        try:
+            (last_id,) = decode_cursor(cursor, "applications:id", 1)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.filter(Application.id < last_id)
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    # One extra row tells whether there is a next page
+    applications = query.limit(page_size + 1).all()
+    next_cursor = None
+    if len(applications) > page_size:
+        applications = applications[:page_size]
+        last = applications[-1]
+        next_cursor = encode_cursor("applications:id", [last.id])
 
     # Format response
     application_list = []
@@ -149,7 +585,7 @@ def list_applications(
                 grant_id=app.grant_id,
                 grant_title=grant.title if grant else "Unknown Grant",
                 status=app.status,
-                sections=json.loads(app.sections) if app.sections else {},
+                sections=app.sections or {},
                 created_at=app.created_at,
                 updated_at=app.updated_at
             )
@@ -158,20 +594,41 @@ def list_applications(
     return ApplicationListResponse(
         applications=application_list,
         total=total,
-        page=page,
-        page_size=page_size
+        page=None if cursor else page,
+        page_size=page_size,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{application_id}", response_model=ApplicationResponse)
 def get_application(
     application_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get a specific application by ID
+
+    Answers 304 when the client's copy is current, decided from the
+    application's and grant's timestamps before sections are loaded.
     """
+    validators = db.query(Application.updated_at, Grant.last_updated).outerjoin(
+        Grant, Grant.id == Application.grant_id
+    ).filter(
+        Application.id == application_id,
+        Application.user_id == current_user.id
+    ).first()
+    if validators and validators.updated_at is not None:
+        # The grant title is part of the response
+        etag = weak_etag("application", application_id, validators.updated_at, validators.last_updated)
+        last_modified = max(filter(None, validators))
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+        set_validators(response, etag, last_modified)
+
     application = db.query(Application).filter(
         Application.id == application_id,
         Application.user_id == current_user.id
@@ -190,72 +647,197 @@ def get_application(
         grant_id=application.grant_id,
         grant_title=grant.title if grant else "Unknown Grant",
         status=application.status,
-        sections=json.loads(application.sections) if application.sections else {},
+        sections=application.sections or {},
         created_at=application.created_at,
         updated_at=application.updated_at
     )
 
 
-@router.post("/{application_id}/refine", response_model=ApplicationResponse)
-def refine_application_section(
+@router.post(
+    "/{application_id}/regenerate",
+    response_model=ApplicationRegenerateResponse,
+    dependencies=[Depends(llm_admission)]
+)
+async def regenerate_application(
+    application_id: int,
+    request: ApplicationRegenerateRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Regenerate only the sections whose inputs changed since they were generated
+
+    Each section's fingerprint (prompt version plus the grant and organization
+    fields it uses) is compared with the current inputs. Unchanged sections are
+    kept, and so are sections the user edited unless include_edited is set.
+    """
+    user_id = current_user.id
+    org_data = request.org_data.model_dump()
+
+    def plan() -> Tuple[Dict[str, Any], List[str], List[str], List[str]]:
+        """Grant data for the prompt, and the stale, kept and kept-because-edited sections"""
+        application = db.query(Application).filter(
+            Application.id == application_id,
+            Application.user_id == user_id
+        ).first()
+
+        if not application:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Application with id {application_id} not found"
+            )
+
+        grant = db.query(Grant).filter(Grant.id == application.grant_id).first()
+        if not grant:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Grant with id {application.grant_id} not found"
+            )
+
+        grant_data = grant_prompt_data(grant)
+        sections = application.sections or {}
+        states = {state.section_name: state for state in application.section_states}
+
+        stale, kept, kept_edited = [], [], []
+        for section_name in SECTION_PROMPTS:
+            state = states.get(section_name)
+            if section_name in sections and state and state.user_edited and not request.include_edited:
+                kept_edited.append(section_name)
+            elif (
+                section_name not in sections
+                or state is None
+                or state.fingerprint != section_fingerprint(section_name, grant_data, org_data)
+            ):
+                stale.append(section_name)
+            else:
+                kept.append(section_name)
+        return grant_data, stale, kept, kept_edited
+
+    grant_data, stale, kept, kept_edited = await asyncio.to_thread(plan)
+
+    regenerated = {}
+    if stale:
+        try:
+            regenerated = await _cancel_on_disconnect(http_request, agenerate_grant_application(
+                grant_data,
+                org_data,
+                section_names=stale,
+                use_cache=request.use_cache,
+                user_id=user_id
+            ))
+        except LLMUnavailableError as e:
+            raise _llm_unavailable(e)
+
+    def save() -> ApplicationRegenerateResponse:
+        application = db.query(Application).filter(Application.id == application_id).first()
+        if regenerated:
+            # Re-read: the user may have saved other sections while these were generating
+            sections = dict(application.sections or {})
+            sections.update(regenerated)
+            ordered = {name: sections[name] for name in SECTION_PROMPTS if name in sections}
+            ordered.update({name: content for name, content in sections.items() if name not in ordered})
+            application.sections = ordered
+            application.updated_at = datetime.utcnow()
+            record_generated_sections(db, application.id, regenerated, grant_data, org_data)
+            db.commit()
+            db.refresh(application)
+
+        return ApplicationRegenerateResponse(
+            id=application.id,
+            grant_id=application.grant_id,
+            grant_title=grant_data.get("title"),
+            status=application.status,
+            sections=application.sections or {},
+            created_at=application.created_at,
+            updated_at=application.updated_at,
+            regenerated_sections=stale,
+            kept_sections=kept,
+            kept_user_edited=kept_edited
+        )
+
+    return await asyncio.to_thread(save)
+
+
+@router.post(
+    "/{application_id}/refine",
+    response_model=ApplicationResponse,
+    dependencies=[Depends(llm_admission)]
+)
+async def refine_application_section(
     application_id: int,
     request: ApplicationRefineRequest,
+    http_request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Refine a specific section of an application based on user feedback
     """
-    # Get the application
-    application = db.query(Application).filter(
-        Application.id == application_id,
-        Application.user_id == current_user.id
-    ).first()
+    user_id = current_user.id
 
-    if not application:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Application with id {application_id} not found"
-        )
+    def load_section() -> str:
+        application = db.query(Application).filter(
+            Application.id == application_id,
+            Application.user_id == user_id
+        ).first()
 
-    # Check if the section exists
-    sections = json.loads(application.sections) if application.sections else {}
-    if request.section_name not in sections:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Section '{request.section_name}' not found in application"
-        )
+        if not application:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Application with id {application_id} not found"
+            )
 
-    # Refine the section using LLM
-    try:
-        original_text = sections[request.section_name]
-        refined_text = refine_section(original_text, request.feedback)
+        sections = application.sections or {}
+        if request.section_name not in sections:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Section '{request.section_name}' not found in application"
+            )
+        return sections[request.section_name]
 
-        # Update the section
+    def save(refined_text: str) -> ApplicationResponse:
+        application = db.query(Application).filter(Application.id == application_id).first()
+        # A copy: JSON columns are saved on assignment
+        sections = dict(application.sections or {})
         sections[request.section_name] = refined_text
-        application.sections = json.dumps(sections)
+        application.sections = sections
         application.updated_at = datetime.utcnow()
+        mark_sections_edited(db, application.id, [request.section_name])
 
         db.commit()
         db.refresh(application)
+
+        grant = db.query(Grant).filter(Grant.id == application.grant_id).first()
+        return ApplicationResponse(
+            id=application.id,
+            grant_id=application.grant_id,
+            grant_title=grant.title if grant else "Unknown Grant",
+            status=application.status,
+            sections=application.sections or {},
+            created_at=application.created_at,
+            updated_at=application.updated_at
+        )
+
+    original_text = await asyncio.to_thread(load_section)
+
+    # Refine the section using LLM
+    try:
+        refined_text = await _cancel_on_disconnect(
+            http_request,
+            arefine_section(original_text, request.feedback, use_cache=request.use_cache, user_id=user_id)
+        )
+        return await asyncio.to_thread(save, refined_text)
+    except LLMUnavailableError as e:
+        raise _llm_unavailable(e)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to refine section: {str(e)}"
         )
 
-    grant = db.query(Grant).filter(Grant.id == application.grant_id).first()
-
-    return ApplicationResponse(
-        id=application.id,
-        grant_id=application.grant_id,
-        grant_title=grant.title if grant else "Unknown Grant",
-        status=application.status,
-        sections=json.loads(application.sections) if application.sections else {},
-        created_at=application.created_at,
-        updated_at=application.updated_at
-    )
-
 
 @router.put("/{application_id}", response_model=ApplicationResponse)
 def update_application(
@@ -278,8 +860,12 @@ def update_application(
             detail=f"Application with id {application_id} not found"
         )
 
-    # Update sections
-    application.sections = json.dumps(sections)
+    # Update sections, remembering which ones the user changed
+    previous = application.sections or {}
+    mark_sections_edited(db, application.id, [
+        name for name, content in sections.items() if previous.get(name) != content
+    ])
+    application.sections = sections
     application.updated_at = datetime.utcnow()
 
     db.commit()
@@ -292,7 +878,7 @@ def update_application(
         grant_id=application.grant_id,
         grant_title=grant.title if grant else "Unknown Grant",
         status=application.status,
-        sections=json.loads(application.sections) if application.sections else {},
+        sections=application.sections or {},
         created_at=application.created_at,
         updated_at=application.updated_at
     )
@@ -324,8 +910,7 @@ def delete_application(
     return None
 
 
-class PersonalizationSuggestionRequest(BaseModel):
-    field_name: str
+class PersonalizationOrgData(BaseModel):
     organization_name: str = ""
     organization_type: str = "Child Care Center"
     city: str = ""
@@ -333,6 +918,11 @@ class PersonalizationSuggestionRequest(BaseModel):
     current_enrollment: int = 0
     operating_budget: float = 0
     staff_count: int = 0
+    use_cache: bool = True
+
+
+class PersonalizationSuggestionRequest(PersonalizationOrgData):
+    field_name: str
 
 
 class PersonalizationSuggestionResponse(BaseModel):
@@ -340,32 +930,84 @@ class PersonalizationSuggestionResponse(BaseModel):
     suggestion: str
 
 
-@router.post("/personalization-suggestion", response_model=PersonalizationSuggestionResponse)
-def get_personalization_suggestion(
+class PersonalizationSuggestionsRequest(PersonalizationOrgData):
+    field_names: List[str] = Field(default_factory=lambda: list(PERSONALIZATION_FIELDS), min_length=1)
+
+
+class PersonalizationSuggestionsResponse(BaseModel):
+    suggestions: Dict[str, str]
+
+
+@router.post(
+    "/personalization-suggestion",
+    response_model=PersonalizationSuggestionResponse,
+    dependencies=[Depends(llm_admission)]
+)
+async def get_personalization_suggestion(
     request: PersonalizationSuggestionRequest,
+    http_request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """
     Generate an AI suggestion for a personalization field based on basic organization data
     """
-    org_data = {
-        "organization_name": request.organization_name,
-        "organization_type": request.organization_type,
-        "city": request.city,
-        "mission_statement": request.mission_statement,
-        "current_enrollment": request.current_enrollment,
-        "operating_budget": request.operating_budget,
-        "staff_count": request.staff_count
-    }
+    org_data = personalization_org_data(request.model_dump())
 
     try:
-        suggestion = generate_personalization_suggestion(request.field_name, org_data)
+        suggestion = await _cancel_on_disconnect(http_request, agenerate_personalization_suggestion(
+            request.field_name, org_data, use_cache=request.use_cache, user_id=current_user.id
+        ))
         return PersonalizationSuggestionResponse(
             field_name=request.field_name,
             suggestion=suggestion
         )
+    except LLMUnavailableError as e:
+        raise _llm_unavailable(e)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate suggestion: {str(e)}"
         )
+
+
+@router.post(
+    "/personalization-suggestions",
+    response_model=PersonalizationSuggestionsResponse,
+    dependencies=[Depends(llm_admission)]
+)
+async def get_personalization_suggestions(
+    request: PersonalizationSuggestionsRequest,
+    http_request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate AI suggestions for several personalization fields in one request
+
+    Fields are generated concurrently. Suggestions precomputed when the profile
+    was saved are served from the cache.
+    """
+    unknown = [name for name in request.field_names if name not in PERSONALIZATION_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown personalization fields: {', '.join(unknown)}"
+        )
+
+    org_data = personalization_org_data(request.model_dump())
+
+    try:
+        suggestions = await _cancel_on_disconnect(http_request, agenerate_personalization_suggestions(
+            org_data, request.field_names, use_cache=request.use_cache, user_id=current_user.id
+        ))
+        return PersonalizationSuggestionsResponse(suggestions=suggestions)
+    except LLMUnavailableError as e:
+        raise _llm_unavailable(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate suggestions: {str(e)}"
+        )
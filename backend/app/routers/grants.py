@@ -1,90 +1,323 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from typing import Optional
-import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
+from typing import List, Optional
+from datetime import datetime
 
 from app.database import get_db
-from app.models.grant import Grant
-from app.schemas.grant import GrantResponse, GrantListResponse
+from app.models.grant import Grant, GrantMatch
+from app.models.user import UserProfile
+from app.schemas.grant import (
+    GrantResponse,
+    GrantListResponse,
+    GrantFacetsResponse,
+    GrantMatchListResponse,
+    GrantMatchRefreshResponse
+)
 from app.services.auth_service import get_current_user
+from app.services.catalog import CatalogEntry, get_grant_catalog_cache
+from app.services.grant_facets import grant_facets
+from app.services.grant_matcher import grant_matches_stale, refresh_grant_matches
+from app.services.grant_queries import filter_grants, order_by_deadline, select_fields, load_grant_fields
+from app.services.grant_search import search_grants
+from app.services.http_cache import weak_etag, not_modified_response, validator_headers
+from app.services.pagination import encode_cursor, decode_cursor, parse_cursor_datetime, keyset_after
 
 router = APIRouter(prefix="/grants", tags=["Grants"])
 
 
+def _grant_response(grant: Grant, snippet: Optional[str] = None, fields: Optional[List[str]] = None) -> GrantResponse:
+    """
+    Response model built straight from the row (JSON columns are already decoded)
+
+    With fields, only those are set (dump with exclude_unset) and nothing else
+    is read from the row, so deferred columns are never loaded.
+    """
+    if fields is not None:
+        values = {name: getattr(grant, name) for name in fields if name != "search_snippet"}
+        if "search_snippet" in fields:
+            values["search_snippet"] = snippet
+        return GrantResponse.model_construct(**values)
+    response = GrantResponse.model_validate(grant)
+    response.search_snippet = snippet
+    return response
+
+
+def _cached_response(request: Request, entry: CatalogEntry) -> Response:
+    """304 or the pre-serialized body of a catalog cache entry"""
+    not_modified = not_modified_response(request, entry.etag, entry.last_modified)
+    if not_modified:
+        return not_modified
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers=validator_headers(entry.etag, entry.last_modified)
+    )
+
+
 @router.get("", response_model=GrantListResponse)
 def list_grants(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status: Optional[str] = Query(None),
     source_type: Optional[str] = Query(None),
     min_amount: Optional[float] = Query(None),
     max_amount: Optional[float] = Query(None),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Full-text search, best matches first"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: only without a cursor)"),
+    fields: Optional[str] = Query(None, description="Comma-separated grant fields to return; id is always included"),
+    view: Optional[str] = Query(None, description="'summary' for the fields a grant card needs, or 'full'"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """List all grants with optional filtering and pagination"""
-    query = db.query(Grant)
+    """
+    List all grants with optional filtering, full-text search and pagination
+
+    With q, grants are searched by title, description, eligibility criteria and
+    funding priorities, ranked by relevance, and each result carries a
+    highlighted search_snippet. Without q they are ordered by deadline.
+
+    Pass next_cursor back as cursor to get the following page; it continues
+    after the last row instead of skipping rows, so deep pages stay fast and
+    stable while grants are added. page still works for compatibility. The
+    total is counted on the first request only unless include_total is set.
+
+    fields (or view=summary) returns only some fields of each grant; the other
+    columns, such as description and the JSON lists, aren't even read.
+
+    Responses are cached in process per catalog version and query string, so
+    a repeated request skips SQL and JSON work until any grant changes, and
+    answers 304 to a client that already has it.
+    """
+    try:
+        selected = select_fields(fields, view)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    catalog_cache = get_grant_catalog_cache()
+    catalog = catalog_cache.current_version()
+    if catalog:
+        params = tuple(sorted(request.query_params.multi_items()))
+        cached = catalog_cache.get(("grants", params))
+        if cached:
+            return _cached_response(request, cached)
+        etag = weak_etag("grants", catalog.version, params)
+        not_modified = not_modified_response(request, etag, catalog.updated_at)
+        if not_modified:
+            return not_modified
 
     # Apply filters
-    if status:
-        query = query.filter(Grant.status == status)
-    if source_type:
-        query = query.filter(Grant.source_type == source_type)
-    if min_amount:
-        query = query.filter(Grant.amount_max >= min_amount)
-    if max_amount:
-        query = query.filter(Grant.amount_min <= max_amount)
+    query = filter_grants(db.query(Grant), status, source_type, min_amount, max_amount)
+    query = load_grant_fields(query, selected)
+
+    rank = None
+    if q:
+        query, rank = search_grants(query, q)
+    # Search results are ordered by relevance, everything else by deadline
+    sort_column = rank if rank is not None else Grant.deadline
+    cursor_kind = "grants:rank" if rank is not None else "grants:deadline"
 
     # Count total
-    total = query.count()
+    if include_total is None:
+        include_total = cursor is None
+    total = query.count() if include_total else None
+
+    if rank is None:
+        query = order_by_deadline(query)
 
     # Apply pagination
-    offset = (page - 1) * page_size
-    grants = query.order_by(Grant.deadline.asc()).offset(offset).limit(page_size).all()
+    if cursor:
+        try:
+            last_value, last_id = decode_cursor(cursor, cursor_kind, 2)
+            if rank is None:
+                last_value = parse_cursor_datetime(last_value)
+            query = query.filter(keyset_after(sort_column, Grant.id, last_value, last_id))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    # One extra row tells whether there is a next page
+    rows = query.limit(page_size + 1).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_grant, _, last_rank = rows[-1] if q else (rows[-1], None, None)
+        sort_value = last_rank if rank is not None else last_grant.deadline
+        next_cursor = encode_cursor(cursor_kind, [sort_value, last_grant.id])
 
-    # Convert JSON strings to lists for response
     grants_response = []
-    for grant in grants:
-        grant_dict = {
-            "id": grant.id,
+    for row in rows:
+        grant, snippet, _ = row if q else (row, None, None)
+        grants_response.append(_grant_response(grant, snippet, selected))
+
+    result = GrantListResponse(
+        grants=grants_response,
+        total=total,
+        page=None if cursor else page,
+        page_size=page_size,
+        next_cursor=next_cursor
+    )
+    # Partial grants would fail response_model validation, so they are always sent pre-serialized
+    body = result.model_dump_json(exclude_unset=selected is not None).encode("utf-8")
+    if not catalog:
+        if selected is None:
+            return result
+        return Response(content=body, media_type="application/json")
+
+    entry = CatalogEntry(body, etag, catalog.updated_at)
+    catalog_cache.set(catalog, ("grants", params), entry)
+    return _cached_response(request, entry)
+
+
+# Declared before /{grant_id} so "facets" isn't taken for an id
+@router.get("/facets", response_model=GrantFacetsResponse)
+def get_grant_facets(
+    request: Request,
+    status: Optional[str] = Query(None),
+    source_type: Optional[str] = Query(None),
+    min_amount: Optional[float] = Query(None),
+    max_amount: Optional[float] = Query(None),
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Grant counts by source type, status, amount bucket and deadline window
+
+    Takes the same filters as GET /grants and computes every facet in one
+    aggregate query. The source_type and status facets ignore their own
+    filter, so they show what choosing another value would return. Results
+    are cached per filter set, catalog version and day (deadline windows
+    start from today).
+    """
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    catalog_cache = get_grant_catalog_cache()
+    catalog = catalog_cache.current_version()
+    if catalog:
+        params = tuple(sorted(request.query_params.multi_items()))
+        cache_key = ("grants:facets", params, today.date())
+        cached = catalog_cache.get(cache_key)
+        if cached:
+            return _cached_response(request, cached)
+        # No Last-Modified: the windows move at midnight without any grant changing
+        etag = weak_etag("grants:facets", catalog.version, params, today.date())
+        not_modified = not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+
+    result = GrantFacetsResponse.model_validate(
+        grant_facets(db, today, status, source_type, min_amount, max_amount, q)
+    )
+    if not catalog:
+        return result
+
+    entry = CatalogEntry(result.model_dump_json().encode("utf-8"), etag, None)
+    catalog_cache.set(catalog, cache_key, entry)
+    return _cached_response(request, entry)
+
+
+def _matching_profile(current_user) -> UserProfile:
+    if not current_user.profile:
+        raise HTTPException(status_code=404, detail="Create a profile to get grant matches")
+    return current_user.profile
+
+
+# Declared before /{grant_id} so "matches" isn't taken for an id
+@router.get("/matches", response_model=GrantMatchListResponse)
+def list_grant_matches(
+    limit: int = Query(20, ge=1, le=100),
+    min_score: Optional[float] = Query(None, ge=0, le=100, description="Minimum overall_score"),
+    include_ineligible: bool = Query(False, description="Also list grants the profile doesn't qualify for"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Best matching active grants for the current user's profile
+
+    Serves the scores stored in grant_matches, which are recomputed in the
+    background when the profile is saved and by POST /grants/matches/refresh.
+    stale is set when the profile or the grant catalog changed since they
+    were scored (or nothing was scored yet); this read never rescores.
+    """
+    profile = _matching_profile(current_user)
+    stale = grant_matches_stale(db, profile)
+
+    query = db.query(GrantMatch, Grant).join(Grant, Grant.id == GrantMatch.grant_id).filter(
+        GrantMatch.user_id == current_user.id,
+        Grant.status == "active"
+    ).options(load_only(
+        Grant.id, Grant.title, Grant.source_name, Grant.source_type,
+        Grant.amount_min, Grant.amount_max, Grant.deadline
+    ))
+    if not include_ineligible:
+        query = query.filter(GrantMatch.eligibility_score > 0)
+    if min_score is not None:
+        query = query.filter(GrantMatch.overall_score >= min_score)
+
+    total = query.count()
+    rows = query.order_by(GrantMatch.overall_score.desc(), GrantMatch.id.desc()).limit(limit).all()
+    scored_at = db.query(func.max(GrantMatch.scored_at)).filter(GrantMatch.user_id == current_user.id).scalar()
+
+    matches = []
+    for match, grant in rows:
+        matches.append({
+            "grant_id": grant.id,
+            "title": grant.title,
             "source_name": grant.source_name,
-            "source_url": grant.source_url,
             "source_type": grant.source_type,
-            "title": grant.title,
-            "description": grant.description,
             "amount_min": grant.amount_min,
             "amount_max": grant.amount_max,
             "deadline": grant.deadline,
-            "application_opens": grant.application_opens,
-            "eligibility_criteria": json.loads(grant.eligibility_criteria) if grant.eligibility_criteria else None,
-            "required_documents": json.loads(grant.required_documents) if grant.required_documents else None,
-            "application_url": grant.application_url,
-            "contact_email": grant.contact_email,
-            "contact_phone": grant.contact_phone,
-            "geographic_restriction": grant.geographic_restriction,
-            "target_populations": json.loads(grant.target_populations) if grant.target_populations else None,
-            "funding_priorities": json.loads(grant.funding_priorities) if grant.funding_priorities else None,
-            "status": grant.status,
-            "discovered_at": grant.discovered_at,
-            "last_updated": grant.last_updated
-        }
-        grants_response.append(grant_dict)
-
-    return {
-        "grants": grants_response,
-        "total": total,
-        "page": page,
-        "page_size": page_size
-    }
+            "eligibility_score": match.eligibility_score,
+            "success_likelihood_score": match.success_likelihood_score,
+            "effort_score": match.effort_score,
+            "overall_score": match.overall_score,
+            "match_reasons": match.match_reasons or []
+        })
+
+    return {"matches": matches, "total": total, "scored_at": scored_at, "stale": stale}
+
+
+@router.post("/matches/refresh", response_model=GrantMatchRefreshResponse)
+def refresh_matches(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Re-score every active grant for the current user's profile now"""
+    return refresh_grant_matches(db, _matching_profile(current_user))
 
 
 @router.get("/{grant_id}", response_model=GrantResponse)
 def get_grant(
     grant_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Get a specific grant by ID"""
+    """
+    Get a specific grant by ID
+
+    Served from the in-process catalog cache when possible. Otherwise only
+    last_updated is read to decide whether the client's copy is current (304)
+    before the full row is loaded.
+    """
+    catalog_cache = get_grant_catalog_cache()
+    catalog = catalog_cache.current_version()
+    if catalog:
+        cached = catalog_cache.get(("grant", grant_id))
+        if cached:
+            return _cached_response(request, cached)
+
+    last_updated = db.query(Grant.last_updated).filter(Grant.id == grant_id).scalar()
+    if last_updated is not None:
+        etag = weak_etag("grant", grant_id, last_updated)
+        not_modified = not_modified_response(request, etag, last_updated)
+        if not_modified:
+            return not_modified
+
     grant = db.query(Grant).filter(Grant.id == grant_id).first()
 
     if not grant:
@@ -94,29 +327,11 @@ def get_grant(
             detail="Grant not found"
         )
 
-    # Convert JSON strings to lists
-    grant_dict = {
-        "id": grant.id,
-        "source_name": grant.source_name,
-        "source_url": grant.source_url,
-        "source_type": grant.source_type,
-        "title": grant.title,
-        "description": grant.description,
-        "amount_min": grant.amount_min,
-        "amount_max": grant.amount_max,
-        "deadline": grant.deadline,
-        "application_opens": grant.application_opens,
-        "eligibility_criteria": json.loads(grant.eligibility_criteria) if grant.eligibility_criteria else None,
-        "required_documents": json.loads(grant.required_documents) if grant.required_documents else None,
-        "application_url": grant.application_url,
-        "contact_email": grant.contact_email,
-        "contact_phone": grant.contact_phone,
-        "geographic_restriction": grant.geographic_restriction,
-        "target_populations": json.loads(grant.target_populations) if grant.target_populations else None,
-        "funding_priorities": json.loads(grant.funding_priorities) if grant.funding_priorities else None,
-        "status": grant.status,
-        "discovered_at": grant.discovered_at,
-        "last_updated": grant.last_updated
-    }
-
-    return grant_dict
+    grant_response = _grant_response(grant)
+    if last_updated is None:
+        return grant_response
+
+    entry = CatalogEntry(grant_response.model_dump_json().encode("utf-8"), etag, last_updated, grant_response)
+    if catalog:
+        catalog_cache.set(catalog, ("grant", grant_id), entry)
+    return _cached_response(request, entry)
@@ -1,63 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-import json
 
 from app.database import get_db
 from app.models.user import User, UserProfile
 from app.schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse
 from app.services.auth_service import get_current_user
+from app.services.grant_matcher import warm_grant_matches
+from app.services.http_cache import weak_etag, not_modified_response, set_validators
+from app.services.llm_service import (
+    PERSONALIZATION_ORG_DEFAULTS,
+    personalization_org_data,
+    warm_personalization_suggestions
+)
 
 router = APIRouter(prefix="/profile", tags=["User Profile"])
 
 
+def _warm_profile(background_tasks: BackgroundTasks, profile: UserProfile) -> None:
+    """Precompute personalization suggestions and grant match scores for the saved profile after the response is sent"""
+    org_data = personalization_org_data({
+        field: getattr(profile, field) for field in PERSONALIZATION_ORG_DEFAULTS
+    })
+    background_tasks.add_task(warm_personalization_suggestions, org_data, profile.user_id)
+    background_tasks.add_task(warm_grant_matches, profile.user_id)
+
+
+def _profile_response(profile: UserProfile) -> ProfileResponse:
+    """Response model built straight from the row (JSON columns are already decoded)"""
+    return ProfileResponse.model_validate(profile)
+
+
 @router.get("", response_model=ProfileResponse)
 def get_profile(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get user profile"""
+    """Get user profile; answers 304 from updated_at alone when the client's copy is current"""
+    validators = db.query(UserProfile.id, UserProfile.updated_at).filter(
+        UserProfile.user_id == current_user.id
+    ).first()
+    if validators and validators.updated_at is not None:
+        etag = weak_etag("profile", validators.id, validators.updated_at)
+        not_modified = not_modified_response(request, etag, validators.updated_at)
+        if not_modified:
+            return not_modified
+        set_validators(response, etag, validators.updated_at)
+
     if not current_user.profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
 
-    # Convert JSON strings to Python objects for response
-    profile_dict = {
-        "id": current_user.profile.id,
-        "user_id": current_user.profile.user_id,
-        "organization_name": current_user.profile.organization_name,
-        "organization_type": current_user.profile.organization_type,
-        "tax_id": current_user.profile.tax_id,
-        "street_address": current_user.profile.street_address,
-        "city": current_user.profile.city,
-        "state": current_user.profile.state,
-        "zip_code": current_user.profile.zip_code,
-        "county": current_user.profile.county,
-        "phone": current_user.profile.phone,
-        "website": current_user.profile.website,
-        "mission_statement": current_user.profile.mission_statement,
-        "established_year": current_user.profile.established_year,
-        "current_enrollment": current_user.profile.current_enrollment,
-        "max_capacity": current_user.profile.max_capacity,
-        "age_range_served": current_user.profile.age_range_served,
-        "operating_budget": current_user.profile.operating_budget,
-        "staff_count": current_user.profile.staff_count,
-        "licensed": current_user.profile.licensed,
-        "license_number": current_user.profile.license_number,
-        "accreditations": json.loads(current_user.profile.accreditations) if current_user.profile.accreditations else None,
-        "populations_served": json.loads(current_user.profile.populations_served) if current_user.profile.populations_served else None,
-        "rural_or_urban": current_user.profile.rural_or_urban,
-        "additional_info": json.loads(current_user.profile.additional_info) if current_user.profile.additional_info else None,
-        "updated_at": current_user.profile.updated_at,
-    }
-
-    return profile_dict
+    return _profile_response(current_user.profile)
 
 
 @router.post("", response_model=ProfileResponse, status_code=status.HTTP_201_CREATED)
 def create_profile(
     profile_data: ProfileCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -69,27 +72,20 @@ def create_profile(
             detail="Profile already exists. Use PUT to update."
         )
 
-    # Convert lists and dicts to JSON strings
-    profile_dict = profile_data.model_dump()
-    if profile_dict.get("accreditations"):
-        profile_dict["accreditations"] = json.dumps(profile_dict["accreditations"])
-    if profile_dict.get("populations_served"):
-        profile_dict["populations_served"] = json.dumps(profile_dict["populations_served"])
-    if profile_dict.get("additional_info"):
-        profile_dict["additional_info"] = json.dumps(profile_dict["additional_info"])
-
     # Create profile
-    db_profile = UserProfile(user_id=current_user.id, **profile_dict)
+    db_profile = UserProfile(user_id=current_user.id, **profile_data.model_dump())
     db.add(db_profile)
     db.commit()
     db.refresh(db_profile)
+    _warm_profile(background_tasks, db_profile)
 
-    return get_profile(current_user, db)
+    return _profile_response(current_user.profile)
 
 
 @router.put("", response_model=ProfileResponse)
 def update_profile(
     profile_data: ProfileUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -102,19 +98,11 @@ def update_profile(
 
     # Update profile
     update_dict = profile_data.model_dump(exclude_unset=True)
-
-    # Convert lists and dicts to JSON strings
-    if "accreditations" in update_dict:
-        update_dict["accreditations"] = json.dumps(update_dict["accreditations"])
-    if "populations_served" in update_dict:
-        update_dict["populations_served"] = json.dumps(update_dict["populations_served"])
-    if "additional_info" in update_dict:
-        update_dict["additional_info"] = json.dumps(update_dict["additional_info"])
-
     for key, value in update_dict.items():
         setattr(current_user.profile, key, value)
 
     db.commit()
     db.refresh(current_user.profile)
+    _warm_profile(background_tasks, current_user.profile)
 
-    return get_profile(current_user, db)
+    return _profile_response(current_user.profile)
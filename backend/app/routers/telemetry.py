@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.telemetry import AdmissionStatsResponse, GrantCatalogStatsResponse, LLMStatsResponse
+from app.services.admission import get_admission_controller
+from app.services.auth_service import get_current_admin
+from app.services.catalog import get_grant_catalog_cache
+from app.services.llm_telemetry import llm_call_stats, dropped_llm_telemetry
+
+# Process-wide operational stats, so only accounts listed in admin_emails may read them
+router = APIRouter(prefix="/telemetry", tags=["Telemetry"])
+
+
+@router.get("/llm", response_model=LLMStatsResponse)
+def get_llm_stats(
+    hours: int = Query(24, ge=1, le=24 * 30),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin)
+):
+    """p50/p95 latency, time to first token, token usage and error counts per LLM operation and section"""
+    return {
+        "window_hours": hours,
+        "dropped_rows": dropped_llm_telemetry(),
+        "stats": llm_call_stats(db, hours)
+    }
+
+
+@router.get("/admission", response_model=AdmissionStatsResponse)
+async def get_admission_stats(current_user = Depends(get_current_admin)):
+    """Slots in use, queue depth and admitted/rejected/timed-out counts for LLM-heavy endpoints"""
+    return get_admission_controller().stats()
+
+
+@router.get("/grant-catalog", response_model=GrantCatalogStatsResponse)
+def get_grant_catalog_stats(current_user = Depends(get_current_admin)):
+    """Entries, memory use, hit rate and invalidations of this worker's grant catalog cache"""
+    return get_grant_catalog_cache().stats()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -18,6 +18,32 @@ class ApplicationGenerateRequest(BaseModel):
     """Request to generate a grant application"""
     grant_id: int = Field(..., description="ID of the grant to apply for")
     org_data: OrganizationData
+    use_cache: bool = Field(True, description="Set to false to bypass cached AI responses and force fresh drafts")
+
+
+# POST /applications/generate-batch answers once every grant is done; about what the default
+# LLM rate limit (30 requests/minute, 7 sections per grant) gets through in one request
+BATCH_GENERATE_MAX_GRANTS = 5
+# POST /applications/jobs/batch queues one background job per grant
+BATCH_JOBS_MAX_GRANTS = 20
+
+
+class ApplicationBatchGenerateRequest(BaseModel):
+    """Request to generate applications for one organization against several grants"""
+    grant_ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_GENERATE_MAX_GRANTS,
+        description="IDs of the grants to apply for; queue larger batches with POST /applications/jobs/batch"
+    )
+    org_data: OrganizationData
+    use_cache: bool = Field(True, description="Set to false to bypass cached AI responses and force fresh drafts")
+
+
+class GenerationJobBatchRequest(BaseModel):
+    """Request to queue background generation for one organization against several grants"""
+    grant_ids: List[int] = Field(..., min_length=1, max_length=BATCH_JOBS_MAX_GRANTS, description="IDs of the grants to apply for")
+    org_data: OrganizationData
 
 
 class ApplicationSection(BaseModel):
@@ -40,10 +66,28 @@ class ApplicationGenerateResponse(BaseModel):
         from_attributes = True
 
 
+class ApplicationBatchResult(BaseModel):
+    """Outcome for one grant of a batch generation"""
+    grant_id: int
+    status: str  # 'completed', 'failed' or 'not_found'
+    application_id: Optional[int] = None
+    grant_title: Optional[str] = None
+    failed_sections: List[str] = []
+    error: Optional[str] = None
+
+
+class ApplicationBatchGenerateResponse(BaseModel):
+    """Per-grant results of a batch generation, in request order"""
+    results: List[ApplicationBatchResult]
+    completed: int
+    failed: int
+
+
 class ApplicationRefineRequest(BaseModel):
     """Request to refine a specific section"""
     section_name: str = Field(..., description="Name of section to refine (e.g., 'executive_summary')")
     feedback: str = Field(..., min_length=10, max_length=2000, description="Feedback or instructions for refinement")
+    use_cache: bool = Field(True, description="Set to false to bypass a cached refinement")
 
 
 class ApplicationResponse(BaseModel):
@@ -60,9 +104,45 @@ class ApplicationResponse(BaseModel):
         from_attributes = True
 
 
+class ApplicationRegenerateRequest(BaseModel):
+    """Request to regenerate the sections of an application whose inputs changed"""
+    org_data: OrganizationData
+    include_edited: bool = Field(False, description="Also regenerate sections the user edited or refined")
+    use_cache: bool = Field(True, description="Set to false to bypass cached AI responses and force fresh drafts")
+
+
+class ApplicationRegenerateResponse(ApplicationResponse):
+    """Application after regeneration, with what was regenerated and what was kept"""
+    regenerated_sections: List[str]
+    kept_sections: List[str]
+    kept_user_edited: List[str]
+
+
 class ApplicationListResponse(BaseModel):
     """List of applications"""
     applications: list[ApplicationResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # only counted when requested (by default on the first page)
+    page: Optional[int] = None  # None when paginating with a cursor
     page_size: int
+    next_cursor: Optional[str] = None  # pass as cursor for the next page; None on the last page
+
+
+class GenerationJobResponse(BaseModel):
+    """Status of a background generation job"""
+    id: int
+    grant_id: int
+    status: str
+    application_id: Optional[int] = None
+    section_status: Dict[str, str]
+    completed_sections: int
+    total_sections: int
+    error_message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class GenerationJobBatchResponse(BaseModel):
+    """One queued job per grant found, in request order; poll each for its progress"""
+    jobs: List[GenerationJobResponse]
+    not_found: List[int] = []  # requested grant ids that don't exist
@@ -28,6 +28,7 @@ class GrantResponse(GrantBase):
     status: str
     discovered_at: datetime
     last_updated: datetime
+    search_snippet: Optional[str] = None  # matching excerpt with <mark> highlights, only when searching with q
 
     class Config:
         from_attributes = True
@@ -35,6 +36,53 @@ class GrantResponse(GrantBase):
 
 class GrantListResponse(BaseModel):
     grants: List[GrantResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # only counted when requested (by default on the first page)
+    page: Optional[int] = None  # None when paginating with a cursor
     page_size: int
+    next_cursor: Optional[str] = None  # pass as cursor for the next page; None on the last page
+
+
+class FacetCount(BaseModel):
+    value: Optional[str] = None  # None counts grants without a value
+    count: int
+
+
+class AmountFacetCount(FacetCount):
+    min: Optional[float] = None  # amount_max range of the bucket, for the min_amount/max_amount filters
+    max: Optional[float] = None
+
+
+class GrantFacetsResponse(BaseModel):
+    total: int  # grants matching every filter
+    source_type: List[FacetCount]  # ignores the source_type filter
+    status: List[FacetCount]  # ignores the status filter
+    amount: List[AmountFacetCount]  # buckets of amount_max, in ascending order, then 'unknown'
+    deadline: List[FacetCount]  # 'past', 'next_30_days', 'next_90_days', 'later', 'none'
+
+
+class GrantMatchResponse(BaseModel):
+    grant_id: int
+    title: str
+    source_name: str
+    source_type: Optional[str] = None
+    amount_min: Optional[float] = None
+    amount_max: Optional[float] = None
+    deadline: Optional[datetime] = None
+    eligibility_score: float  # 0-100
+    success_likelihood_score: float  # 0-100
+    effort_score: float  # 0-100, lower is easier
+    overall_score: float  # weighted composite, 0 when ineligible
+    match_reasons: List[str] = []
+
+
+class GrantMatchListResponse(BaseModel):
+    matches: List[GrantMatchResponse]  # best first
+    total: int  # matches passing the filters
+    scored_at: Optional[datetime] = None
+    stale: bool = False  # profile or catalog changed since scoring; POST /grants/matches/refresh rescores
+
+
+class GrantMatchRefreshResponse(BaseModel):
+    scored: int  # active grants scored
+    score_ms: float  # vectorized scoring only
+    total_ms: float  # including loading the catalog and saving the matches
@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class LLMCallStats(BaseModel):
+    """Aggregated LLM call metrics for one operation/section"""
+    operation: str
+    section: Optional[str] = None
+    calls: int
+    errors: int
+    cancelled: int
+    cache_hits: int
+    coalesced: int
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    ttft_p50_ms: Optional[float] = None
+    ttft_p95_ms: Optional[float] = None
+    avg_prompt_tokens: Optional[float] = None
+    avg_completion_tokens: Optional[float] = None
+
+
+class LLMStatsResponse(BaseModel):
+    """LLM call metrics over a look-back window"""
+    window_hours: int
+    dropped_rows: int
+    stats: List[LLMCallStats]
+
+
+class AdmissionStatsResponse(BaseModel):
+    """Current state of the LLM admission controller"""
+    in_use: int
+    max_concurrent: int
+    queued: int
+    max_queue: int
+    admitted: int
+    rejected: int
+    timed_out: int
+    avg_hold_seconds: float
+
+
+class GrantCatalogStatsResponse(BaseModel):
+    """State of this worker's in-process grant catalog cache"""
+    version: Optional[int] = None
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
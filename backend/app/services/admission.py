@@ -0,0 +1,201 @@
+"""
+Admission control for LLM-heavy endpoints
+
+At most llm_admission_max_concurrent requests do LLM work at once. Further
+requests wait in a bounded queue until a slot frees up or their deadline
+passes. Freed slots go to the waiting user with the fewest requests already
+running (earliest arrival breaks ties), so one user's burst can't starve
+everyone else. Requests that can't be queued, or wait too long, get a 503
+with a Retry-After estimated from recent request durations.
+
+The controller lives on the event loop: admit() and release() must be called
+from async code (llm_admission is an async dependency, so sync handlers are
+covered too).
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, status
+
+from app.config import get_settings
+from app.models.user import User
+from app.services.auth_service import get_current_user
+
+
+class AdmissionRejected(Exception):
+    """No slot could be granted; retry_after is the suggested wait in seconds"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Bounded concurrency with a bounded, per-user fair wait queue"""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        max_queued_per_user: int,
+        queue_timeout: float
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queued_per_user = max_queued_per_user
+        self.queue_timeout = queue_timeout
+        self._active: Dict[Any, int] = {}  # user -> requests holding a slot
+        self._waiting: Dict[Any, Deque[Tuple[float, "asyncio.Future"]]] = {}  # user -> (arrival, future)
+        self._in_use = 0
+        self._queued = 0
+        self._hold_seconds = 5.0  # moving average of how long a slot is held
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def admit(self, user_id: Any) -> float:
+        """
+        Wait for a slot
+
+        Args:
+            user_id: Key requests are shared fairly between
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            AdmissionRejected: The queue (or this user's share of it) is full, or
+                the deadline passed while waiting
+        """
+        if self._in_use < self.max_concurrent and not self._queued:
+            self._grant(user_id)
+            return 0.0
+
+        if self._queued >= self.max_queue or len(self._waiting.get(user_id, ())) >= self.max_queued_per_user:
+            self.rejected += 1
+            raise AdmissionRejected("Too many AI requests are queued", self.retry_after())
+
+        arrived = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(user_id, deque()).append((arrived, future))
+        self._queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Granted just as we gave up; hand the slot on
+                self.release(user_id, 0.0)
+            else:
+                future.cancel()
+                self._forget(user_id, future)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.timed_out += 1
+            raise AdmissionRejected("Timed out waiting for an AI request slot", self.retry_after())
+        return time.monotonic() - arrived
+
+    def release(self, user_id: Any, held_seconds: float) -> None:
+        """Give a slot back and pass it to the next waiter in fair order"""
+        if held_seconds > 0:
+            self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held_seconds
+        self._in_use -= 1
+        self._active[user_id] -= 1
+        if not self._active[user_id]:
+            del self._active[user_id]
+
+        while self._in_use < self.max_concurrent and self._queued:
+            next_user = self._next_user()
+            _, future = self._waiting[next_user].popleft()
+            if not self._waiting[next_user]:
+                del self._waiting[next_user]
+            self._queued -= 1
+            if future.done():  # gave up already
+                continue
+            self._grant(next_user)
+            future.set_result(None)
+
+    def retry_after(self) -> float:
+        """Rough time until a newly queued request would get a slot"""
+        backlog = self._queued + 1
+        return max(1.0, self._hold_seconds * math.ceil(backlog / max(1, self.max_concurrent)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_use": self._in_use,
+            "max_concurrent": self.max_concurrent,
+            "queued": self._queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_hold_seconds": round(self._hold_seconds, 3),
+        }
+
+    def _grant(self, user_id: Any) -> None:
+        self._in_use += 1
+        self._active[user_id] = self._active.get(user_id, 0) + 1
+        self.admitted += 1
+
+    def _next_user(self) -> Any:
+        """Waiting user with the fewest running requests, earliest arrival first"""
+        return min(
+            self._waiting,
+            key=lambda user: (self._active.get(user, 0), self._waiting[user][0][0])
+        )
+
+    def _forget(self, user_id: Any, future: "asyncio.Future") -> None:
+        waiting = self._waiting.get(user_id)
+        if not waiting:
+            return
+        for entry in waiting:
+            if entry[1] is future:
+                waiting.remove(entry)
+                self._queued -= 1
+                break
+        if not waiting:
+            del self._waiting[user_id]
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller"""
+    global _controller
+    if _controller is None:
+        settings = get_settings()
+        _controller = AdmissionController(
+            max_concurrent=settings.llm_admission_max_concurrent,
+            max_queue=settings.llm_admission_max_queue,
+            max_queued_per_user=settings.llm_admission_max_queued_per_user,
+            queue_timeout=settings.llm_admission_queue_timeout_seconds,
+        )
+    return _controller
+
+
+async def llm_admission(current_user: User = Depends(get_current_user)):
+    """
+    Dependency that holds an admission slot for the whole request
+
+    Raises:
+        HTTPException: 503 with Retry-After when no slot is available in time
+    """
+    controller = get_admission_controller()
+    try:
+        await controller.admit(current_user.id)
+    except AdmissionRejected as e:
+        retry_after = math.ceil(e.retry_after)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"The AI service is busy. Please try again in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        controller.release(current_user.id, time.monotonic() - started)
@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.application import ApplicationSectionState
+from app.models.grant import Grant
+from app.services.llm_service import is_section_fallback, section_fingerprint
+from app.services.prompt_templates import compile_grant
+
+
+def grant_prompt_data(grant: Grant) -> Dict[str, Any]:
+    """
+    Prepare grant data for the LLM
+
+    The result is cached per (grant id, last_updated), so the prompt block is
+    only rendered again after the grant changes. It is shared; don't modify it.
+
+    Args:
+        grant: Grant row to describe
+
+    Returns:
+        Dictionary of grant details in the shape expected by llm_service
+    """
+    return compile_grant(grant).data
+
+
+def record_generated_sections(
+    db: Session,
+    application_id: int,
+    sections: Dict[str, str],
+    grant_data: Dict[str, Any],
+    org_data: Dict[str, Any]
+) -> None:
+    """
+    Store the input fingerprint of freshly generated sections (caller commits)
+
+    Placeholder sections get no fingerprint, so the next regeneration retries them.
+    Generated sections are no longer considered user-edited.
+
+    Args:
+        db: Database session
+        application_id: Application the sections belong to
+        sections: Section name to generated content
+        grant_data: Grant details the sections were generated from
+        org_data: Organization details the sections were generated from
+    """
+    states = _section_states(db, application_id, sections)
+    now = datetime.utcnow()
+    for section_name, content in sections.items():
+        state = states.get(section_name)
+        if state is None:
+            state = ApplicationSectionState(application_id=application_id, section_name=section_name)
+            db.add(state)
+        state.fingerprint = None if is_section_fallback(content) else section_fingerprint(
+            section_name, grant_data, org_data
+        )
+        state.user_edited = False
+        state.generated_at = now
+
+
+def mark_sections_edited(db: Session, application_id: int, section_names: Iterable[str]) -> None:
+    """Flag sections the user changed so regeneration keeps them (caller commits)"""
+    section_names = list(section_names)
+    states = _section_states(db, application_id, section_names)
+    for section_name in section_names:
+        state = states.get(section_name)
+        if state is None:
+            state = ApplicationSectionState(application_id=application_id, section_name=section_name)
+            db.add(state)
+        state.user_edited = True
+
+
+def _section_states(
+    db: Session,
+    application_id: int,
+    section_names: Optional[Iterable[str]] = None
+) -> Dict[str, ApplicationSectionState]:
+    """Existing section states of an application by section name"""
+    query = db.query(ApplicationSectionState).filter(ApplicationSectionState.application_id == application_id)
+    if section_names is not None:
+        query = query.filter(ApplicationSectionState.section_name.in_(list(section_names)))
+    return {state.section_name: state for state in query}
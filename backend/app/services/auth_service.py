@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.config import get_settings
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.utils.security import get_password_hash, verify_password, decode_token
@@ -81,3 +82,14 @@ def get_current_user(
         )
 
     return user
+
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Get the current user, who must be listed in the admin_emails setting"""
+    admins = {email.strip().lower() for email in get_settings().admin_emails.split(",") if email.strip()}
+    if current_user.email.lower() not in admins:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
@@ -0,0 +1,197 @@
+"""
+Grant catalog version and the in-process catalog cache
+
+catalog_state holds a counter that database triggers bump on every insert,
+update or delete on grants, whoever makes the change (API, scrapers, seed
+script). Anything derived from the whole catalog, such as list ETags, can be
+keyed by it and checked with a single-row lookup instead of rereading grants.
+
+GrantCatalogCache keeps parsed grants and their serialized responses for the
+current version. Each worker polls the version row at most every
+grant_catalog_poll_seconds and drops everything when it moved, so changes made
+by other processes show up within one poll interval; commits in this process
+that touch grants force a poll on the next read.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Union
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal, engine
+from app.models.grant import Grant
+
+
+class CatalogVersion(NamedTuple):
+    version: int
+    updated_at: Optional[datetime]
+
+
+def get_catalog_version(db: Union[Session, Connection]) -> Optional[CatalogVersion]:
+    """
+    Current version of the grant catalog
+
+    Args:
+        db: Database session or connection
+
+    Returns:
+        The version and when it last changed, or None if the database has no
+        change tracking (then nothing should be cached on it)
+    """
+    row = db.execute(text("SELECT version, updated_at FROM catalog_state WHERE name = 'grants'")).first()
+    if row is None:
+        return None
+    updated_at = row.updated_at
+    if isinstance(updated_at, str):
+        updated_at = datetime.fromisoformat(updated_at)
+    return CatalogVersion(row.version, updated_at)
+
+
+class CatalogEntry(NamedTuple):
+    """Serialized response with its validators; data is the parsed grant, shared and read-only"""
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+    data: Any = None
+
+    @property
+    def size(self) -> int:
+        # Rough footprint: the parsed grant costs about as much as its JSON
+        return len(self.body) * (2 if self.data is not None else 1)
+
+
+class GrantCatalogCache:
+    """Byte-capped LRU of catalog responses, valid for one catalog version at a time"""
+
+    def __init__(self, max_bytes: int, poll_seconds: float, bind: Engine):
+        self.max_bytes = max_bytes
+        self.poll_seconds = poll_seconds
+        self.bind = bind
+        self._entries: "OrderedDict[Hashable, CatalogEntry]" = OrderedDict()
+        self._bytes = 0
+        self._version: Optional[CatalogVersion] = None
+        self._polled_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def current_version(self) -> Optional[CatalogVersion]:
+        """
+        Catalog version, re-read from the database at most every poll_seconds
+
+        Returns:
+            The version, or None if the database doesn't track one
+        """
+        with self._lock:
+            if self._polled_at is not None and time.monotonic() - self._polled_at < self.poll_seconds:
+                return self._version
+
+        with self.bind.connect() as connection:
+            version = get_catalog_version(connection)
+
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+            self._polled_at = time.monotonic()
+        return version
+
+    def invalidate(self) -> None:
+        """Re-read the version on the next request (after a local write to grants)"""
+        with self._lock:
+            self._polled_at = None
+
+    def get(self, key: Hashable) -> Optional[CatalogEntry]:
+        """Entry for key under the version last returned by current_version()"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, version: CatalogVersion, key: Hashable, entry: CatalogEntry) -> None:
+        """
+        Store an entry built from the catalog at the given version
+
+        Entries built against a version that has since moved on are dropped.
+        """
+        with self._lock:
+            if version != self._version or entry.size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._polled_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self._version.version if self._version else None,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache: Optional[GrantCatalogCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_grant_catalog_cache() -> GrantCatalogCache:
+    """Return the process-wide grant catalog cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                settings = get_settings()
+                _cache = GrantCatalogCache(
+                    max_bytes=int(settings.grant_catalog_cache_max_mb * 1024 * 1024),
+                    poll_seconds=settings.grant_catalog_poll_seconds,
+                    bind=engine,
+                )
+    return _cache
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _note_grant_changes(session: Session, flush_context) -> None:
+    if any(isinstance(obj, Grant) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["grants_changed"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_after_grant_commit(session: Session) -> None:
+    if session.info.pop("grants_changed", False) and _cache is not None:
+        _cache.invalidate()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_grant_changes(session: Session) -> None:
+    session.info.pop("grants_changed", None)
@@ -0,0 +1,225 @@
+"""
+Background generation jobs
+
+Application generation runs on an in-process worker pool instead of a request
+thread. Jobs and their per-section progress are persisted in the
+generation_jobs table, so anything queued or running when the process stops is
+picked up again (skipping sections that already completed, but retrying
+failed ones) on the next startup.
+This assumes a single API process owns the job table.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.application import Application, GenerationJob
+from app.models.grant import Grant
+from app.services.application_service import grant_prompt_data, record_generated_sections
+from app.services.llm_governor import LLMUnavailableError
+from app.services.llm_service import SECTION_PROMPTS, generate_grant_application, is_section_fallback
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def create_generation_job(db: Session, user_id: int, grant_id: int, org_data: Dict[str, Any]) -> GenerationJob:
+    """
+    Persist a new generation job and hand it to the worker pool
+
+    Args:
+        db: Database session
+        user_id: Owner of the job
+        grant_id: Grant to generate an application for
+        org_data: Organization data used for generation
+
+    Returns:
+        The queued job
+    """
+    return create_generation_jobs(db, user_id, [grant_id], org_data)[0]
+
+
+def create_generation_jobs(db: Session, user_id: int, grant_ids: List[int], org_data: Dict[str, Any]) -> List[GenerationJob]:
+    """
+    Persist one generation job per grant in a single transaction, then queue them all
+
+    Args:
+        db: Database session
+        user_id: Owner of the jobs
+        grant_ids: Grants to generate applications for, in queue order
+        org_data: Organization data used for every grant
+
+    Returns:
+        The queued jobs, in grant_ids order
+    """
+    now = datetime.utcnow()
+    jobs = [
+        GenerationJob(
+            user_id=user_id,
+            grant_id=grant_id,
+            status="queued",
+            org_data=org_data,
+            section_status={name: "pending" for name in SECTION_PROMPTS},
+            sections={},
+            created_at=now
+        )
+        for grant_id in grant_ids
+    ]
+    db.add_all(jobs)
+    db.commit()
+
+    for job in jobs:
+        db.refresh(job)
+        enqueue_generation_job(job.id)
+    return jobs
+
+
+def enqueue_generation_job(job_id: int) -> None:
+    """Submit a job to the worker pool, starting the pool if needed"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            settings = get_settings()
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.generation_job_workers,
+                thread_name_prefix="generation-job"
+            )
+        _executor.submit(_run_generation_job, job_id)
+
+
+def start_job_workers() -> None:
+    """Start the worker pool and resume jobs left queued or running by a previous process"""
+    db = SessionLocal()
+    try:
+        pending_ids = [
+            job_id for (job_id,) in db.query(GenerationJob.id)
+            .filter(GenerationJob.status.in_(["queued", "running"]))
+            .order_by(GenerationJob.id)
+        ]
+    finally:
+        db.close()
+
+    if pending_ids:
+        print(f"Resuming {len(pending_ids)} generation job(s)")
+    for job_id in pending_ids:
+        enqueue_generation_job(job_id)
+
+
+def stop_job_workers() -> None:
+    """Stop accepting jobs; unfinished ones stay persisted and resume on the next startup"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _schedule_retry(job_id: int, delay: float) -> None:
+    """Re-enqueue a job after delay seconds (it also resumes on restart if the timer is lost)"""
+    timer = threading.Timer(delay, enqueue_generation_job, args=(job_id,))
+    timer.daemon = True
+    timer.start()
+
+
+def _run_generation_job(job_id: int) -> None:
+    """Generate the remaining sections for a job and save the resulting application"""
+    db = SessionLocal()
+    try:
+        job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        if not job or job.status in ("completed", "failed"):
+            return
+
+        job.status = "running"
+        job.attempts = (job.attempts or 0) + 1
+        job.started_at = job.started_at or datetime.utcnow()
+        db.commit()
+
+        grant = db.query(Grant).filter(Grant.id == job.grant_id).first()
+        if not grant:
+            raise ValueError(f"Grant with id {job.grant_id} not found")
+
+        grant_data = grant_prompt_data(grant)
+        org_data = job.org_data or {}
+        # Copies: these are updated as sections complete and written back whole
+        sections = dict(job.sections or {})
+        section_status = dict(job.section_status or {})
+        # Failed sections hold fallback text in sections; a retry regenerates them too
+        remaining = [name for name in SECTION_PROMPTS if section_status.get(name) != "completed"]
+
+        # Section callbacks arrive from generation threads; persist them one at a time
+        progress_lock = threading.Lock()
+
+        def save_section(section_name: str, content: str) -> None:
+            with progress_lock:
+                sections[section_name] = content
+                section_status[section_name] = "failed" if is_section_fallback(content) else "completed"
+                progress_db = SessionLocal()
+                try:
+                    progress_db.query(GenerationJob).filter(GenerationJob.id == job_id).update({
+                        GenerationJob.sections: sections,
+                        GenerationJob.section_status: section_status
+                    }, synchronize_session=False)
+                    progress_db.commit()
+                finally:
+                    progress_db.close()
+
+        print(f"Generation job {job_id}: {len(remaining)} section(s) remaining")
+        generate_grant_application(
+            grant_data,
+            org_data,
+            section_names=remaining,
+            on_section_complete=save_section,
+            user_id=job.user_id
+        )
+
+        application = Application(
+            user_id=job.user_id,
+            grant_id=job.grant_id,
+            status="draft",
+            sections={name: sections[name] for name in SECTION_PROMPTS if name in sections},
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        db.add(application)
+        db.flush()
+        record_generated_sections(db, application.id, sections, grant_data, org_data)
+
+        db.refresh(job)
+        job.application_id = application.id
+        job.status = "completed"
+        job.completed_at = datetime.utcnow()
+        db.commit()
+        print(f"✓ Generation job {job_id} complete (application {application.id})")
+
+    except LLMUnavailableError as e:
+        # Completed sections are already saved; retry the rest once the provider recovers
+        db.rollback()
+        job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        if job and (job.attempts or 0) < get_settings().generation_job_max_attempts:
+            delay = max(e.retry_after or 0.0, 1.0)
+            print(f"Generation job {job_id}: LLM unavailable, retrying in {delay:.0f}s")
+            job.status = "queued"
+            job.error_message = str(e)
+            db.commit()
+            _schedule_retry(job_id, delay)
+        elif job:
+            print(f"✗ Generation job {job_id} failed: {str(e)}")
+            job.status = "failed"
+            job.error_message = str(e)
+            job.completed_at = datetime.utcnow()
+            db.commit()
+    except Exception as e:
+        print(f"✗ Generation job {job_id} failed: {str(e)}")
+        db.rollback()
+        job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        if job:
+            job.status = "failed"
+            job.error_message = str(e)
+            job.completed_at = datetime.utcnow()
+            db.commit()
+    finally:
+        db.close()
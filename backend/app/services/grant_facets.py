@@ -0,0 +1,130 @@
+"""
+Facet counts for the grant browser sidebar
+
+One GROUP BY over the filtered grants yields a count for every combination
+of (source_type, status, amount bucket, deadline window); the individual
+facets are summed from those few rows in Python. The source_type and status
+facets each ignore their own filter (but respect every other one), so the
+sidebar can show how many grants picking a different value would give.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.grant import Grant
+from app.services.grant_queries import filter_grants
+from app.services.grant_search import search_grants
+
+# (value, lowest amount_max, highest amount_max) - amount_max is what the min_amount filter compares
+AMOUNT_BUCKETS: List[Tuple[str, Optional[float], Optional[float]]] = [
+    ("under_10k", None, 10000.0),
+    ("10k_50k", 10000.0, 50000.0),
+    ("50k_100k", 50000.0, 100000.0),
+    ("100k_250k", 100000.0, 250000.0),
+    ("250k_plus", 250000.0, None),
+]
+AMOUNT_UNKNOWN = "unknown"
+
+# (value, days from today the window ends) - earlier windows take precedence
+DEADLINE_WINDOWS: List[Tuple[str, Optional[int]]] = [
+    ("past", 0),
+    ("next_30_days", 30),
+    ("next_90_days", 90),
+    ("later", None),
+]
+DEADLINE_NONE = "none"
+
+
+def _amount_bucket():
+    whens = [(Grant.amount_max.is_(None), AMOUNT_UNKNOWN)]
+    whens += [(Grant.amount_max < high, value) for value, _, high in AMOUNT_BUCKETS if high is not None]
+    return case(*whens, else_=AMOUNT_BUCKETS[-1][0])
+
+
+def _deadline_window(today: datetime):
+    whens = [(Grant.deadline.is_(None), DEADLINE_NONE)]
+    whens += [
+        (Grant.deadline < today + timedelta(days=days), value)
+        for value, days in DEADLINE_WINDOWS if days is not None
+    ]
+    return case(*whens, else_=DEADLINE_WINDOWS[-1][0])
+
+
+def _counts(counter: Dict[Optional[str], int]) -> List[Dict[str, Any]]:
+    """Values with at least one grant, most common first"""
+    ordered = sorted(counter.items(), key=lambda item: (-item[1], item[0] is None, item[0] or ""))
+    return [{"value": value, "count": count} for value, count in ordered]
+
+
+def grant_facets(
+    db: Session,
+    today: datetime,
+    status: Optional[str] = None,
+    source_type: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    q: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Count grants per source type, status, amount bucket and deadline window
+
+    Args:
+        db: Database session
+        today: Start of the current day; deadline windows are measured from it
+        status: Status filter (not applied to the status facet itself)
+        source_type: Source type filter (not applied to the source_type facet itself)
+        min_amount: Same as the list_grants filter
+        max_amount: Same as the list_grants filter
+        q: Full-text search, same as list_grants
+
+    Returns:
+        total plus source_type, status, amount and deadline facets as
+        {"value", "count"} lists; amount and deadline list every bucket in
+        order, including empty ones
+    """
+    query = filter_grants(db.query(Grant), min_amount=min_amount, max_amount=max_amount)
+    if q:
+        query, _ = search_grants(query, q)
+        query = query.order_by(None)
+
+    amount = _amount_bucket().label("amount_bucket")
+    deadline = _deadline_window(today).label("deadline_window")
+    rows = query.with_entities(
+        Grant.source_type, Grant.status, amount, deadline, func.count()
+    ).group_by(Grant.source_type, Grant.status, amount, deadline).all()
+
+    total = 0
+    by_source_type: Dict[Optional[str], int] = {}
+    by_status: Dict[Optional[str], int] = {}
+    by_amount = {value: 0 for value, _, _ in AMOUNT_BUCKETS}
+    by_amount[AMOUNT_UNKNOWN] = 0
+    by_deadline = {value: 0 for value, _ in DEADLINE_WINDOWS}
+    by_deadline[DEADLINE_NONE] = 0
+
+    for row_source_type, row_status, amount_bucket, deadline_window, count in rows:
+        status_matches = not status or row_status == status
+        source_type_matches = not source_type or row_source_type == source_type
+        if status_matches:
+            by_source_type[row_source_type] = by_source_type.get(row_source_type, 0) + count
+        if source_type_matches:
+            by_status[row_status] = by_status.get(row_status, 0) + count
+        if status_matches and source_type_matches:
+            total += count
+            by_amount[amount_bucket] += count
+            by_deadline[deadline_window] += count
+
+    bounds = {value: (low, high) for value, low, high in AMOUNT_BUCKETS}
+    amount_facet = []
+    for value, count in by_amount.items():
+        low, high = bounds.get(value, (None, None))
+        amount_facet.append({"value": value, "count": count, "min": low, "max": high})
+
+    return {
+        "total": total,
+        "source_type": _counts(by_source_type),
+        "status": _counts(by_status),
+        "amount": amount_facet,
+        "deadline": [{"value": value, "count": count} for value, count in by_deadline.items()],
+    }
@@ -0,0 +1,470 @@
+"""
+Batch grant matching with NumPy
+
+GrantMatrix holds the active grant catalog column-wise: amounts, deadlines,
+document counts, a code per distinct geographic restriction and bitsets of
+the words in each grant's target populations and funding priorities. A
+profile is scored against every grant at once with array operations instead
+of a Python loop per (profile, grant) pair, and the scores are upserted into
+grant_matches in a single executemany.
+
+The matrix is built once per catalog version (see app.services.catalog) and
+shared by every request until a grant changes. Matches are rescored in the
+background when a profile is saved, and on explicit refresh; reads only
+report whether the stored scores are stale.
+"""
+import re
+import threading
+import time
+from itertools import chain
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, utcnow
+from app.models.grant import Grant, GrantMatch
+from app.models.user import UserProfile
+from app.services.catalog import CatalogVersion, get_grant_catalog_cache
+
+# overall_score = weighted eligibility, success likelihood and ease (100 - effort); ineligible grants score 0
+OVERALL_WEIGHTS = (0.5, 0.35, 0.15)
+
+# A request of 5-50% of the operating budget fits; outside it the fit falls off proportionally
+BUDGET_SHARE_LOW = 0.05
+BUDGET_SHARE_HIGH = 0.5
+
+# How winnable each funder type tends to be for a small early learning provider
+SOURCE_TYPE_FIT = {"state": 1.0, "local": 1.0, "foundation": 0.8, "private": 0.8, "federal": 0.5}
+SOURCE_TYPE_FIT_UNKNOWN = 0.6
+
+# Neutral fit when either side has nothing to compare
+NEUTRAL_FIT = 0.5
+
+# Restrictions that don't narrow eligibility within the state
+OPEN_RESTRICTIONS = ("statewide", "nationwide", "national", "any", "all")
+
+# match_reasons, in output order, by bit
+REASONS = [
+    "Available in your area",
+    "Serves the populations you work with",
+    "Shares your mission and priorities",
+    "Award size fits your budget",
+    "Few documents required",
+    "Deadline within two weeks",
+    "Outside the grant's service area",
+    "Requires a licensed provider",
+    "Deadline has passed",
+]
+(REASON_AREA, REASON_POPULATIONS, REASON_PRIORITIES, REASON_BUDGET, REASON_FEW_DOCUMENTS,
+ REASON_DEADLINE_SOON, REASON_OUTSIDE_AREA, REASON_LICENSE, REASON_CLOSED) = range(len(REASONS))
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({"and", "the", "for", "with", "from", "that", "this", "are", "who", "our", "your", "all"})
+
+# Set bits per byte value, to count bitset overlaps
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def terms(values: Iterable[Optional[str]]) -> Set[str]:
+    """Distinct lowercase words (3+ characters, no stopwords) in a list of phrases"""
+    words = set()
+    for value in values:
+        if isinstance(value, str):
+            words.update(word for word in _WORD.findall(value.lower()) if len(word) > 2 and word not in _STOPWORDS)
+    return words
+
+
+class GrantMatrix(NamedTuple):
+    """Active grants as columns; row i of every array is grant ids[i]"""
+    version: Optional[CatalogVersion]
+    ids: np.ndarray  # int64
+    amount_min: np.ndarray  # float64, NaN when unknown
+    amount_max: np.ndarray  # float64, NaN when unknown
+    deadline: np.ndarray  # float64 POSIX seconds, NaN without a deadline
+    document_counts: np.ndarray  # int32
+    requires_license: np.ndarray  # bool, an eligibility criterion mentions a license
+    geo_codes: np.ndarray  # int32 index into geo_values
+    geo_values: List[str]  # distinct normalized geographic restrictions, "" for none
+    source_codes: np.ndarray  # int32 index into source_values
+    source_values: List[str]
+    vocabulary: Dict[str, int]  # word -> bit
+    population_bits: np.ndarray  # uint8 (grants, bytes), packed target_populations words
+    population_counts: np.ndarray  # int32 words per grant
+    priority_bits: np.ndarray  # uint8 (grants, bytes), packed funding_priorities words
+    priority_counts: np.ndarray  # int32
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class MatchScores(NamedTuple):
+    """Scores for every row of a GrantMatrix, 0-100 (effort: lower is easier)"""
+    eligibility: np.ndarray
+    success_likelihood: np.ndarray
+    effort: np.ndarray
+    overall: np.ndarray
+    reason_masks: np.ndarray  # uint16, bit n set -> REASONS[n] applies
+
+
+def _utc(value: datetime) -> datetime:
+    """Timezone-aware UTC datetime; SQLite hands back naive UTC values"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _code(value: str, codes: Dict[str, int]) -> int:
+    return codes.setdefault(value, len(codes))
+
+
+def _pack(rows: List[List[int]], width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Bitsets (np.packbits layout, without the dense bool matrix) and word counts for per-grant lists of word bits"""
+    counts = np.fromiter(map(len, rows), dtype=np.int32, count=len(rows))
+    bits = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=int(counts.sum()))
+    packed = np.zeros((len(rows), max((width + 7) // 8, 1)), dtype=np.uint8)
+    np.bitwise_or.at(
+        packed,
+        (np.repeat(np.arange(len(rows)), counts), bits >> 3),
+        np.right_shift(0x80, bits & 7).astype(np.uint8)
+    )
+    return packed, counts
+
+
+def _profile_bits(words: Set[str], vocabulary: Dict[str, int]) -> np.ndarray:
+    """Profile words as a packed bitset over the matrix vocabulary; unknown words can't overlap anyway"""
+    dense = np.zeros(max(len(vocabulary), 1), dtype=bool)
+    dense[[vocabulary[word] for word in words if word in vocabulary]] = True
+    return np.packbits(dense)
+
+
+def _overlap(bits: np.ndarray, profile_bits: np.ndarray) -> np.ndarray:
+    """Number of words each grant shares with the profile"""
+    return _POPCOUNT[bits & profile_bits].sum(axis=1, dtype=np.int32)
+
+
+def build_grant_matrix(db: Session, version: Optional[CatalogVersion] = None) -> GrantMatrix:
+    """
+    Load the active grants into columnar arrays
+
+    Args:
+        db: Database session
+        version: Catalog version the grants are read at, kept to tell when the matrix is stale
+
+    Returns:
+        The matrix (possibly empty)
+    """
+    rows = db.query(
+        Grant.id, Grant.amount_min, Grant.amount_max, Grant.deadline, Grant.required_documents,
+        Grant.eligibility_criteria, Grant.geographic_restriction, Grant.source_type,
+        Grant.target_populations, Grant.funding_priorities
+    ).filter(Grant.status == "active").order_by(Grant.id).all()
+
+    geo_codes: Dict[str, int] = {}
+    source_codes: Dict[str, int] = {}
+    vocabulary: Dict[str, int] = {}
+    populations: List[List[int]] = []
+    priorities: List[List[int]] = []
+    columns = {name: [] for name in (
+        "ids", "amount_min", "amount_max", "deadline", "document_counts", "requires_license", "geo_codes", "source_codes"
+    )}
+    nan = float("nan")
+
+    # Scraped grants repeat the same lists a lot: tokenize and classify each distinct list once
+    word_bits: Dict[tuple, List[int]] = {}
+    license_required: Dict[tuple, bool] = {}
+
+    def bits_for(values: Optional[list]) -> List[int]:
+        key = tuple(values or ())
+        bits = word_bits.get(key)
+        if bits is None:
+            bits = word_bits[key] = [_code(word, vocabulary) for word in sorted(terms(key))]
+        return bits
+
+    for row in rows:
+        columns["ids"].append(row.id)
+        columns["amount_min"].append(nan if row.amount_min is None else row.amount_min)
+        columns["amount_max"].append(nan if row.amount_max is None else row.amount_max)
+        columns["deadline"].append(nan if row.deadline is None else _utc(row.deadline).timestamp())
+        columns["document_counts"].append(len(row.required_documents or []))
+        criteria = tuple(row.eligibility_criteria or ())
+        if criteria not in license_required:
+            license_required[criteria] = any(
+                "licens" in criterion.lower() for criterion in criteria if isinstance(criterion, str)
+            )
+        columns["requires_license"].append(license_required[criteria])
+        columns["geo_codes"].append(_code((row.geographic_restriction or "").strip().lower(), geo_codes))
+        columns["source_codes"].append(_code((row.source_type or "").strip().lower(), source_codes))
+        populations.append(bits_for(row.target_populations))
+        priorities.append(bits_for(row.funding_priorities))
+
+    population_bits, population_counts = _pack(populations, len(vocabulary))
+    priority_bits, priority_counts = _pack(priorities, len(vocabulary))
+    return GrantMatrix(
+        version=version,
+        ids=np.array(columns["ids"], dtype=np.int64),
+        amount_min=np.array(columns["amount_min"], dtype=np.float64),
+        amount_max=np.array(columns["amount_max"], dtype=np.float64),
+        deadline=np.array(columns["deadline"], dtype=np.float64),
+        document_counts=np.array(columns["document_counts"], dtype=np.int32),
+        requires_license=np.array(columns["requires_license"], dtype=bool),
+        geo_codes=np.array(columns["geo_codes"], dtype=np.int32),
+        geo_values=list(geo_codes),
+        source_codes=np.array(columns["source_codes"], dtype=np.int32),
+        source_values=list(source_codes),
+        vocabulary=vocabulary,
+        population_bits=population_bits,
+        population_counts=population_counts,
+        priority_bits=priority_bits,
+        priority_counts=priority_counts,
+    )
+
+
+_matrix: Optional[GrantMatrix] = None
+_matrix_lock = threading.Lock()
+
+
+def get_grant_matrix(db: Session) -> GrantMatrix:
+    """
+    The active grants as a GrantMatrix, rebuilt only when the catalog version moves
+
+    Without catalog change tracking the matrix is rebuilt on every call.
+    """
+    global _matrix
+    version = get_grant_catalog_cache().current_version()
+    matrix = _matrix
+    if version is not None and matrix is not None and matrix.version == version:
+        return matrix
+    with _matrix_lock:
+        if version is not None and _matrix is not None and _matrix.version == version:
+            return _matrix
+        # Read the version first: grants changed while loading leave the matrix tagged as stale
+        matrix = build_grant_matrix(db, version)
+        if version is not None:
+            _matrix = matrix
+    return matrix
+
+
+def geography_allows(restriction: str, profile: UserProfile) -> bool:
+    """
+    Whether a normalized geographic restriction admits the profile's location
+
+    Unknown profile details don't exclude a grant: the provider may still qualify.
+    """
+    if not restriction or any(word in restriction for word in OPEN_RESTRICTIONS):
+        return True
+    setting = (profile.rural_or_urban or "").strip().lower()
+    if restriction in ("rural", "urban"):
+        return not setting or setting == restriction
+    places = [
+        place.strip().lower().removesuffix(" county")
+        for place in (profile.county, profile.city, profile.state)
+        if place and place.strip()
+    ]
+    return not places or any(place in restriction for place in places)
+
+
+def score_profile(matrix: GrantMatrix, profile: UserProfile, now: Optional[datetime] = None) -> MatchScores:
+    """
+    Score one profile against every grant in the matrix
+
+    Args:
+        matrix: Active grants
+        profile: Organization to match
+        now: Reference time for deadlines (default: current UTC time)
+
+    Returns:
+        Score arrays aligned with matrix.ids
+    """
+    now = now or utcnow()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = (matrix.deadline - _utc(now).timestamp()) / 86400.0  # NaN without a deadline
+        is_open = ~(days_left < 0)
+
+        geo_allowed = np.array([geography_allows(value, profile) for value in matrix.geo_values] or [True])
+        in_area = geo_allowed[matrix.geo_codes]
+        license_ok = ~matrix.requires_license | bool(profile.licensed)
+
+        # Share of the grant's target populations / priorities the profile covers
+        population_words = terms(profile.populations_served or [])
+        population_overlap = _overlap(matrix.population_bits, _profile_bits(population_words, matrix.vocabulary))
+        population_fit = population_overlap / matrix.population_counts
+        if not population_words:
+            population_fit[:] = NEUTRAL_FIT
+        population_fit = np.where(matrix.population_counts > 0, population_fit, NEUTRAL_FIT)
+
+        priority_words = terms([
+            profile.mission_statement, profile.organization_type, profile.age_range_served,
+            *(profile.populations_served or []), *(profile.accreditations or []),
+        ])
+        priority_overlap = _overlap(matrix.priority_bits, _profile_bits(priority_words, matrix.vocabulary))
+        priority_fit = np.minimum(priority_overlap / matrix.priority_counts, 1.0)
+        if not priority_words:
+            priority_fit[:] = NEUTRAL_FIT
+        priority_fit = np.where(matrix.priority_counts > 0, priority_fit, NEUTRAL_FIT)
+
+        # Largest award relative to the operating budget; NaN (unknown on either side) is neutral
+        award = np.where(np.isnan(matrix.amount_max), matrix.amount_min, matrix.amount_max)
+        share = award / (profile.operating_budget or np.nan)
+        budget_fit = np.clip(np.minimum(share / BUDGET_SHARE_LOW, BUDGET_SHARE_HIGH / share), 0.0, 1.0)
+        budget_fit = np.where(np.isnan(budget_fit), NEUTRAL_FIT, budget_fit)
+
+    source_fit = np.array(
+        [SOURCE_TYPE_FIT.get(value, SOURCE_TYPE_FIT_UNKNOWN) for value in matrix.source_values] or [0.0]
+    )[matrix.source_codes]
+
+    eligibility = 100.0 * in_area * is_open * np.where(license_ok, 1.0, 0.5) * (0.6 + 0.4 * population_fit)
+    success = 100.0 * (0.45 * priority_fit + 0.35 * budget_fit + 0.20 * source_fit)
+    deadline_pressure = np.select([days_left < 14, days_left < 30], [40.0, 20.0], 0.0)
+    effort = np.clip(np.minimum(matrix.document_counts, 10) * 6.0 + deadline_pressure, 0.0, 100.0)
+
+    eligibility_weight, success_weight, ease_weight = OVERALL_WEIGHTS
+    overall = np.where(
+        eligibility > 0,
+        eligibility_weight * eligibility + success_weight * success + ease_weight * (100.0 - effort),
+        0.0
+    )
+
+    flags = {
+        REASON_AREA: in_area,
+        REASON_POPULATIONS: population_overlap > 0,
+        REASON_PRIORITIES: priority_overlap > 0,
+        REASON_BUDGET: budget_fit >= 1.0,
+        REASON_FEW_DOCUMENTS: matrix.document_counts <= 3,
+        REASON_DEADLINE_SOON: is_open & (days_left < 14),
+        REASON_OUTSIDE_AREA: ~in_area,
+        REASON_LICENSE: ~license_ok,
+        REASON_CLOSED: ~is_open,
+    }
+    reason_masks = np.zeros(len(matrix), dtype=np.uint16)
+    for bit, flag in flags.items():
+        reason_masks |= flag.astype(np.uint16) << bit
+
+    return MatchScores(
+        eligibility=np.round(eligibility, 1),
+        success_likelihood=np.round(success, 1),
+        effort=np.round(effort, 1),
+        overall=np.round(overall, 1),
+        reason_masks=reason_masks,
+    )
+
+
+def reasons_for(mask: int) -> List[str]:
+    """match_reasons for a reason bitmask"""
+    return [reason for bit, reason in enumerate(REASONS) if mask >> bit & 1]
+
+
+def save_grant_matches(
+    db: Session,
+    user_id: int,
+    matrix: GrantMatrix,
+    scores: MatchScores,
+    scored_at: Optional[datetime] = None
+) -> int:
+    """
+    Upsert one profile's scores into grant_matches and drop matches for grants no longer active
+
+    Args:
+        db: Database session (committed here)
+        user_id: Owner of the profile
+        matrix: Grants the scores are aligned with
+        scores: Result of score_profile
+        scored_at: Timestamp to record (default: now)
+
+    Returns:
+        Number of matches written
+    """
+    scored_at = scored_at or utcnow()
+    catalog_version = matrix.version.version if matrix.version else None
+    # A handful of distinct masks cover the whole catalog; build each reason list once
+    reasons = {int(mask): reasons_for(int(mask)) for mask in np.unique(scores.reason_masks)}
+    rows = [
+        {
+            "user_id": user_id,
+            "grant_id": grant_id,
+            "eligibility_score": eligibility,
+            "success_likelihood_score": success,
+            "effort_score": effort,
+            "overall_score": overall,
+            "match_reasons": reasons[mask],
+            "scored_at": scored_at,
+            "catalog_version": catalog_version,
+        }
+        for grant_id, eligibility, success, effort, overall, mask in zip(
+            matrix.ids.tolist(), scores.eligibility.tolist(), scores.success_likelihood.tolist(),
+            scores.effort.tolist(), scores.overall.tolist(), scores.reason_masks.tolist()
+        )
+    ]
+
+    if rows:
+        # Both dialects spell the upsert the same way; it relies on uq_grant_matches_user_grant
+        table = GrantMatch.__table__
+        dialect = sqlite if db.get_bind().dialect.name == "sqlite" else postgresql
+        insert = dialect.insert(table)
+        db.execute(insert.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.grant_id],
+            set_={name: insert.excluded[name] for name in rows[0] if name not in ("user_id", "grant_id")}
+        ), rows)
+    db.query(GrantMatch).filter(
+        GrantMatch.user_id == user_id,
+        GrantMatch.grant_id.notin_(select(Grant.id).where(Grant.status == "active"))
+    ).delete(synchronize_session=False)
+    db.commit()
+    return len(rows)
+
+
+def refresh_grant_matches(db: Session, profile: UserProfile) -> Dict[str, float]:
+    """
+    Score a profile against every active grant and store the results
+
+    Returns:
+        {"scored": grants scored, "score_ms": time spent scoring, "total_ms": including loading and saving}
+    """
+    started = time.perf_counter()
+    matrix = get_grant_matrix(db)
+    scoring_started = time.perf_counter()
+    scores = score_profile(matrix, profile)
+    score_ms = (time.perf_counter() - scoring_started) * 1000
+    scored = save_grant_matches(db, profile.user_id, matrix, scores)
+    total_ms = (time.perf_counter() - started) * 1000
+    print(f"Scored {scored} grants for user {profile.user_id} in {score_ms:.1f} ms ({total_ms:.1f} ms with I/O)")
+    return {"scored": scored, "score_ms": round(score_ms, 2), "total_ms": round(total_ms, 2)}
+
+
+def warm_grant_matches(user_id: int) -> None:
+    """
+    Rescore a user's grant matches with their saved profile
+
+    Meant to run in the background after a profile is saved, so the matches
+    listing serves fresh scores without writing. Failures are logged and
+    otherwise ignored.
+    """
+    db = SessionLocal()
+    try:
+        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        if profile:
+            refresh_grant_matches(db, profile)
+    except Exception as e:
+        print(f"Error refreshing grant matches for user {user_id}: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def grant_matches_stale(db: Session, profile: UserProfile) -> bool:
+    """
+    Whether the stored matches predate the profile or the grant catalog
+
+    Catalog changes are only detected where the catalog version is tracked;
+    elsewhere matches are stale only when the profile changed after scoring.
+    """
+    scored_at, catalog_version = db.query(
+        func.max(GrantMatch.scored_at), func.min(GrantMatch.catalog_version)
+    ).filter(GrantMatch.user_id == profile.user_id).one()
+    if scored_at is None:
+        return True
+    if profile.updated_at is not None and _utc(profile.updated_at) > _utc(scored_at):
+        return True
+    catalog = get_grant_catalog_cache().current_version()
+    return catalog is not None and catalog.version != catalog_version
@@ -0,0 +1,103 @@
+"""
+Shared building blocks for grant listing queries
+
+The composite indexes on grants ((status, deadline), (source_type, deadline)
+and (status, source_type, deadline)) are designed for exactly these filters
+combined with the deadline ordering; tests/test_grant_query_plans.py checks
+that every combination still avoids full scans and temporary sorts.
+"""
+from typing import List, Optional
+
+from sqlalchemy.orm import Query, load_only
+
+from app.models.grant import Grant
+from app.schemas.grant import GrantResponse
+
+# Fields a sparse listing can ask for: every GrantResponse field
+GRANT_FIELDS = list(GrantResponse.model_fields)
+
+# view=summary: what a grant card shows, without the long description and the JSON arrays
+SUMMARY_FIELDS = [
+    "id", "title", "source_name", "source_type", "amount_min", "amount_max", "deadline",
+    "geographic_restriction", "status", "last_updated", "search_snippet",
+]
+
+# Response fields that aren't grant columns
+_COMPUTED_FIELDS = {"search_snippet"}
+
+
+def filter_grants(
+    query: Query,
+    status: Optional[str] = None,
+    source_type: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None
+) -> Query:
+    """
+    Apply the listing filters to a Grant query
+
+    Args:
+        query: Query over Grant
+        status: Only grants with this status
+        source_type: Only grants from this kind of source
+        min_amount: Only grants that can award at least this much
+        max_amount: Only grants whose minimum award is at most this much
+
+    Returns:
+        The filtered query
+    """
+    if status:
+        query = query.filter(Grant.status == status)
+    if source_type:
+        query = query.filter(Grant.source_type == source_type)
+    if min_amount:
+        query = query.filter(Grant.amount_max >= min_amount)
+    if max_amount:
+        query = query.filter(Grant.amount_min <= max_amount)
+    return query
+
+
+def order_by_deadline(query: Query) -> Query:
+    """Order grants by deadline (NULLs first), with the id as a stable tiebreaker for cursors"""
+    return query.order_by(Grant.deadline.asc(), Grant.id.asc())
+
+
+def select_fields(fields: Optional[str], view: Optional[str]) -> Optional[List[str]]:
+    """
+    Resolve the fields= / view= listing parameters
+
+    Args:
+        fields: Comma-separated field names; takes precedence over view
+        view: 'summary' for SUMMARY_FIELDS, or 'full' / None for everything
+
+    Returns:
+        Field names to return (always including id), or None for all fields
+
+    Raises:
+        ValueError: Unknown field or view
+    """
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(names) - set(GRANT_FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown grant fields: {', '.join(unknown)}. Available: {', '.join(GRANT_FIELDS)}")
+        return ["id"] + [name for name in dict.fromkeys(names) if name != "id"]
+    if view in (None, "full"):
+        return None
+    if view == "summary":
+        return list(SUMMARY_FIELDS)
+    raise ValueError(f"Unknown view '{view}'. Use 'summary' or 'full'")
+
+
+def load_grant_fields(query: Query, fields: Optional[List[str]]) -> Query:
+    """
+    Load only the columns a sparse listing returns, plus the deadline it pages on
+
+    Every other column (description, the JSON arrays, ...) is deferred, so it
+    is neither read from the database nor decoded. Don't touch deferred
+    attributes on the results: each access is another query.
+    """
+    if fields is None:
+        return query
+    columns = {name for name in fields if name not in _COMPUTED_FIELDS} | {"id", "deadline"}
+    return query.options(load_only(*(getattr(Grant, name) for name in sorted(columns))))
@@ -0,0 +1,186 @@
+"""
+Full-text grant search backed by an SQLite FTS5 index
+
+grants_fts is an FTS5 table holding a plain-text copy of the searchable
+grant columns: the JSON list columns are stored as their items joined with
+"; ", so snippets never show JSON syntax. Triggers on grants keep it in sync,
+so scrapers, the seed script and the API need no extra indexing step. Results
+are ranked with BM25 (lower is better), weighting title matches above
+description matches above eligibility and priorities.
+
+Databases without FTS5 (or not SQLite) fall back to a LIKE scan.
+"""
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import Float, Integer, String, Text, column, false, null, or_, text, type_coerce
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.grant import Grant
+
+# Searchable columns, in FTS column order, with their BM25 weights
+SEARCH_COLUMNS = {
+    "title": 10.0,
+    "description": 5.0,
+    "eligibility_criteria": 2.0,
+    "funding_priorities": 2.0,
+}
+
+# Searchable columns stored as JSON lists, indexed as their joined items
+LIST_COLUMNS = ("eligibility_criteria", "funding_priorities")
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_TOKENS = 16
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+_fts_available: Optional[bool] = None
+
+
+def install_grant_search(engine: Engine) -> bool:
+    """
+    Create the FTS index and its sync triggers if missing, indexing existing grants
+
+    Args:
+        engine: Engine the grants table lives in
+
+    Returns:
+        Whether full-text search is available
+    """
+    global _fts_available
+    if engine.dialect.name != "sqlite":
+        _fts_available = False
+        return False
+
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = _indexed_values("new.")
+
+    try:
+        with engine.begin() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'grants_fts'")
+            ).first()
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS grants_fts USING fts5("
+                f"{columns}, tokenize='porter unicode61')"
+            ))
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS grants_fts_insert AFTER INSERT ON grants BEGIN "
+                f"INSERT INTO grants_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            ))
+            connection.execute(text(
+                "CREATE TRIGGER IF NOT EXISTS grants_fts_delete AFTER DELETE ON grants BEGIN "
+                "DELETE FROM grants_fts WHERE rowid = old.id; END"
+            ))
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS grants_fts_update AFTER UPDATE OF {columns} ON grants BEGIN "
+                f"DELETE FROM grants_fts WHERE rowid = old.id; "
+                f"INSERT INTO grants_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            ))
+            if not exists:
+                # Index grants that were inserted before the triggers existed
+                _reindex(connection)
+    except Exception as e:
+        print(f"Full-text grant search unavailable, falling back to LIKE: {str(e)}")
+        _fts_available = False
+        return False
+
+    _fts_available = True
+    return True
+
+
+def rebuild_grant_search(engine: Engine) -> None:
+    """Re-index every grant, e.g. after bulk changes made with the triggers disabled"""
+    with engine.begin() as connection:
+        _reindex(connection)
+
+
+def _reindex(connection: Connection) -> None:
+    columns = ", ".join(SEARCH_COLUMNS)
+    connection.execute(text("DELETE FROM grants_fts"))
+    connection.execute(text(
+        f"INSERT INTO grants_fts(rowid, {columns}) SELECT id, {_indexed_values('')} FROM grants"
+    ))
+
+
+def _indexed_values(prefix: str) -> str:
+    """SQL for the indexed text of each search column, reading grants columns through prefix ('new.' or '')"""
+    values = []
+    for name in SEARCH_COLUMNS:
+        value = f"{prefix}{name}"
+        if name in LIST_COLUMNS:
+            # Anything that isn't valid JSON is indexed as stored rather than failing the write
+            value = (
+                f"CASE WHEN json_valid({value}) "
+                f"THEN (SELECT group_concat(value, '; ') FROM json_each({value})) ELSE {value} END"
+            )
+        values.append(value)
+    return ", ".join(values)
+
+
+def match_expression(q: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query
+
+    Every word must match (implicit AND); the last word also matches as a
+    prefix, so results update while the user is typing. FTS5 operators and
+    punctuation in the input are treated as plain text.
+
+    Returns:
+        The MATCH expression, or None if q has no searchable words
+    """
+    terms = _TERM.findall(q)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_grants(query: Query, q: str) -> Tuple[Query, Optional[ColumnElement]]:
+    """
+    Restrict a Grant query to grants matching q, best matches first
+
+    The query yields (Grant, snippet, rank) rows. With FTS5, snippet is a short
+    excerpt with matches wrapped in SNIPPET_START/SNIPPET_END and rank is the
+    BM25 score (lower is better), ordered by (rank, id). The LIKE fallback
+    yields NULL snippet and rank and leaves the ordering to the caller.
+
+    Args:
+        query: Query over Grant, possibly already filtered
+        q: Free-text search
+
+    Returns:
+        The narrowed query, and the rank column to paginate on (None for the LIKE fallback)
+    """
+    expression = match_expression(q)
+    if expression is None:
+        return query.add_columns(null(), null()).filter(false()), None
+
+    if not _fts_available:
+        pattern = f"%{q.strip()}%"
+        return query.add_columns(null(), null()).filter(
+            # type_coerce: match the stored JSON text, not a JSON-encoded pattern
+            or_(*(type_coerce(getattr(Grant, name), Text).ilike(pattern) for name in SEARCH_COLUMNS))
+        ), None
+
+    weights = ", ".join(str(weight) for weight in SEARCH_COLUMNS.values())
+    matches = text(
+        f"SELECT rowid AS grant_id, bm25(grants_fts, {weights}) AS rank, "
+        f"snippet(grants_fts, -1, :snippet_start, :snippet_end, '…', {SNIPPET_TOKENS}) AS snippet "
+        f"FROM grants_fts WHERE grants_fts MATCH :match"
+    ).bindparams(
+        match=expression, snippet_start=SNIPPET_START, snippet_end=SNIPPET_END
+    ).columns(
+        column("grant_id", Integer), column("rank", Float), column("snippet", String)
+    ).subquery("grant_matches_fts")
+
+    query = (
+        query.join(matches, matches.c.grant_id == Grant.id)
+        .add_columns(matches.c.snippet, matches.c.rank)
+        .order_by(matches.c.rank, Grant.id)
+    )
+    return query, matches.c.rank
@@ -0,0 +1,104 @@
+"""
+Conditional GET support: weak ETags, Last-Modified and 304 responses
+
+Handlers compute validators from cheap columns (timestamps, the catalog
+version) first and only load and serialize the full row when the client's
+copy is stale:
+
+    etag = weak_etag("grant", grant.id, grant.last_updated)
+    not_modified = not_modified_response(request, etag, grant.last_updated)
+    if not_modified:
+        return not_modified
+    set_validators(response, etag, grant.last_updated)
+
+Responses are per user, so they are marked private and must be revalidated
+on every use.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: Any) -> str:
+    """Weak ETag over the given values (anything with a stable repr)"""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp for Last-Modified; naive values are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> None:
+    """Attach the validators to a full (200) response"""
+    response.headers.update(validator_headers(etag, last_modified))
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Whether the client's cached copy is current
+
+    If-None-Match wins over If-Modified-Since when both are sent. ETags are
+    compared weakly, so W/"x" and "x" match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {_strip_weak(tag) for tag in if_none_match.split(",")}
+        return _strip_weak(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    Build a 304 response if the client's copy is current
+
+    Args:
+        request: Incoming request with its conditional headers
+        etag: Current ETag of the resource
+        last_modified: When the resource last changed, if known
+
+    Returns:
+        The 304 response to return, or None to build the full response
+    """
+    if not is_not_modified(request, etag, last_modified):
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
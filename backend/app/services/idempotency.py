@@ -0,0 +1,123 @@
+"""
+Idempotency-Key handling for application generation
+
+A client retrying a generate request with the same Idempotency-Key gets the
+application created by the first request instead of a new one. Keys are
+scoped to the user and expire after idempotency_key_ttl_hours.
+
+An unfinished request holds its key for idempotency_claim_lease_seconds.
+Failed requests release the key themselves; if the worker died instead, a
+retry with the same body takes the key over once the lease has run out.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.idempotency import IdempotencyKey
+
+
+def request_hash(payload: Dict[str, Any]) -> str:
+    """Stable hash of a request body"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def claim_idempotency_key(db: Session, user_id: int, key: str, body_hash: str) -> Optional[IdempotencyKey]:
+    """
+    Reserve a key for a new request
+
+    Args:
+        db: Database session
+        user_id: User sending the request
+        key: Idempotency-Key header value
+        body_hash: request_hash() of the request body
+
+    Returns:
+        None when the key was claimed for this request, otherwise the existing
+        record (completed when application_id is set, in progress when it isn't)
+    """
+    existing = _find(db, user_id, key)
+    if existing:
+        if _take_over_stale_claim(db, existing, body_hash):
+            return None
+        return existing
+
+    now = datetime.utcnow()
+    db.add(IdempotencyKey(user_id=user_id, key=key, request_hash=body_hash, created_at=now, claimed_at=now))
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request claimed it first
+        db.rollback()
+        return _find(db, user_id, key)
+    return None
+
+
+def complete_idempotency_key(db: Session, user_id: int, key: str, application_id: int) -> None:
+    """Attach the created application to the key (caller commits, with the application)"""
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key
+    ).update({IdempotencyKey.application_id: application_id}, synchronize_session=False)
+
+
+def release_idempotency_key(db: Session, user_id: int, key: str) -> None:
+    """Forget a key whose request failed, so the client can retry it"""
+    db.rollback()
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.application_id.is_(None)
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def _take_over_stale_claim(db: Session, record: IdempotencyKey, body_hash: str) -> bool:
+    """
+    Claim an unfinished key whose lease ran out, e.g. because its worker crashed
+
+    Only a retry of the same request can take over, and only one of several
+    concurrent retries wins: the update is conditional on the claim it saw.
+    """
+    if record.application_id is not None or record.request_hash != body_hash:
+        return False
+    claimed_at = record.claimed_at or record.created_at
+    lease = timedelta(seconds=get_settings().idempotency_claim_lease_seconds)
+    if claimed_at.replace(tzinfo=None) + lease > datetime.utcnow():
+        return False
+
+    if record.claimed_at is None:
+        same_claim = IdempotencyKey.claimed_at.is_(None)
+    else:
+        same_claim = IdempotencyKey.claimed_at == record.claimed_at
+    taken = db.query(IdempotencyKey).filter(
+        IdempotencyKey.id == record.id,
+        IdempotencyKey.application_id.is_(None),
+        same_claim
+    ).update({IdempotencyKey.claimed_at: datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+    if taken:
+        print(f"Idempotency-Key {record.key} taken over after its claim from {claimed_at} expired")
+    return bool(taken)
+
+
+def _find(db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    """Look up a key, deleting it if it has expired"""
+    record = db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key
+    ).first()
+    if record is None:
+        return None
+
+    expires_at = record.created_at.replace(tzinfo=None) + timedelta(hours=get_settings().idempotency_key_ttl_hours)
+    if expires_at <= datetime.utcnow():
+        db.delete(record)
+        db.commit()
+        return None
+    return record
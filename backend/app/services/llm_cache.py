@@ -0,0 +1,313 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.llm_cache import LLMCacheEntry
+
+
+def make_cache_key(
+    model: str,
+    temperature: float,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    response_format: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Build a content-addressed key for a chat completion request
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        messages: Chat messages sent to the model
+        max_tokens: Completion token limit
+        response_format: Structured output format, if any
+
+    Returns:
+        Hex sha256 digest identifying the request
+    """
+    request = {"model": model, "temperature": temperature, "messages": messages, "max_tokens": max_tokens}
+    if response_format:
+        request["response_format"] = response_format
+    payload = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Bounded in-memory LRU of LLM responses backed by the llm_cache_entries table
+
+    Entries expire after ttl_seconds. Memory misses fall through to SQLite so
+    cached responses survive restarts and are shared between workers.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, persist: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()  # key -> (response, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                response, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self._entries[key]
+
+        if self.persist:
+            row = self._load(key)
+            if row:
+                response, expires_at = row
+                with self._lock:
+                    self._remember(key, response, expires_at)
+                    self.hits += 1
+                    self.persistent_hits += 1
+                return response
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, model: str, response: str) -> None:
+        """Store a response in memory and in SQLite"""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, response, expires_at)
+
+        if self.persist:
+            db = SessionLocal()
+            try:
+                db.merge(LLMCacheEntry(
+                    key=key,
+                    model=model,
+                    response=response,
+                    created_at=datetime.utcnow(),
+                    expires_at=datetime.utcfromtimestamp(expires_at)
+                ))
+                db.commit()
+            except Exception as e:
+                print(f"Error persisting LLM cache entry: {str(e)}")
+                db.rollback()
+            finally:
+                db.close()
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """
+        Drop a single entry, or every entry when key is None
+
+        Returns:
+            Number of persisted rows removed
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+        if not self.persist:
+            return 0
+
+        db = SessionLocal()
+        try:
+            query = db.query(LLMCacheEntry)
+            if key is not None:
+                query = query.filter(LLMCacheEntry.key == key)
+            removed = query.delete(synchronize_session=False)
+            db.commit()
+            return removed
+        finally:
+            db.close()
+
+    def prune_expired(self) -> int:
+        """Delete expired rows from SQLite, returning how many were removed"""
+        if not self.persist:
+            return 0
+
+        db = SessionLocal()
+        try:
+            removed = db.query(LLMCacheEntry).filter(
+                LLMCacheEntry.expires_at <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+            db.commit()
+            return removed
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "persistent_hits": self.persistent_hits,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def _remember(self, key: str, response: str, expires_at: float) -> None:
+        """Insert into the LRU, evicting the least recently used entries (lock held)"""
+        self._entries[key] = (response, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        """Read a non-expired entry from SQLite"""
+        db = SessionLocal()
+        try:
+            row = db.query(LLMCacheEntry).filter(LLMCacheEntry.key == key).first()
+            if not row:
+                return None
+            expires_at = row.expires_at.replace(tzinfo=None)
+            if expires_at <= datetime.utcnow():
+                db.delete(row)
+                db.commit()
+                return None
+            return row.response, (expires_at - datetime(1970, 1, 1)).total_seconds()
+        except Exception as e:
+            print(f"Error reading LLM cache entry: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait and receive the same result (or exception). Nothing is kept
+    once the call finishes, so later callers start a new call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with this key
+
+        Returns:
+            (result, shared) where shared is True for callers that waited on another caller's call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines on one event loop
+
+    The shared call runs as its own task, so one caller being cancelled doesn't
+    cancel it for the others; it is cancelled once every caller has gone.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, List[Any]] = {}  # key -> [task, waiting callers]
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await fn() once for all concurrent callers with this key
+
+        Returns:
+            (result, shared) where shared is True for callers that joined another caller's call
+        """
+        call = self._calls.get(key)
+        leader = call is None or call[0].get_loop() is not asyncio.get_running_loop()
+        if leader:
+            task = asyncio.ensure_future(fn())
+            call = [task, 0]
+            self._calls[key] = call
+            task.add_done_callback(lambda _: self._forget(key, task))
+        call[1] += 1
+
+        try:
+            return await asyncio.shield(call[0]), not leader
+        except asyncio.CancelledError:
+            if not call[0].done():
+                call[1] -= 1
+                if call[1] == 0:
+                    call[0].cancel()
+            raise
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        return len(self._calls)
+
+    def _forget(self, key: str, task: "asyncio.Future") -> None:
+        call = self._calls.get(key)
+        if call and call[0] is task:
+            del self._calls[key]
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                settings = get_settings()
+                _cache = LLMResponseCache(
+                    max_entries=settings.llm_cache_max_entries,
+                    ttl_seconds=settings.llm_cache_ttl_seconds
+                )
+    return _cache
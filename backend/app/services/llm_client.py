@@ -0,0 +1,83 @@
+import threading
+from typing import Optional
+
+import httpx
+from groq import Groq, AsyncGroq
+
+from app.config import get_settings
+
+_client: Optional[Groq] = None
+_async_client: Optional[AsyncGroq] = None
+_lock = threading.Lock()
+
+
+def _pool_limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async clients"""
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.llm_pool_max_connections,
+        max_keepalive_connections=settings.llm_pool_max_keepalive,
+        keepalive_expiry=settings.llm_pool_keepalive_expiry_seconds,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    """Request timeouts for LLM calls"""
+    settings = get_settings()
+    return httpx.Timeout(settings.llm_timeout_seconds, connect=settings.llm_connect_timeout_seconds)
+
+
+def get_llm_client() -> Groq:
+    """
+    Return the process-wide Groq client, creating it on first use
+
+    The client wraps a pooled httpx transport, so keep-alive connections and
+    TLS sessions are reused across sections, requests and worker threads.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                settings = get_settings()
+                _client = Groq(
+                    api_key=settings.groq_api_key,
+                    timeout=_timeout(),
+                    max_retries=0,  # retries are handled by the upstream governor
+                    http_client=httpx.Client(limits=_pool_limits(), timeout=_timeout()),
+                )
+    return _client
+
+
+def get_async_llm_client() -> AsyncGroq:
+    """
+    Return the process-wide AsyncGroq client, creating it on first use
+
+    httpx keeps separate pools for sync and async transports; both are
+    configured from the same settings and closed together on shutdown.
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                settings = get_settings()
+                _async_client = AsyncGroq(
+                    api_key=settings.groq_api_key,
+                    timeout=_timeout(),
+                    max_retries=0,  # retries are handled by the upstream governor
+                    http_client=httpx.AsyncClient(limits=_pool_limits(), timeout=_timeout()),
+                )
+    return _async_client
+
+
+async def close_llm_clients() -> None:
+    """Close pooled connections; the next call creates fresh clients"""
+    global _client, _async_client
+    with _lock:
+        client, async_client = _client, _async_client
+        _client = None
+        _async_client = None
+
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.close()
@@ -0,0 +1,334 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Mapping, Optional, TypeVar
+
+from app.config import get_settings
+from app.services.llm_providers import LLMProviderError, parse_reset_duration
+
+T = TypeVar("T")
+
+
+class LLMUnavailableError(Exception):
+    """The LLM provider can't take the request now (rate limited, failing or circuit open)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Per-minute budget that refills continuously
+
+    Reservations may drive the balance negative; the deficit is how long the
+    caller has to wait. Provider headers pull the balance down to what the
+    provider says is really left.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take amount from the bucket and return the seconds to wait before using it"""
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+        deficit_wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(deficit_wait, self.blocked_until - now, 0.0)
+
+    def refund(self, amount: float, now: float) -> None:
+        """Give back a reservation that was not used"""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+    def observe(self, remaining: Optional[float], reset_seconds: Optional[float], now: float,
+                limit: Optional[float] = None) -> None:
+        """Adapt to the provider's view of the budget"""
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset_seconds:
+                self.blocked_until = max(self.blocked_until, now + reset_seconds)
+
+    def block(self, seconds: float, now: float) -> None:
+        """Stop handing out budget for a while, e.g. after a 429"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the provider is down
+
+    Opens after failure_threshold consecutive retryable failures, rejects calls
+    for reset_seconds, then lets a single probe through (half-open). A success
+    closes it again; a failed probe re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"  # 'closed', 'open', 'half_open'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise LLMUnavailableError if calls are currently being rejected"""
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.monotonic()
+            if self.state == "open":
+                remaining = self.opened_at + self.reset_seconds - now
+                if remaining > 0:
+                    raise LLMUnavailableError("LLM provider circuit is open", retry_after=remaining)
+                self.state = "half_open"
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                raise LLMUnavailableError("LLM provider is recovering", retry_after=self.reset_seconds)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"LLM circuit breaker opened after {self.failures} failure(s)")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Clear a half-open probe that ended without a verdict (non-retryable error)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Rate limits, timeouts, connection failures and 5xx responses are worth retrying"""
+    return isinstance(error, LLMProviderError) and error.retryable
+
+
+class UpstreamGovernor:
+    """
+    Shared gatekeeper for every call to the LLM provider
+
+    - paces requests through adaptive request and token buckets fed by the
+      provider's x-ratelimit-* headers
+    - retries retryable failures with jittered exponential backoff
+    - trips a circuit breaker so callers fail fast while the provider is down
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float,
+        max_wait: float,
+        failure_threshold: int,
+        reset_seconds: float
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[[], T], estimated_tokens: int = 0) -> T:
+        """
+        Run fn under rate limiting, retries and the circuit breaker
+
+        Args:
+            fn: Performs one upstream request
+            estimated_tokens: Expected prompt + completion tokens, for the token bucket
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            LLMUnavailableError: The call could not be made within the limits, or
+                kept failing with retryable errors
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                # Inside the try: a rejected wait must release a half-open probe
+                time.sleep(self.acquire(estimated_tokens))
+                result = fn()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise self._exhausted(e, attempt, delay) from e
+                print(f"  Retrying LLM call in {delay:.1f}s after {type(e).__name__} (attempt {attempt})")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], estimated_tokens: int = 0) -> T:
+        """
+        Async version of call(): fn returns an awaitable, and waits don't block the event loop
+
+        Cancelling the caller cancels the upstream request and any pending wait.
+
+        Raises:
+            LLMUnavailableError: The call could not be made within the limits, or
+                kept failing with retryable errors
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                await asyncio.sleep(self.acquire(estimated_tokens))
+                result = await fn()
+            except asyncio.CancelledError:
+                # Not a verdict on the provider; let the next probe through
+                self.breaker.release()
+                raise
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise self._exhausted(e, attempt, delay) from e
+                print(f"  Retrying LLM call in {delay:.1f}s after {type(e).__name__} (attempt {attempt})")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failed attempt; return the backoff before retrying, or None if it isn't retryable"""
+        if not is_retryable(error):
+            self.breaker.release()
+            return None
+        self.breaker.record_failure()
+        return self.failure_delay(error, attempt)
+
+    @staticmethod
+    def _exhausted(error: Exception, attempts: int, delay: float) -> LLMUnavailableError:
+        return LLMUnavailableError(
+            f"LLM provider unavailable after {attempts} attempt(s): {str(error)}",
+            retry_after=delay
+        )
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """
+        Reserve budget for one request and return how long to wait before sending it
+
+        Raises:
+            LLMUnavailableError: The wait would exceed the configured maximum
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self.requests.reserve(1, now), self.tokens.reserve(estimated_tokens, now))
+            if wait > self.max_wait:
+                self.requests.refund(1, now)
+                self.tokens.refund(estimated_tokens, now)
+                raise LLMUnavailableError("LLM rate limit budget exhausted", retry_after=wait)
+            return wait
+
+    def failure_delay(self, error: BaseException, attempt: int) -> float:
+        """Backoff before the next attempt; a 429 also pauses every other caller"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = getattr(error, "retry_after", None)
+        if getattr(error, "status_code", None) == 429:
+            with self._lock:
+                now = time.monotonic()
+                pause = retry_after or backoff
+                self.requests.block(pause, now)
+                self.tokens.block(pause, now)
+        return max(backoff, retry_after or 0.0)
+
+    def observe_headers(self, headers: Optional[Mapping[str, Any]]) -> None:
+        """Feed x-ratelimit-* response headers back into the buckets"""
+        if not headers:
+            return
+
+        def number(name: str) -> Optional[float]:
+            value = headers.get(name)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        with self._lock:
+            now = time.monotonic()
+            # The requests limit header is a daily quota, so only its remaining count is used
+            self.requests.observe(
+                number("x-ratelimit-remaining-requests"),
+                parse_reset_duration(headers.get("x-ratelimit-reset-requests")),
+                now
+            )
+            self.tokens.observe(
+                number("x-ratelimit-remaining-tokens"),
+                parse_reset_duration(headers.get("x-ratelimit-reset-tokens")),
+                now,
+                limit=number("x-ratelimit-limit-tokens")
+            )
+
+
+def estimate_tokens(messages: list, max_tokens: int) -> int:
+    """Rough token estimate (about 4 characters per token) plus the completion budget"""
+    characters = sum(len(message.get("content", "")) for message in messages)
+    return characters // 4 + max_tokens
+
+
+_governor: Optional[UpstreamGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> UpstreamGovernor:
+    """Return the process-wide upstream governor"""
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                settings = get_settings()
+                _governor = UpstreamGovernor(
+                    requests_per_minute=settings.llm_requests_per_minute,
+                    tokens_per_minute=settings.llm_tokens_per_minute,
+                    max_retries=settings.llm_max_retries,
+                    base_delay=settings.llm_retry_base_delay_seconds,
+                    max_delay=settings.llm_retry_max_delay_seconds,
+                    max_wait=settings.llm_rate_limit_max_wait_seconds,
+                    failure_threshold=settings.llm_circuit_failure_threshold,
+                    reset_seconds=settings.llm_circuit_reset_seconds,
+                )
+    return _governor
@@ -0,0 +1,615 @@
+"""
+LLM provider backends
+
+llm_service talks to an LLMProvider instead of a vendor SDK. The provider is
+chosen with the llm_provider setting:
+
+- groq: Groq chat completions over the shared pooled client (default)
+- gemini: Google Gemini through google-generativeai
+- fake: local, deterministic stand-in with configurable latency, token rate,
+  streaming and error injection, for load tests and benchmarks without network
+
+Providers report failures as LLMProviderError so the upstream governor can
+decide what to retry without knowing which SDK raised it. Each provider has a
+blocking complete() and an async acomplete(); cancelling acomplete() abandons
+the upstream request.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Callable, Iterator, List, Mapping, NoReturn, Optional
+
+import groq
+
+from app.config import get_settings
+from app.services.llm_client import get_llm_client, get_async_llm_client
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class LLMProviderError(Exception):
+    """A provider call failed; retryable errors are rate limits, timeouts, connection failures and 5xx"""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class LLMCompletion:
+    """Result of a buffered completion"""
+
+    def __init__(self, content: str, usage: Optional[Dict[str, int]] = None, headers: Optional[Mapping[str, str]] = None):
+        self.content = content
+        self.usage = usage
+        self.headers = headers or {}
+
+
+class LLMStreamChunk:
+    """One piece of a streamed completion; usage is only set on the final chunk"""
+
+    def __init__(self, text: Optional[str] = None, usage: Optional[Dict[str, int]] = None):
+        self.text = text
+        self.usage = usage
+
+
+class LLMStream:
+    """An opened completion stream; iterate for chunks and always close it"""
+
+    def __init__(
+        self,
+        chunks: Iterator[LLMStreamChunk],
+        headers: Optional[Mapping[str, str]] = None,
+        on_close: Optional[Callable[[], None]] = None
+    ):
+        self._chunks = chunks
+        self._on_close = on_close
+        self.headers = headers or {}
+
+    def __iter__(self) -> Iterator[LLMStreamChunk]:
+        return self._chunks
+
+    def close(self) -> None:
+        if self._on_close:
+            self._on_close()
+
+
+class LLMProvider(ABC):
+    """Interface every backend implements"""
+
+    name = "base"
+    default_model = ""
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or self.default_model
+
+    @abstractmethod
+    def complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> LLMCompletion:
+        """
+        Run one buffered chat completion
+
+        Args:
+            messages: Chat messages ({"role", "content"}) to send
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            response_format: Optional structured output format, e.g. {"type": "json_object"}
+
+        Returns:
+            The completion text, token usage and response headers
+
+        Raises:
+            LLMProviderError: The provider rejected or failed the request
+        """
+
+    async def acomplete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> LLMCompletion:
+        """
+        Async version of complete()
+
+        Backends without an async SDK run complete() in a worker thread; that
+        call can't be interrupted, so cancelling only stops waiting for it.
+        """
+        return await asyncio.to_thread(self.complete, messages, temperature, max_tokens, response_format)
+
+    @abstractmethod
+    def stream(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> LLMStream:
+        """
+        Open a streamed chat completion
+
+        The request is sent before this returns, so errors raised while opening
+        the stream can be retried like buffered calls.
+
+        Raises:
+            LLMProviderError: The provider rejected or failed the request
+        """
+
+    @staticmethod
+    def _translate(error: Exception) -> Optional[LLMProviderError]:
+        """LLMProviderError for an SDK error, or None for errors the backend doesn't recognize"""
+        return None
+
+    def _reraise(self, error: Exception) -> NoReturn:
+        """Raise an SDK error as LLMProviderError; anything else propagates unchanged"""
+        translated = self._translate(error)
+        if translated is None:
+            raise error
+        raise translated from error
+
+
+def _usage_dict(usage: Any) -> Optional[Dict[str, int]]:
+    """Normalize an SDK usage object to prompt/completion/total token counts"""
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return {key: usage.get(key) for key in ("prompt_tokens", "completion_tokens", "total_tokens")}
+    return {key: getattr(usage, key, None) for key in ("prompt_tokens", "completion_tokens", "total_tokens")}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset value into seconds
+
+    Groq sends durations such as "7.66s", "2m59.56s" or "120ms"; retry-after
+    headers are plain seconds.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    multipliers = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(amount) * multipliers[unit] for amount, unit in parts)
+
+
+class GroqProvider(LLMProvider):
+    """Groq chat completions over the process-wide pooled client"""
+
+    name = "groq"
+    default_model = "llama-3.3-70b-versatile"
+
+    def complete(self, messages, temperature, max_tokens, response_format=None) -> LLMCompletion:
+        extra = {"response_format": response_format} if response_format else {}
+        try:
+            raw_response = get_llm_client().chat.completions.with_raw_response.create(
+                messages=messages,
+                model=self.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **extra,
+            )
+            chat_completion = raw_response.parse()
+        except Exception as e:
+            self._reraise(e)
+
+        return self._completion(raw_response, chat_completion)
+
+    async def acomplete(self, messages, temperature, max_tokens, response_format=None) -> LLMCompletion:
+        extra = {"response_format": response_format} if response_format else {}
+        try:
+            # Cancelling this await closes the connection, so Groq stops generating
+            raw_response = await get_async_llm_client().chat.completions.with_raw_response.create(
+                messages=messages,
+                model=self.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **extra,
+            )
+            chat_completion = raw_response.parse()
+        except Exception as e:
+            self._reraise(e)
+
+        return self._completion(raw_response, chat_completion)
+
+    @staticmethod
+    def _completion(raw_response: Any, chat_completion: Any) -> LLMCompletion:
+        return LLMCompletion(
+            content=chat_completion.choices[0].message.content or "",
+            usage=_usage_dict(getattr(chat_completion, "usage", None)),
+            headers=raw_response.headers
+        )
+
+    def stream(self, messages, temperature, max_tokens) -> LLMStream:
+        try:
+            stream = get_llm_client().chat.completions.create(
+                messages=messages,
+                model=self.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+        except Exception as e:
+            self._reraise(e)
+
+        def chunks() -> Iterator[LLMStreamChunk]:
+            try:
+                for chunk in stream:
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    # Groq reports usage on the final chunk
+                    x_groq = getattr(chunk, "x_groq", None)
+                    usage = None
+                    if x_groq:
+                        usage = x_groq.get("usage") if isinstance(x_groq, dict) else getattr(x_groq, "usage", None)
+                    yield LLMStreamChunk(text=text, usage=_usage_dict(usage))
+            except Exception as e:
+                self._reraise(e)
+
+        return LLMStream(chunks(), headers=stream.response.headers, on_close=stream.close)
+
+    @staticmethod
+    def _translate(error: Exception) -> Optional[LLMProviderError]:
+        """Map Groq SDK errors to LLMProviderError"""
+        if isinstance(error, groq.APIStatusError):
+            headers = error.response.headers
+            retry_after = headers.get("retry-after") or headers.get("x-ratelimit-reset-tokens")
+            return LLMProviderError(
+                str(error),
+                status_code=error.status_code,
+                retryable=error.status_code == 429 or error.status_code >= 500,
+                retry_after=parse_reset_duration(retry_after)
+            )
+        if isinstance(error, groq.APIConnectionError):  # includes timeouts
+            return LLMProviderError(str(error), retryable=True)
+        return None
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through google-generativeai (imported on first use)"""
+
+    name = "gemini"
+    default_model = "gemini-pro"
+
+    def __init__(self, api_key: str, model: Optional[str] = None):
+        super().__init__(model)
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self._model = genai.GenerativeModel(self.model)
+
+    def complete(self, messages, temperature, max_tokens, response_format=None) -> LLMCompletion:
+        # response_format is not supported by this SDK version; JSON prompts ask for JSON anyway
+        try:
+            response = self._model.generate_content(
+                self._contents(messages),
+                generation_config=self._genai.types.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens
+                )
+            )
+            content = response.text
+        except Exception as e:
+            self._reraise(e)
+
+        return LLMCompletion(content=content, usage=self._usage(response))
+
+    async def acomplete(self, messages, temperature, max_tokens, response_format=None) -> LLMCompletion:
+        try:
+            response = await self._model.generate_content_async(
+                self._contents(messages),
+                generation_config=self._genai.types.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens
+                )
+            )
+            content = response.text
+        except Exception as e:
+            self._reraise(e)
+
+        return LLMCompletion(content=content, usage=self._usage(response))
+
+    def stream(self, messages, temperature, max_tokens) -> LLMStream:
+        try:
+            response = self._model.generate_content(
+                self._contents(messages),
+                generation_config=self._genai.types.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens
+                ),
+                stream=True
+            )
+        except Exception as e:
+            self._reraise(e)
+
+        def chunks() -> Iterator[LLMStreamChunk]:
+            try:
+                for chunk in response:
+                    yield LLMStreamChunk(text=chunk.text)
+                yield LLMStreamChunk(usage=self._usage(response))
+            except Exception as e:
+                self._reraise(e)
+
+        return LLMStream(chunks())
+
+    @staticmethod
+    def _contents(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Gemini has no system role here, so system text is prepended to the next user turn"""
+        contents = []
+        pending_system = []
+        for message in messages:
+            if message["role"] == "system":
+                pending_system.append(message["content"])
+                continue
+            text = message["content"]
+            if message["role"] == "user" and pending_system:
+                text = "\n\n".join(pending_system + [text])
+                pending_system = []
+            contents.append({"role": "model" if message["role"] == "assistant" else "user", "parts": [text]})
+        if pending_system:
+            contents.append({"role": "user", "parts": ["\n\n".join(pending_system)]})
+        return contents
+
+    @staticmethod
+    def _usage(response: Any) -> Optional[Dict[str, int]]:
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata is None:
+            return None
+        return {
+            "prompt_tokens": getattr(metadata, "prompt_token_count", None),
+            "completion_tokens": getattr(metadata, "candidates_token_count", None),
+            "total_tokens": getattr(metadata, "total_token_count", None),
+        }
+
+    @staticmethod
+    def _translate(error: Exception) -> Optional[LLMProviderError]:
+        """Map google-api-core errors to LLMProviderError"""
+        from google.api_core import exceptions as google_exceptions
+
+        if isinstance(error, google_exceptions.GoogleAPICallError):
+            code = error.code
+            return LLMProviderError(
+                str(error),
+                status_code=code,
+                retryable=code is None or code == 429 or code >= 500
+            )
+        if isinstance(error, (google_exceptions.RetryError, ConnectionError, TimeoutError)):
+            return LLMProviderError(str(error), retryable=True)
+        return None
+
+
+_FAKE_WORDS = (
+    "children families community early learning program funding outcomes staff enrollment "
+    "quality support growth partners equity access families classroom teachers impact "
+    "sustainable measurable Oregon investment care development resources local"
+).split()
+
+_JSON_KEY = re.compile(r'^"(\w+)":', re.MULTILINE)
+
+
+class FakeProvider(LLMProvider):
+    """
+    Offline stand-in for load testing
+
+    Each call waits a time-to-first-token drawn from a log-normal distribution
+    (median latency_ms, shape latency_sigma; 0 makes it fixed) and then emits
+    completion_tokens at tokens_per_second. Calls fail with a retryable 503 at
+    error_rate and a 429 at rate_limit_rate, and time out like a real client
+    when the simulated call would exceed timeout_seconds. Text is derived from
+    the prompt, so identical requests get identical responses.
+    """
+
+    name = "fake"
+    default_model = "fake-llm"
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        latency_ms: float = 300.0,
+        latency_sigma: float = 0.5,
+        tokens_per_second: float = 250.0,
+        completion_tokens: int = 350,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        timeout_seconds: Optional[float] = None,
+        seed: int = 0
+    ):
+        super().__init__(model)
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_seconds = timeout_seconds
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.seed = seed
+
+    def complete(self, messages, temperature, max_tokens, response_format=None) -> LLMCompletion:
+        first_token, tokens = self._start(max_tokens)
+        completion = self._completion(messages, tokens, response_format)
+        self._sleep(first_token, first_token + tokens / self.tokens_per_second)
+        return completion
+
+    async def acomplete(self, messages, temperature, max_tokens, response_format=None) -> LLMCompletion:
+        first_token, tokens, failure = self._plan(max_tokens)
+        if failure:
+            delay, error = failure
+            await asyncio.sleep(delay)
+            raise error
+        completion = self._completion(messages, tokens, response_format)
+        seconds, timed_out = self._sleep_plan(first_token, first_token + tokens / self.tokens_per_second)
+        await asyncio.sleep(seconds)
+        if timed_out:
+            raise LLMProviderError("Fake request timed out", retryable=True)
+        return completion
+
+    def stream(self, messages, temperature, max_tokens) -> LLMStream:
+        first_token, tokens = self._start(max_tokens)
+        words = self._words(messages, tokens)
+        closed = threading.Event()
+
+        def chunks() -> Iterator[LLMStreamChunk]:
+            self._sleep(first_token, first_token)
+            elapsed = first_token
+            per_word = 1.0 / self.tokens_per_second
+            for index, word in enumerate(words):
+                if closed.is_set():
+                    return
+                elapsed += per_word
+                self._sleep(per_word, elapsed)
+                yield LLMStreamChunk(text=word if index == 0 else " " + word)
+            yield LLMStreamChunk(usage=self._usage(messages, tokens))
+
+        return LLMStream(chunks(), on_close=closed.set)
+
+    def _start(self, max_tokens: int) -> tuple:
+        """Draw this call's latency and fail it up front if an error is injected"""
+        first_token, tokens, failure = self._plan(max_tokens)
+        if failure:
+            delay, error = failure
+            time.sleep(delay)
+            raise error
+        return first_token, tokens
+
+    def _plan(self, max_tokens: int) -> tuple:
+        """Draw (time to first token, completion tokens, injected (delay, error) or None) for one call"""
+        with self._lock:
+            roll = self._random.random()
+            if self.latency_sigma > 0:
+                first_token = self._random.lognormvariate(math.log(self.latency_ms / 1000), self.latency_sigma)
+            else:
+                first_token = self.latency_ms / 1000
+
+        tokens = min(self.completion_tokens, max_tokens)
+        if roll < self.rate_limit_rate:
+            error = LLMProviderError("Fake rate limit exceeded", status_code=429, retryable=True, retry_after=1.0)
+            return first_token, tokens, (first_token / 10, error)
+        if roll < self.rate_limit_rate + self.error_rate:
+            error = LLMProviderError("Fake upstream error", status_code=503, retryable=True)
+            return first_token, tokens, (first_token, error)
+        return first_token, tokens, None
+
+    def _sleep(self, seconds: float, elapsed: float) -> None:
+        """Sleep, raising a timeout once the whole call has run past timeout_seconds"""
+        seconds, timed_out = self._sleep_plan(seconds, elapsed)
+        time.sleep(seconds)
+        if timed_out:
+            raise LLMProviderError("Fake request timed out", retryable=True)
+
+    def _sleep_plan(self, seconds: float, elapsed: float) -> tuple:
+        """(seconds to actually sleep, whether the call times out) once elapsed seconds have passed"""
+        if self.timeout_seconds and elapsed > self.timeout_seconds:
+            return max(0.0, seconds - (elapsed - self.timeout_seconds)), True
+        return seconds, False
+
+    def _completion(
+        self,
+        messages: List[Dict[str, str]],
+        tokens: int,
+        response_format: Optional[Dict[str, str]]
+    ) -> LLMCompletion:
+        if response_format and response_format.get("type") == "json_object":
+            content = self._json_text(messages, tokens)
+        else:
+            content = " ".join(self._words(messages, tokens))
+        return LLMCompletion(content=content, usage=self._usage(messages, tokens))
+
+    def _words(self, messages: List[Dict[str, str]], count: int) -> List[str]:
+        digest = hashlib.sha256(f"{self.seed}:{json.dumps(messages, sort_keys=True)}".encode("utf-8")).digest()
+        rng = random.Random(digest)
+        return [rng.choice(_FAKE_WORDS) for _ in range(max(1, count))]
+
+    def _json_text(self, messages: List[Dict[str, str]], count: int) -> str:
+        """Answer JSON prompts with one string per quoted key listed in the prompt"""
+        keys = _JSON_KEY.findall(messages[-1]["content"]) or ["content"]
+        per_key = max(1, count // len(keys))
+        words = self._words(messages, per_key * len(keys))
+        return json.dumps({
+            key: " ".join(words[index * per_key:(index + 1) * per_key]) for index, key in enumerate(keys)
+        })
+
+    @staticmethod
+    def _usage(messages: List[Dict[str, str]], completion_tokens: int) -> Dict[str, int]:
+        prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+
+_provider: Optional[LLMProvider] = None
+_provider_lock = threading.Lock()
+
+
+def create_llm_provider(name: str, model: Optional[str] = None) -> LLMProvider:
+    """
+    Build a provider from settings
+
+    Args:
+        name: 'groq', 'gemini' or 'fake'
+        model: Model name, or None/empty for the provider's default
+
+    Raises:
+        ValueError: Unknown provider or missing API key
+    """
+    settings = get_settings()
+    if name == "groq":
+        if not settings.groq_api_key:
+            raise ValueError("GROQ_API_KEY is required when LLM_PROVIDER=groq")
+        return GroqProvider(model)
+    if name == "gemini":
+        if not settings.gemini_api_key:
+            raise ValueError("GEMINI_API_KEY is required when LLM_PROVIDER=gemini")
+        return GeminiProvider(settings.gemini_api_key, model)
+    if name == "fake":
+        return FakeProvider(
+            model=model,
+            latency_ms=settings.llm_fake_latency_ms,
+            latency_sigma=settings.llm_fake_latency_sigma,
+            tokens_per_second=settings.llm_fake_tokens_per_second,
+            completion_tokens=settings.llm_fake_completion_tokens,
+            error_rate=settings.llm_fake_error_rate,
+            rate_limit_rate=settings.llm_fake_rate_limit_rate,
+            timeout_seconds=settings.llm_timeout_seconds,
+            seed=settings.llm_fake_seed
+        )
+    raise ValueError(f"Unknown LLM provider '{name}' (expected groq, gemini or fake)")
+
+
+def get_llm_provider() -> LLMProvider:
+    """Return the process-wide provider selected by the llm_provider setting"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                settings = get_settings()
+                _provider = create_llm_provider(settings.llm_provider, settings.llm_model or None)
+    return _provider
+
+
+def set_llm_provider(provider: Optional[LLMProvider]) -> None:
+    """Replace the process-wide provider (None re-reads settings on next use), e.g. in benchmarks"""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -1,165 +1,776 @@
-from typing import Dict, Any
-from groq import Groq
+import asyncio
+import hashlib
+import json
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, Optional, List, Awaitable, Callable, Iterable, Iterator
 from app.config import get_settings
+from app.services.llm_cache import AsyncSingleFlight, SingleFlight, get_llm_cache, make_cache_key
+from app.services.llm_providers import LLMProvider, get_llm_provider
+from app.services.llm_governor import LLMUnavailableError, get_governor, estimate_tokens
+from app.services.llm_telemetry import record_llm_call
+from app.services.prompt_templates import PROMPT_VERSION, render_application_context
+
+
+# Sections generated for every application, in output order
+SECTION_PROMPTS = {
+    "executive_summary": "Write a powerful Executive Summary (250-300 words) that immediately establishes why this organization is the ideal recipient for this grant. Open with the most compelling achievement or impact statistic. Create a sense of opportunity and urgency. Make the funder excited about what their investment will accomplish. This must be so strong that even if they read nothing else, they want to fund this proposal.",
+
+    "organizational_background": "Write an Organizational Background section (350-400 words) that positions this organization as exceptionally qualified and proven. Highlight impressive achievements with specific numbers and results. Emphasize unique strengths, innovative approaches, or special expertise that sets this organization apart. Build confidence that this team has the track record, skills, and commitment to deliver outstanding results. Make the funder feel they're investing in excellence.",
+
+    "need_statement": "Write a Statement of Need (350-400 words) that creates genuine urgency while demonstrating deep understanding of the issue. Use compelling data and specific examples that make the need real and pressing. Show what's at stake if this grant isn't funded - the children who won't be served, the families who will struggle, the community opportunity that will be lost. Connect the need directly to what the funder cares about. Make them feel that funding this is not just beneficial but essential.",
+
+    "project_description": "Write a Project Description (450-500 words) that makes the funder confident this investment will work. Be specific and detailed about activities, demonstrating you've thought through implementation. Highlight what makes this approach effective, innovative, or superior to alternatives. Show how activities align perfectly with funder priorities. Include a realistic timeline that proves you're ready to execute immediately. Make them visualize exactly how their money will create change.",
+
+    "expected_outcomes": "Write an Expected Outcomes section (300-350 words) that demonstrates exceptional return on investment. Present ambitious but achievable targets with specific metrics. Show both short-term wins and longer-term impact. Explain how you'll measure and track results, proving accountability. Connect outcomes directly to the funder's mission and goals. Use language that conveys certainty and commitment. Make them see exactly what their investment will buy.",
+
+    "budget_justification": "Write a Budget Justification (300-350 words) that shows every dollar is strategically allocated for maximum impact. Emphasize the value and efficiency of your approach. Show how costs compare favorably to outcomes. Demonstrate fiscal responsibility and smart resource management. If possible, note any cost-sharing, matching funds, or in-kind contributions that multiply the funder's investment. Make them feel their money will be used wisely and will go further here than elsewhere.",
+
+    "sustainability_plan": "Write a Sustainability Plan (300-350 words) that eliminates concerns about long-term viability. Show a realistic, concrete strategy for continuing impact beyond the grant period. Demonstrate organizational stability and growth trajectory. Highlight existing relationships with other funders or partners. Prove this isn't a one-time effort but an investment in building lasting capacity. Make them confident this grant will catalyze sustained change, not just temporary support."
+}
+
+
+_ALL_GRANT_INPUTS = [
+    "title", "source_name", "description", "amount_min", "amount_max", "eligibility_criteria", "funding_priorities"
+]
+_ALL_ORG_INPUTS = [
+    "organization_name", "organization_type", "city", "mission_statement", "current_enrollment",
+    "operating_budget", "staff_count", "key_achievements", "specific_needs", "target_outcomes", "community_impact"
+]
+
+# Grant and organization fields each section draws on. Every section sees the full
+# context, but changes outside these fields don't warrant regenerating it.
+SECTION_INPUTS = {
+    "executive_summary": {"grant": _ALL_GRANT_INPUTS, "org": _ALL_ORG_INPUTS},
+    "organizational_background": {
+        "grant": ["title", "source_name", "funding_priorities"],
+        "org": ["organization_name", "organization_type", "city", "mission_statement", "current_enrollment",
+                "staff_count", "key_achievements", "community_impact"]
+    },
+    "need_statement": {
+        "grant": ["title", "source_name", "description", "funding_priorities"],
+        "org": ["organization_name", "organization_type", "city", "current_enrollment", "specific_needs",
+                "community_impact"]
+    },
+    "project_description": {
+        "grant": ["title", "description", "amount_min", "amount_max", "eligibility_criteria", "funding_priorities"],
+        "org": ["organization_name", "organization_type", "city", "mission_statement", "current_enrollment",
+                "staff_count", "specific_needs", "target_outcomes"]
+    },
+    "expected_outcomes": {
+        "grant": ["title", "description", "funding_priorities"],
+        "org": ["organization_name", "organization_type", "current_enrollment", "target_outcomes", "community_impact"]
+    },
+    "budget_justification": {
+        "grant": ["title", "amount_min", "amount_max", "funding_priorities"],
+        "org": ["organization_name", "organization_type", "current_enrollment", "operating_budget", "staff_count",
+                "specific_needs"]
+    },
+    "sustainability_plan": {
+        "grant": ["title", "source_name", "amount_max"],
+        "org": ["organization_name", "organization_type", "city", "mission_statement", "operating_budget",
+                "staff_count", "community_impact"]
+    },
+}
+
+
+def section_fingerprint(section_name: str, grant_data: Dict[str, Any], org_data: Dict[str, Any]) -> str:
+    """
+    Fingerprint the inputs a section was generated from
+
+    Covers the prompt version, the section instructions and the grant and
+    organization fields listed in SECTION_INPUTS for the section.
 
+    Args:
+        section_name: Key of the section
+        grant_data: Grant details used for generation
+        org_data: Organization details used for generation
 
-def generate_grant_application(grant_data: Dict[str, Any], org_data: Dict[str, Any]) -> Dict[str, str]:
+    Returns:
+        Hex sha256 digest; it changes only when one of the section's inputs changes
     """
-    Generate a complete grant application using Groq's Llama 3.1 70B model
+    inputs = SECTION_INPUTS[section_name]
+    payload = {
+        "prompt_version": PROMPT_VERSION,
+        "prompt": SECTION_PROMPTS[section_name],
+        "grant": {field: grant_data.get(field) for field in inputs["grant"]},
+        "org": {field: org_data.get(field) for field in inputs["org"]},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def build_application_context(grant_data: Dict[str, Any], org_data: Dict[str, Any]) -> str:
+    """
+    Build the shared system prompt used for every application section
+
+    The grant block comes from the compiled grant cache when grant_data was
+    produced by grant_prompt_data; only the organization block is rendered here.
 
     Args:
         grant_data: Dictionary containing grant details (title, description, eligibility, etc.)
         org_data: Dictionary containing organization details (name, mission, budget, etc.)
 
     Returns:
-        Dictionary with generated sections of the application
+        System prompt with the writing instructions, the grant and the organization
     """
+    return render_application_context(grant_data, org_data)
 
-    # Initialize Groq client
-    settings = get_settings()
-    client = Groq(api_key=settings.groq_api_key)
 
-    # Extract organization data
-    org_name = org_data.get('organization_name', 'Our Organization')
-    org_type = org_data.get('organization_type', 'Child Care Center')
-    city = org_data.get('city', 'Portland')
-    mission = org_data.get('mission_statement', 'To provide quality early childhood education')
-    enrollment = org_data.get('current_enrollment', 50)
-    budget = org_data.get('operating_budget', 250000)
-    staff = org_data.get('staff_count', 8)
+def _section_messages(context: str, section_prompt: str) -> List[Dict[str, str]]:
+    """Build the chat messages for a single section request"""
+    return [
+        {
+            "role": "system",
+            "content": context
+        },
+        {
+            "role": "user",
+            "content": section_prompt
+        }
+    ]
 
-    # Extract personalization data
-    achievements = org_data.get('key_achievements', '')
-    specific_needs = org_data.get('specific_needs', '')
-    target_outcomes = org_data.get('target_outcomes', '')
-    community_impact = org_data.get('community_impact', '')
 
-    # Extract grant data
-    grant_title = grant_data.get('title', 'Grant Program')
-    grant_source = grant_data.get('source_name', 'Funding Organization')
-    amount_min = grant_data.get('amount_min', 10000)
-    amount_max = grant_data.get('amount_max', 50000)
-    description = grant_data.get('description', 'Support for early childhood education')
-    eligibility = grant_data.get('eligibility_criteria', [])
-    priorities = grant_data.get('funding_priorities', [])
+# Output budget for single-call generation
+SINGLE_CALL_TOKENS_PER_SECTION = 1024
+SINGLE_CALL_MAX_TOKENS = 8000
 
-    # Create comprehensive context for the AI
-    context = f"""
-You are an expert grant writer with a proven track record of winning competitive funding. You understand that funders have limited resources and receive many applications - your job is to make THIS application stand out as the clear choice.
+SECTION_FALLBACK_PREFIX = "[This section will be generated with AI. Error:"
 
-GRANT INFORMATION:
-- Title: {grant_title}
-- Funding Organization: {grant_source}
-- Description: {description}
-- Funding Range: ${amount_min:,.0f} - ${amount_max:,.0f}
-- Eligibility Criteria: {', '.join(eligibility) if eligibility else 'General eligibility'}
-- Funding Priorities: {', '.join(priorities) if priorities else 'General priorities'}
 
-ORGANIZATION INFORMATION:
-- Name: {org_name}
-- Type: {org_type}
-- Location: {city}, Oregon
-- Mission: {mission}
-- Current Enrollment: {enrollment} children
-- Annual Budget: ${budget:,.0f}
-- Staff Count: {staff} professionals
+def _section_fallback(error: Exception) -> str:
+    """Fallback to a simple template if AI fails"""
+    return f"{SECTION_FALLBACK_PREFIX} {str(error)}]"
 
-PERSONALIZATION DETAILS:
-- Key Achievements: {achievements}
-- Specific Needs/Challenges: {specific_needs}
-- Target Outcomes: {target_outcomes}
-- Community Impact: {community_impact}
 
-YOUR MISSION: Write an application that makes funders excited to invest in this organization. This application must:
+def is_section_fallback(content: str) -> bool:
+    """Check whether section text is the placeholder written when generation failed"""
+    return content.startswith(SECTION_FALLBACK_PREFIX)
 
-1. DEMONSTRATE EXCEPTIONAL VALUE: Show why this organization delivers outsized impact relative to investment. Highlight proven track record, efficiency, and results.
 
-2. CREATE URGENCY: Illustrate the critical need and what will be lost if this grant isn't awarded. Make the funder feel this is an opportunity they cannot miss.
+_in_flight = SingleFlight()
 
-3. SHOWCASE UNIQUE STRENGTHS: Emphasize what makes this organization different from and better than alternatives. Focus on competitive advantages, innovative approaches, and special expertise.
 
-4. PROVE CREDIBILITY: Use specific data, achievements, and examples that demonstrate capability. Make it clear this organization will deliver on promises.
+def _chat_completion(
+    provider: LLMProvider,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    use_cache: bool = True,
+    response_format: Optional[Dict[str, str]] = None,
+    operation: str = "completion",
+    section: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> str:
+    """
+    Run a chat completion, serving byte-identical requests from the response cache
 
-5. ALIGN PERFECTLY: Connect every aspect of the proposal directly to the funder's priorities and mission. Show you understand what they care about and how this investment advances their goals.
+    Concurrent identical requests are coalesced into one upstream call.
+    Upstream calls go through the shared governor (rate limiting, retries, circuit
+    breaker). Every call, including cache hits and failures, is recorded in the
+    LLM telemetry.
 
-6. PAINT A VIVID PICTURE: Help the funder visualize the specific children, families, and communities who will benefit. Make the impact tangible and emotionally compelling.
+    Args:
+        provider: LLM provider to call on a cache miss
+        messages: Chat messages to send
+        temperature: Sampling temperature
+        max_tokens: Completion token limit
+        use_cache: Set to False to skip the cache lookup (the fresh response is still stored)
+        response_format: Optional structured output format, e.g. {"type": "json_object"}
+        operation: Telemetry label for the kind of call
+        section: Telemetry label for the section or field being produced
+        user_id: User the call is made for, for telemetry
 
-7. ELIMINATE DOUBT: Anticipate concerns (sustainability, capacity, outcomes) and proactively address them with confidence and evidence.
+    Returns:
+        Stripped completion text
 
-8. INSPIRE CONFIDENCE: Use strong, decisive language that conveys competence and readiness. Avoid hedging or uncertainty.
+    Raises:
+        LLMUnavailableError: The provider is rate limiting or failing beyond the retry budget
+    """
+    settings = get_settings()
+    model = provider.model
+    cache = get_llm_cache() if settings.llm_cache_enabled else None
+    # Key on the provider too, so fake or alternate backends never answer for the real one
+    key = make_cache_key(f"{provider.name}/{model}", temperature, messages, max_tokens, response_format)
+    telemetry = {"operation": operation, "model": model, "section": section, "user_id": user_id}
+    started = time.perf_counter()
+
+    if cache and use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            record_llm_call(
+                outcome="success",
+                cache_status="hit",
+                latency_ms=(time.perf_counter() - started) * 1000,
+                **telemetry
+            )
+            return cached
 
-Write in a professional but passionate tone that balances data-driven credibility with heartfelt commitment to mission. Every sentence should advance the case for funding THIS organization.
-"""
+    cache_status = ("miss" if use_cache else "bypass") if cache else "disabled"
+    led = False
 
-    sections = {}
+    def upstream() -> str:
+        nonlocal led
+        led = True
+        governor = get_governor()
+        try:
+            completion = governor.call(
+                lambda: provider.complete(messages, temperature, max_tokens, response_format),
+                estimated_tokens=estimate_tokens(messages, max_tokens)
+            )
+            governor.observe_headers(completion.headers)
+            content = completion.content.strip()
+        except Exception as e:
+            record_llm_call(
+                outcome="error",
+                cache_status=cache_status,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error=e,
+                **telemetry
+            )
+            raise
+
+        record_llm_call(
+            outcome="success",
+            cache_status=cache_status,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            usage=completion.usage,
+            **telemetry
+        )
 
-    # Define sections to generate
-    section_prompts = {
-        "executive_summary": "Write a powerful Executive Summary (250-300 words) that immediately establishes why this organization is the ideal recipient for this grant. Open with the most compelling achievement or impact statistic. Create a sense of opportunity and urgency. Make the funder excited about what their investment will accomplish. This must be so strong that even if they read nothing else, they want to fund this proposal.",
+        if cache:
+            cache.set(key, model, content)
+        return content
 
-        "organizational_background": "Write an Organizational Background section (350-400 words) that positions this organization as exceptionally qualified and proven. Highlight impressive achievements with specific numbers and results. Emphasize unique strengths, innovative approaches, or special expertise that sets this organization apart. Build confidence that this team has the track record, skills, and commitment to deliver outstanding results. Make the funder feel they're investing in excellence.",
+    # Identical requests already in flight (double submits, client retries) share one upstream call
+    try:
+        content, shared = _in_flight.do(key, upstream)
+    except Exception as e:
+        if not led:
+            record_llm_call(
+                outcome="error",
+                cache_status="coalesced",
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error=e,
+                **telemetry
+            )
+        raise
+
+    if shared:
+        record_llm_call(
+            outcome="success",
+            cache_status="coalesced",
+            latency_ms=(time.perf_counter() - started) * 1000,
+            **telemetry
+        )
+    return content
 
-        "need_statement": "Write a Statement of Need (350-400 words) that creates genuine urgency while demonstrating deep understanding of the issue. Use compelling data and specific examples that make the need real and pressing. Show what's at stake if this grant isn't funded - the children who won't be served, the families who will struggle, the community opportunity that will be lost. Connect the need directly to what the funder cares about. Make them feel that funding this is not just beneficial but essential.",
 
-        "project_description": "Write a Project Description (450-500 words) that makes the funder confident this investment will work. Be specific and detailed about activities, demonstrating you've thought through implementation. Highlight what makes this approach effective, innovative, or superior to alternatives. Show how activities align perfectly with funder priorities. Include a realistic timeline that proves you're ready to execute immediately. Make them visualize exactly how their money will create change.",
+def _generate_section(
+    provider: LLMProvider,
+    context: str,
+    section_name: str,
+    section_prompt: str,
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> str:
+    """
+    Generate a single application section, falling back to a placeholder on failure
 
-        "expected_outcomes": "Write an Expected Outcomes section (300-350 words) that demonstrates exceptional return on investment. Present ambitious but achievable targets with specific metrics. Show both short-term wins and longer-term impact. Explain how you'll measure and track results, proving accountability. Connect outcomes directly to the funder's mission and goals. Use language that conveys certainty and commitment. Make them see exactly what their investment will buy.",
+    Args:
+        provider: LLM provider to use for the request
+        context: Shared system prompt with grant and organization details
+        section_name: Key of the section being generated
+        section_prompt: Section-specific instructions
+        use_cache: Whether a cached response may be returned
+        user_id: User the section is generated for, for telemetry
 
-        "budget_justification": "Write a Budget Justification (300-350 words) that shows every dollar is strategically allocated for maximum impact. Emphasize the value and efficiency of your approach. Show how costs compare favorably to outcomes. Demonstrate fiscal responsibility and smart resource management. If possible, note any cost-sharing, matching funds, or in-kind contributions that multiply the funder's investment. Make them feel their money will be used wisely and will go further here than elsewhere.",
+    Returns:
+        Generated section text, or a placeholder describing the error
 
-        "sustainability_plan": "Write a Sustainability Plan (300-350 words) that eliminates concerns about long-term viability. Show a realistic, concrete strategy for continuing impact beyond the grant period. Demonstrate organizational stability and growth trajectory. Highlight existing relationships with other funders or partners. Prove this isn't a one-time effort but an investment in building lasting capacity. Make them confident this grant will catalyze sustained change, not just temporary support."
-    }
+    Raises:
+        LLMUnavailableError: The provider is unavailable, so no placeholder is written
+    """
+    print(f"  Generating: {section_name}...")
 
-    print("Generating grant application with Groq AI...")
+    try:
+        content = _chat_completion(
+            provider,
+            _section_messages(context, section_prompt),
+            temperature=0.7,  # Balanced creativity and consistency
+            max_tokens=1024,  # Enough for detailed sections
+            use_cache=use_cache,
+            operation="section",
+            section=section_name,
+            user_id=user_id,
+        )
+        print(f"  ✓ {section_name} generated ({len(content)} chars)")
+        return content
 
-    # Generate each section using Groq
-    for section_name, section_prompt in section_prompts.items():
-        print(f"  Generating: {section_name}...")
+    except LLMUnavailableError:
+        # Don't save a placeholder when the provider is down; the whole draft fails instead
+        print(f"  ✗ LLM provider unavailable while generating {section_name}")
+        raise
+    except Exception as e:
+        print(f"  ✗ Error generating {section_name}: {str(e)}")
+        return _section_fallback(e)
+
+
+def _generate_sections_single_call(
+    provider: LLMProvider,
+    context: str,
+    section_prompts: Dict[str, str],
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Generate several sections with one structured (JSON) completion
+
+    The shared context is sent once instead of once per section. Sections that
+    are missing or malformed in the response are left out so the caller can
+    fall back to generating them individually.
+
+    Args:
+        provider: LLM provider to use for the request
+        context: Shared system prompt with grant and organization details
+        section_prompts: Section name to instructions for every section wanted
+        use_cache: Whether a cached response may be returned
+        user_id: User the sections are generated for, for telemetry
+
+    Returns:
+        Dictionary of the sections that were parsed successfully
+    """
+    print(f"  Generating {len(section_prompts)} sections in a single call...")
+
+    try:
+        raw = _chat_completion(
+            provider,
+            _single_call_messages(context, section_prompts),
+            temperature=0.7,
+            max_tokens=_single_call_max_tokens(section_prompts),
+            use_cache=use_cache,
+            response_format={"type": "json_object"},
+            operation="single_call",
+            user_id=user_id,
+        )
+        parsed = json.loads(raw)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        print(f"  ✗ Single-call generation failed, falling back to per-section: {str(e)}")
+        return {}
+
+    return _single_call_sections(parsed, section_prompts)
+
+
+def _single_call_messages(context: str, section_prompts: Dict[str, str]) -> List[Dict[str, str]]:
+    """Messages asking for every section in section_prompts as one JSON object"""
+    section_instructions = "\n\n".join(
+        f'"{section_name}": {section_prompt}' for section_name, section_prompt in section_prompts.items()
+    )
+    prompt = f"""Write every section of this grant application in one response.
+
+Return ONLY a JSON object. Its keys must be exactly these section names, and each value must be the finished section text as a plain string (no markdown headings, no nested objects):
+
+{section_instructions}"""
+    return _section_messages(context, prompt)
+
+
+def _single_call_max_tokens(section_prompts: Dict[str, str]) -> int:
+    return min(SINGLE_CALL_MAX_TOKENS, SINGLE_CALL_TOKENS_PER_SECTION * len(section_prompts))
 
-        try:
-            chat_completion = client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": context
-                    },
-                    {
-                        "role": "user",
-                        "content": section_prompt
-                    }
-                ],
-                model="llama-3.3-70b-versatile",  # Fast and high-quality model
-                temperature=0.7,  # Balanced creativity and consistency
-                max_tokens=1024,  # Enough for detailed sections
-            )
 
-            sections[section_name] = chat_completion.choices[0].message.content.strip()
+def _single_call_sections(parsed: Any, section_prompts: Dict[str, str]) -> Dict[str, str]:
+    """Pick the well-formed sections out of a parsed single-call response"""
+    if not isinstance(parsed, dict):
+        print("  ✗ Single-call response was not a JSON object, falling back to per-section")
+        return {}
+
+    sections = {}
+    for section_name in section_prompts:
+        content = parsed.get(section_name)
+        if isinstance(content, str) and content.strip():
+            sections[section_name] = content.strip()
             print(f"  ✓ {section_name} generated ({len(sections[section_name])} chars)")
+        else:
+            print(f"  ✗ {section_name} missing from single-call response")
+    return sections
 
-        except Exception as e:
-            print(f"  ✗ Error generating {section_name}: {str(e)}")
-            # Fallback to a simple template if AI fails
-            sections[section_name] = f"[This section will be generated with AI. Error: {str(e)}]"
+
+def generate_grant_application(
+    grant_data: Dict[str, Any],
+    org_data: Dict[str, Any],
+    max_concurrency: Optional[int] = None,
+    section_names: Optional[Iterable[str]] = None,
+    on_section_complete: Optional[Callable[[str, str], None]] = None,
+    use_cache: bool = True,
+    strategy: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Generate a complete grant application with the configured LLM provider
+
+    Args:
+        grant_data: Dictionary containing grant details (title, description, eligibility, etc.)
+        org_data: Dictionary containing organization details (name, mission, budget, etc.)
+        max_concurrency: Maximum number of sections generated in parallel
+            (defaults to the llm_section_concurrency setting, 1 means sequential)
+        section_names: Only generate these sections (defaults to all of SECTION_PROMPTS)
+        on_section_complete: Called with (section_name, content) as each section finishes,
+            possibly from a worker thread
+        use_cache: Set to False to bypass cached responses and force fresh generation
+        strategy: "per_section" (one call per section) or "single_call" (one JSON
+            completion for all sections); defaults to the llm_generation_strategy setting
+        user_id: User the application is generated for, for telemetry
+
+    Returns:
+        Dictionary with generated sections of the application, in SECTION_PROMPTS order
+    """
+
+    settings = get_settings()
+    provider = get_llm_provider()
+
+    context = build_application_context(grant_data, org_data)
+
+    wanted = set(section_names) if section_names is not None else set(SECTION_PROMPTS)
+    section_prompts = {name: prompt for name, prompt in SECTION_PROMPTS.items() if name in wanted}
+    if not section_prompts:
+        return {}
+
+    def run_section(section_name: str, section_prompt: str) -> str:
+        content = _generate_section(provider, context, section_name, section_prompt, use_cache, user_id)
+        if on_section_complete:
+            on_section_complete(section_name, content)
+        return content
+
+    generated = {}
+    strategy = strategy or settings.llm_generation_strategy
+    if strategy == "single_call" and len(section_prompts) > 1:
+        print(f"Generating grant application with {provider.name} (single call)...")
+        generated = _generate_sections_single_call(provider, context, section_prompts, use_cache, user_id)
+        if on_section_complete:
+            for section_name, content in generated.items():
+                on_section_complete(section_name, content)
+        # Anything the structured response missed is generated on its own
+        section_prompts = {name: prompt for name, prompt in section_prompts.items() if name not in generated}
+
+    if section_prompts:
+        max_workers = max(1, min(max_concurrency or settings.llm_section_concurrency, len(section_prompts)))
+
+        print(f"Generating grant application with {provider.name} ({max_workers} concurrent sections)...")
+
+        if max_workers == 1:
+            for section_name, section_prompt in section_prompts.items():
+                generated[section_name] = run_section(section_name, section_prompt)
+        else:
+            # Sections are independent, so run them in parallel
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    section_name: executor.submit(run_section, section_name, section_prompt)
+                    for section_name, section_prompt in section_prompts.items()
+                }
+                for section_name, future in futures.items():
+                    generated[section_name] = future.result()
+
+    # Return sections in SECTION_PROMPTS order to keep the output stable
+    sections = {name: generated[name] for name in SECTION_PROMPTS if name in generated}
 
     print("✓ Grant application generation complete!")
     return sections
 
 
-def refine_section(original_text: str, feedback: str) -> str:
+def generate_grant_applications(
+    grants: Dict[int, Dict[str, Any]],
+    org_data: Dict[str, Any],
+    max_concurrency: Optional[int] = None,
+    use_cache: bool = True,
+    strategy: Optional[str] = None,
+    on_grant_complete: Optional[Callable[[int, Any], None]] = None,
+    user_id: Optional[int] = None
+) -> Dict[int, Any]:
     """
-    Refine a specific section based on user feedback using Groq AI
+    Generate applications for one organization against several grants
+
+    Every (grant, section) call shares one executor, so the whole batch never
+    has more than max_concurrency LLM calls in flight. Calls are queued grant
+    by grant, so earlier grants finish first.
 
     Args:
-        original_text: The original section text
-        feedback: User's feedback or instructions for improvement
+        grants: Grant id to grant data (as passed to generate_grant_application)
+        org_data: Dictionary containing organization details, shared by every grant
+        max_concurrency: Maximum LLM calls in flight for the batch
+            (defaults to the llm_batch_concurrency setting)
+        use_cache: Set to False to bypass cached responses and force fresh generation
+        strategy: "per_section" or "single_call"; defaults to the llm_generation_strategy setting
+        on_grant_complete: Called with (grant_id, sections or exception) as each grant finishes,
+            possibly from a worker thread
+        user_id: User the applications are generated for, for telemetry
 
     Returns:
-        Refined section text
+        Grant id to its sections (in SECTION_PROMPTS order), or to the LLMUnavailableError
+        that stopped it
+    """
+    settings = get_settings()
+    provider = get_llm_provider()
+    if not grants:
+        return {}
+
+    contexts = {grant_id: build_application_context(grant_data, org_data) for grant_id, grant_data in grants.items()}
+    generated: Dict[int, Dict[str, str]] = {grant_id: {} for grant_id in grants}
+    failures: Dict[int, Exception] = {}
+    max_workers = max(1, max_concurrency or settings.llm_batch_concurrency)
+    strategy = strategy or settings.llm_generation_strategy
+
+    def result(grant_id: int) -> Any:
+        if grant_id in failures:
+            return failures[grant_id]
+        return {name: generated[grant_id][name] for name in SECTION_PROMPTS if name in generated[grant_id]}
+
+    print(f"Generating {len(grants)} grant applications with {provider.name} ({max_workers} concurrent calls)...")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if strategy == "single_call":
+            futures = {
+                grant_id: executor.submit(
+                    _generate_sections_single_call, provider, contexts[grant_id], SECTION_PROMPTS, use_cache, user_id
+                )
+                for grant_id in grants
+            }
+            for grant_id, future in futures.items():
+                try:
+                    generated[grant_id] = future.result()
+                except LLMUnavailableError as e:
+                    failures[grant_id] = e
+
+        # Per-section calls for everything the single call did not produce
+        futures = {
+            (grant_id, section_name): executor.submit(
+                _generate_section, provider, contexts[grant_id], section_name, section_prompt, use_cache, user_id
+            )
+            for grant_id in grants if grant_id not in failures
+            for section_name, section_prompt in SECTION_PROMPTS.items() if section_name not in generated[grant_id]
+        }
+        pending = {grant_id: 0 for grant_id in grants}
+        grant_futures: Dict[int, List[Future]] = {grant_id: [] for grant_id in grants}
+        for (grant_id, _), future in futures.items():
+            pending[grant_id] += 1
+            grant_futures[grant_id].append(future)
+
+        def cancel_rest_of_grant(grant_id: int) -> Callable[[Future], None]:
+            # The grant fails as a whole once the provider is unavailable; don't spend budget on its other sections
+            def on_done(future: Future) -> None:
+                if not future.cancelled() and isinstance(future.exception(), LLMUnavailableError):
+                    for other in grant_futures[grant_id]:
+                        other.cancel()
+            return on_done
+
+        for (grant_id, _), future in futures.items():
+            future.add_done_callback(cancel_rest_of_grant(grant_id))
+
+        for grant_id, count in pending.items():
+            if count == 0 and on_grant_complete:
+                on_grant_complete(grant_id, result(grant_id))
+        for (grant_id, section_name), future in futures.items():
+            try:
+                generated[grant_id][section_name] = future.result()
+            except LLMUnavailableError as e:
+                failures.setdefault(grant_id, e)
+            except CancelledError:
+                pass  # cancelled because another section of the grant failed, which is recorded
+            pending[grant_id] -= 1
+            if pending[grant_id] == 0 and on_grant_complete:
+                on_grant_complete(grant_id, result(grant_id))
+
+    print(f"✓ Batch generation complete ({len(grants) - len(failures)}/{len(grants)} grants)")
+    return {grant_id: result(grant_id) for grant_id in grants}
+
+
+def _stream_section(
+    provider: LLMProvider,
+    context: str,
+    section_name: str,
+    section_prompt: str,
+    emit: Callable[[Dict[str, Any]], None],
+    cancelled: threading.Event,
+    user_id: Optional[int] = None
+) -> None:
+    """
+    Stream a single application section, emitting delta and completion events
+
+    Args:
+        provider: LLM provider to use for the request
+        context: Shared system prompt with grant and organization details
+        section_name: Key of the section being generated
+        section_prompt: Section-specific instructions
+        emit: Callback receiving each event dictionary
+        cancelled: Set when the consumer has gone away, stops reading the upstream stream
+        user_id: User the section is generated for, for telemetry
     """
+    print(f"  Streaming: {section_name}...")
+    emit({"event": "section_start", "section": section_name})
+
+    model = provider.model
+    parts = []
+    error = None
+    usage = None
+    ttft_ms = None
+    retry_after = None
+    started = time.perf_counter()
+    try:
+        messages = _section_messages(context, section_prompt)
+        governor = get_governor()
+        stream = governor.call(
+            lambda: provider.stream(messages, temperature=0.7, max_tokens=1024),
+            estimated_tokens=estimate_tokens(messages, 1024)
+        )
+        governor.observe_headers(stream.headers)
+        try:
+            for chunk in stream:
+                if cancelled.is_set():
+                    return
+                if chunk.text:
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - started) * 1000
+                    parts.append(chunk.text)
+                    emit({"event": "delta", "section": section_name, "text": chunk.text})
+                if chunk.usage:
+                    usage = chunk.usage
+        finally:
+            stream.close()
+
+        content = "".join(parts).strip()
+        print(f"  ✓ {section_name} streamed ({len(content)} chars)")
+        record_llm_call(
+            operation="stream_section",
+            outcome="success",
+            model=model,
+            section=section_name,
+            user_id=user_id,
+            cache_status="disabled",
+            latency_ms=(time.perf_counter() - started) * 1000,
+            ttft_ms=ttft_ms,
+            usage=usage,
+        )
+
+    except Exception as e:
+        print(f"  ✗ Error streaming {section_name}: {str(e)}")
+        error = str(e)
+        if isinstance(e, LLMUnavailableError):
+            # Nothing is saved for this section; the client can retry after retry_after
+            content = None
+            retry_after = e.retry_after
+        else:
+            content = _section_fallback(e)
+        record_llm_call(
+            operation="stream_section",
+            outcome="error",
+            model=model,
+            section=section_name,
+            user_id=user_id,
+            cache_status="disabled",
+            latency_ms=(time.perf_counter() - started) * 1000,
+            ttft_ms=ttft_ms,
+            error=e,
+        )
+
+    emit({
+        "event": "section_complete",
+        "section": section_name,
+        "content": content,
+        "error": error,
+        "retry_after": retry_after
+    })
+
+
+def _complete_failed_section(section_name: str, emit: Callable[[Dict[str, Any]], None], future: Future) -> None:
+    """
+    Emit the terminal section_complete event for a section whose worker raised
+
+    _stream_section emits section_complete itself for provider errors, but an
+    exception outside its error handling (e.g. while emitting section_start)
+    would otherwise leave the stream waiting on that section forever.
+    """
+    if future.cancelled() or future.exception() is None:
+        return
+    error = future.exception()
+    print(f"  ✗ Error streaming {section_name}: {str(error)}")
+    emit({
+        "event": "section_complete",
+        "section": section_name,
+        "content": None,
+        "error": str(error),
+        "retry_after": None
+    })
+
+
+def stream_grant_application(
+    grant_data: Dict[str, Any],
+    org_data: Dict[str, Any],
+    max_concurrency: Optional[int] = None,
+    heartbeat_interval: float = 15.0,
+    user_id: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generate a grant application, yielding events as the provider streams the sections
+
+    Events are dictionaries with an "event" key:
+    - section_start: {"section"}
+    - delta: {"section", "text"} for each streamed token chunk
+    - section_complete: {"section", "content", "error", "retry_after"} with the final (or
+      fallback) text; content is None when the provider was unavailable
+    - heartbeat: emitted when nothing arrived for heartbeat_interval seconds
 
+    Args:
+        grant_data: Dictionary containing grant details (title, description, eligibility, etc.)
+        org_data: Dictionary containing organization details (name, mission, budget, etc.)
+        max_concurrency: Maximum number of sections streamed in parallel
+            (defaults to the llm_section_concurrency setting)
+        heartbeat_interval: Seconds of silence before a heartbeat event is yielded
+        user_id: User the application is generated for, for telemetry
+
+    Yields:
+        Event dictionaries, ending once every section has completed
+    """
     settings = get_settings()
-    client = Groq(api_key=settings.groq_api_key)
+    provider = get_llm_provider()
 
+    context = build_application_context(grant_data, org_data)
+    max_workers = max(1, min(max_concurrency or settings.llm_section_concurrency, len(SECTION_PROMPTS)))
+
+    print(f"Streaming grant application with {provider.name} ({max_workers} concurrent sections)...")
+
+    events: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for section_name, section_prompt in SECTION_PROMPTS.items():
+            future = executor.submit(
+                _stream_section, provider, context, section_name, section_prompt, events.put, cancelled, user_id
+            )
+            future.add_done_callback(partial(_complete_failed_section, section_name, events.put))
+
+        remaining = len(SECTION_PROMPTS)
+        while remaining:
+            try:
+                event = events.get(timeout=heartbeat_interval)
+            except queue.Empty:
+                yield {"event": "heartbeat"}
+                continue
+            if event["event"] == "section_complete":
+                remaining -= 1
+            yield event
+
+        print("✓ Grant application streaming complete!")
+    finally:
+        # Stop in-flight sections promptly if the consumer disconnected early
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _refine_messages(original_text: str, feedback: str) -> List[Dict[str, str]]:
     prompt = f"""You are an expert grant writer. A user has provided feedback on a section of their grant application.
 
 ORIGINAL TEXT:
@@ -169,42 +780,93 @@ USER FEEDBACK:
 {feedback}
 
 Please revise the text based on the user's feedback. Maintain the professional tone and quality of grant writing while incorporating their requested changes. Return ONLY the revised text, with no additional commentary."""
+    return [
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def refine_section(
+    original_text: str,
+    feedback: str,
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> str:
+    """
+    Refine a specific section based on user feedback using the configured LLM provider
+
+    Args:
+        original_text: The original section text
+        feedback: User's feedback or instructions for improvement
+        use_cache: Set to False to bypass a cached refinement
+        user_id: User requesting the refinement, for telemetry
+
+    Returns:
+        Refined section text
+    """
+
+    provider = get_llm_provider()
 
     try:
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model="llama-3.3-70b-versatile",
+        return _chat_completion(
+            provider,
+            _refine_messages(original_text, feedback),
             temperature=0.7,
             max_tokens=1024,
+            use_cache=use_cache,
+            operation="refine",
+            user_id=user_id,
         )
 
-        return chat_completion.choices[0].message.content.strip()
-
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         print(f"Error refining section: {str(e)}")
         return f"{original_text}\n\n[Note: Unable to refine section. Error: {str(e)}]"
 
 
-def generate_personalization_suggestion(field_name: str, org_data: Dict[str, Any]) -> str:
+SUGGESTION_TEMPERATURE = 0.8  # Slightly higher for more creative suggestions
+SUGGESTION_MAX_TOKENS = 300
+
+# Personalization fields the application form can ask suggestions for
+PERSONALIZATION_FIELDS = ["key_achievements", "specific_needs", "target_outcomes", "community_impact"]
+
+# Organization details a suggestion is based on, with the defaults the form sends for blanks
+PERSONALIZATION_ORG_DEFAULTS = {
+    "organization_name": "",
+    "organization_type": "Child Care Center",
+    "city": "",
+    "mission_statement": "",
+    "current_enrollment": 0,
+    "operating_budget": 0.0,
+    "staff_count": 0,
+}
+
+
+def personalization_org_data(values: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Generate a personalization field suggestion based on organization data
+    Reduce organization details to the ones suggestions use, filling blanks with defaults
+
+    Suggestions requested by the form and ones precomputed from a saved profile
+    go through this, so the same organization renders the same prompt and hits
+    the same cache entry.
 
     Args:
-        field_name: The personalization field to generate (key_achievements, specific_needs, target_outcomes, community_impact)
-        org_data: Dictionary containing basic organization details
+        values: Organization details, e.g. a request body or profile columns
 
     Returns:
-        Suggested text for the personalization field
+        Dictionary with exactly the PERSONALIZATION_ORG_DEFAULTS keys
     """
+    return {
+        field: default if values.get(field) is None else values[field]
+        for field, default in PERSONALIZATION_ORG_DEFAULTS.items()
+    }
 
-    settings = get_settings()
-    client = Groq(api_key=settings.groq_api_key)
 
+def _personalization_prompt(field_name: str, org_data: Dict[str, Any]) -> str:
+    """Prompt for one personalization field, or an empty string for unknown fields"""
     # Extract organization data
     org_name = org_data.get('organization_name', 'the organization')
     org_type = org_data.get('organization_type', 'Child Care Center')
@@ -266,25 +928,446 @@ Staff: {staff} professionals
 Write ONLY the community impact text (2-3 sentences), with no preamble or labels. Emphasize community value and relationships."""
     }
 
-    prompt = prompts.get(field_name, "")
+    return prompts.get(field_name, "")
+
+
+def generate_personalization_suggestion(
+    field_name: str,
+    org_data: Dict[str, Any],
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> str:
+    """
+    Generate a personalization field suggestion based on organization data
+
+    Args:
+        field_name: The personalization field to generate (key_achievements, specific_needs, target_outcomes, community_impact)
+        org_data: Dictionary containing basic organization details
+        use_cache: Set to False to bypass a cached suggestion
+        user_id: User requesting the suggestion, for telemetry
+
+    Returns:
+        Suggested text for the personalization field
+    """
+
+    provider = get_llm_provider()
+
+    prompt = _personalization_prompt(field_name, org_data)
     if not prompt:
         return f"Unable to generate suggestion for {field_name}"
 
     try:
-        chat_completion = client.chat.completions.create(
-            messages=[
+        return _chat_completion(
+            provider,
+            [
                 {
                     "role": "user",
                     "content": prompt
                 }
             ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.8,  # Slightly higher for more creative suggestions
-            max_tokens=300,
+            temperature=SUGGESTION_TEMPERATURE,
+            max_tokens=SUGGESTION_MAX_TOKENS,
+            use_cache=use_cache,
+            operation="suggestion",
+            section=field_name,
+            user_id=user_id,
+        )
+
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        print(f"Error generating personalization suggestion: {str(e)}")
+        return f"Unable to generate suggestion. Please fill this in manually."
+
+
+def generate_personalization_suggestions(
+    org_data: Dict[str, Any],
+    field_names: Optional[Iterable[str]] = None,
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Generate suggestions for several personalization fields at once
+
+    Fields are generated concurrently, each with the same prompt and cache key as
+    generate_personalization_suggestion, so single-field requests reuse the results.
+
+    Args:
+        org_data: Dictionary containing basic organization details
+        field_names: Fields to suggest (defaults to all of PERSONALIZATION_FIELDS)
+        use_cache: Set to False to bypass cached suggestions
+        user_id: User requesting the suggestions, for telemetry
+
+    Returns:
+        Field name to suggested text, in the requested order
+
+    Raises:
+        LLMUnavailableError: The provider is unavailable
+    """
+    field_names = list(dict.fromkeys(field_names if field_names is not None else PERSONALIZATION_FIELDS))
+    if not field_names:
+        return {}
+
+    max_workers = max(1, min(get_settings().llm_section_concurrency, len(field_names)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            field_name: executor.submit(generate_personalization_suggestion, field_name, org_data, use_cache, user_id)
+            for field_name in field_names
+        }
+        return {field_name: future.result() for field_name, future in futures.items()}
+
+
+def warm_personalization_suggestions(org_data: Dict[str, Any], user_id: Optional[int] = None) -> None:
+    """
+    Precompute every personalization suggestion into the response cache
+
+    Meant to run in the background after a profile is saved, so the application
+    form can pre-fill from the cache. Failures are logged and otherwise ignored.
+
+    Args:
+        org_data: Organization details, as returned by personalization_org_data
+        user_id: User the suggestions are for, for telemetry
+    """
+    if not get_settings().llm_cache_enabled:
+        return
+    if not (org_data.get("organization_name") and org_data.get("city") and org_data.get("mission_statement")):
+        # The form won't ask for suggestions until these are filled in either
+        return
+
+    try:
+        generate_personalization_suggestions(org_data, user_id=user_id)
+        print(f"✓ Personalization suggestions precomputed for {org_data['organization_name']}")
+    except Exception as e:
+        print(f"Error precomputing personalization suggestions: {str(e)}")
+
+
+# Async variants used by the async request handlers. They share prompts, cache
+# keys and telemetry with the functions above; cancelling them (e.g. when the
+# client disconnects) cancels the upstream calls that nobody else is waiting on.
+
+_async_in_flight = AsyncSingleFlight()
+
+
+async def _achat_completion(
+    provider: LLMProvider,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    use_cache: bool = True,
+    response_format: Optional[Dict[str, str]] = None,
+    operation: str = "completion",
+    section: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> str:
+    """
+    Async version of _chat_completion
+
+    Cache reads and writes may touch SQLite, so they run in a worker thread.
+    A call cancelled before it finishes is recorded with outcome 'cancelled'.
+
+    Raises:
+        LLMUnavailableError: The provider is rate limiting or failing beyond the retry budget
+    """
+    settings = get_settings()
+    model = provider.model
+    cache = get_llm_cache() if settings.llm_cache_enabled else None
+    key = make_cache_key(f"{provider.name}/{model}", temperature, messages, max_tokens, response_format)
+    telemetry = {"operation": operation, "model": model, "section": section, "user_id": user_id}
+    started = time.perf_counter()
+
+    if cache and use_cache:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            record_llm_call(
+                outcome="success",
+                cache_status="hit",
+                latency_ms=(time.perf_counter() - started) * 1000,
+                **telemetry
+            )
+            return cached
+
+    cache_status = ("miss" if use_cache else "bypass") if cache else "disabled"
+    led = False
+
+    async def upstream() -> str:
+        nonlocal led
+        led = True
+        governor = get_governor()
+        try:
+            completion = await governor.acall(
+                lambda: provider.acomplete(messages, temperature, max_tokens, response_format),
+                estimated_tokens=estimate_tokens(messages, max_tokens)
+            )
+            governor.observe_headers(completion.headers)
+            content = completion.content.strip()
+        except asyncio.CancelledError:
+            record_llm_call(
+                outcome="cancelled",
+                cache_status=cache_status,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                **telemetry
+            )
+            raise
+        except Exception as e:
+            record_llm_call(
+                outcome="error",
+                cache_status=cache_status,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error=e,
+                **telemetry
+            )
+            raise
+
+        record_llm_call(
+            outcome="success",
+            cache_status=cache_status,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            usage=completion.usage,
+            **telemetry
+        )
+
+        if cache:
+            await asyncio.to_thread(cache.set, key, model, content)
+        return content
+
+    try:
+        content, shared = await _async_in_flight.do(key, upstream)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        if not led:
+            record_llm_call(
+                outcome="error",
+                cache_status="coalesced",
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error=e,
+                **telemetry
+            )
+        raise
+
+    if shared:
+        record_llm_call(
+            outcome="success",
+            cache_status="coalesced",
+            latency_ms=(time.perf_counter() - started) * 1000,
+            **telemetry
         )
+    return content
+
 
-        return chat_completion.choices[0].message.content.strip()
+async def _agenerate_section(
+    provider: LLMProvider,
+    context: str,
+    section_name: str,
+    section_prompt: str,
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> str:
+    """Async version of _generate_section"""
+    print(f"  Generating: {section_name}...")
 
+    try:
+        content = await _achat_completion(
+            provider,
+            _section_messages(context, section_prompt),
+            temperature=0.7,
+            max_tokens=1024,
+            use_cache=use_cache,
+            operation="section",
+            section=section_name,
+            user_id=user_id,
+        )
+        print(f"  ✓ {section_name} generated ({len(content)} chars)")
+        return content
+
+    except LLMUnavailableError:
+        print(f"  ✗ LLM provider unavailable while generating {section_name}")
+        raise
+    except Exception as e:
+        print(f"  ✗ Error generating {section_name}: {str(e)}")
+        return _section_fallback(e)
+
+
+async def _agenerate_sections_single_call(
+    provider: LLMProvider,
+    context: str,
+    section_prompts: Dict[str, str],
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> Dict[str, str]:
+    """Async version of _generate_sections_single_call"""
+    print(f"  Generating {len(section_prompts)} sections in a single call...")
+
+    try:
+        raw = await _achat_completion(
+            provider,
+            _single_call_messages(context, section_prompts),
+            temperature=0.7,
+            max_tokens=_single_call_max_tokens(section_prompts),
+            use_cache=use_cache,
+            response_format={"type": "json_object"},
+            operation="single_call",
+            user_id=user_id,
+        )
+        parsed = json.loads(raw)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        print(f"  ✗ Single-call generation failed, falling back to per-section: {str(e)}")
+        return {}
+
+    return _single_call_sections(parsed, section_prompts)
+
+
+async def _gather_all(awaitables: Iterable[Awaitable[Any]]) -> List[Any]:
+    """Like asyncio.gather, but the first failure (or cancellation) cancels the rest"""
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def agenerate_grant_application(
+    grant_data: Dict[str, Any],
+    org_data: Dict[str, Any],
+    max_concurrency: Optional[int] = None,
+    section_names: Optional[Iterable[str]] = None,
+    use_cache: bool = True,
+    strategy: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Async version of generate_grant_application
+
+    Sections run as tasks on the event loop instead of pool threads. Cancelling
+    the call cancels every section still in flight.
+
+    Args:
+        grant_data: Dictionary containing grant details (title, description, eligibility, etc.)
+        org_data: Dictionary containing organization details (name, mission, budget, etc.)
+        max_concurrency: Maximum number of sections generated in parallel
+            (defaults to the llm_section_concurrency setting, 1 means sequential)
+        section_names: Only generate these sections (defaults to all of SECTION_PROMPTS)
+        use_cache: Set to False to bypass cached responses and force fresh generation
+        strategy: "per_section" or "single_call"; defaults to the llm_generation_strategy setting
+        user_id: User the application is generated for, for telemetry
+
+    Returns:
+        Dictionary with generated sections of the application, in SECTION_PROMPTS order
+    """
+    settings = get_settings()
+    provider = get_llm_provider()
+
+    context = build_application_context(grant_data, org_data)
+
+    wanted = set(section_names) if section_names is not None else set(SECTION_PROMPTS)
+    section_prompts = {name: prompt for name, prompt in SECTION_PROMPTS.items() if name in wanted}
+    if not section_prompts:
+        return {}
+
+    generated = {}
+    strategy = strategy or settings.llm_generation_strategy
+    if strategy == "single_call" and len(section_prompts) > 1:
+        print(f"Generating grant application with {provider.name} (single call, async)...")
+        generated = await _agenerate_sections_single_call(provider, context, section_prompts, use_cache, user_id)
+        section_prompts = {name: prompt for name, prompt in section_prompts.items() if name not in generated}
+
+    if section_prompts:
+        max_workers = max(1, min(max_concurrency or settings.llm_section_concurrency, len(section_prompts)))
+        print(f"Generating grant application with {provider.name} ({max_workers} concurrent sections, async)...")
+        limit = asyncio.Semaphore(max_workers)
+
+        async def run_section(section_name: str, section_prompt: str) -> str:
+            async with limit:
+                return await _agenerate_section(provider, context, section_name, section_prompt, use_cache, user_id)
+
+        contents = await _gather_all(
+            run_section(section_name, section_prompt) for section_name, section_prompt in section_prompts.items()
+        )
+        generated.update(zip(section_prompts, contents))
+
+    sections = {name: generated[name] for name in SECTION_PROMPTS if name in generated}
+
+    print("✓ Grant application generation complete!")
+    return sections
+
+
+async def arefine_section(
+    original_text: str,
+    feedback: str,
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> str:
+    """Async version of refine_section"""
+    provider = get_llm_provider()
+
+    try:
+        return await _achat_completion(
+            provider,
+            _refine_messages(original_text, feedback),
+            temperature=0.7,
+            max_tokens=1024,
+            use_cache=use_cache,
+            operation="refine",
+            user_id=user_id,
+        )
+
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        print(f"Error refining section: {str(e)}")
+        return f"{original_text}\n\n[Note: Unable to refine section. Error: {str(e)}]"
+
+
+async def agenerate_personalization_suggestion(
+    field_name: str,
+    org_data: Dict[str, Any],
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> str:
+    """Async version of generate_personalization_suggestion"""
+    provider = get_llm_provider()
+
+    prompt = _personalization_prompt(field_name, org_data)
+    if not prompt:
+        return f"Unable to generate suggestion for {field_name}"
+
+    try:
+        return await _achat_completion(
+            provider,
+            [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=SUGGESTION_TEMPERATURE,
+            max_tokens=SUGGESTION_MAX_TOKENS,
+            use_cache=use_cache,
+            operation="suggestion",
+            section=field_name,
+            user_id=user_id,
+        )
+
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         print(f"Error generating personalization suggestion: {str(e)}")
         return f"Unable to generate suggestion. Please fill this in manually."
+
+
+async def agenerate_personalization_suggestions(
+    org_data: Dict[str, Any],
+    field_names: Optional[Iterable[str]] = None,
+    use_cache: bool = True,
+    user_id: Optional[int] = None
+) -> Dict[str, str]:
+    """Async version of generate_personalization_suggestions"""
+    field_names = list(dict.fromkeys(field_names if field_names is not None else PERSONALIZATION_FIELDS))
+    suggestions = await _gather_all(
+        agenerate_personalization_suggestion(field_name, org_data, use_cache, user_id) for field_name in field_names
+    )
+    return dict(zip(field_names, suggestions))
@@ -0,0 +1,240 @@
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.llm_telemetry import LLMCallLog
+
+# Rows waiting to be written, shared by the writer thread and flush_llm_telemetry
+_pending: List[Dict[str, Any]] = []
+_writer: Optional[threading.Thread] = None
+_wake = threading.Event()
+_stop = threading.Event()
+_lock = threading.Lock()
+# Held while a batch is taken and written, so a flush also waits for the writer's batch in progress
+_write_lock = threading.Lock()
+_dropped = 0
+
+
+def record_llm_call(
+    operation: str,
+    outcome: str,
+    model: Optional[str] = None,
+    section: Optional[str] = None,
+    user_id: Optional[int] = None,
+    cache_status: Optional[str] = None,
+    latency_ms: Optional[float] = None,
+    ttft_ms: Optional[float] = None,
+    usage: Any = None,
+    error: Optional[BaseException] = None
+) -> None:
+    """
+    Queue a telemetry row for one LLM call without blocking the caller
+
+    Rows are written in batches by a background thread. If the buffer is full
+    the row is dropped rather than slowing down the request.
+
+    Args:
+        operation: Kind of call ('section', 'single_call', 'stream_section', 'refine', 'suggestion')
+        outcome: 'success', 'error' or 'cancelled' (the caller went away before the call finished)
+        model: Model name
+        section: Section or personalization field the call produced
+        user_id: User the call was made for
+        cache_status: 'hit', 'coalesced' (shared another caller's in-flight call), 'miss', 'bypass' or 'disabled'
+        latency_ms: Wall time of the call
+        ttft_ms: Time to first token (streaming calls)
+        usage: Provider usage object with prompt/completion/total token counts
+        error: Exception raised by the call, if any
+    """
+    global _dropped
+    settings = get_settings()
+    if not settings.llm_telemetry_enabled:
+        return
+
+    row = {
+        "operation": operation,
+        "section": section,
+        "user_id": user_id,
+        "model": model,
+        "cache_status": cache_status,
+        "outcome": outcome,
+        "error_type": type(error).__name__ if error else None,
+        "error_message": str(error)[:500] if error else None,
+        "latency_ms": latency_ms,
+        "ttft_ms": ttft_ms,
+        "prompt_tokens": _usage_value(usage, "prompt_tokens"),
+        "completion_tokens": _usage_value(usage, "completion_tokens"),
+        "total_tokens": _usage_value(usage, "total_tokens"),
+        "created_at": datetime.utcnow(),
+    }
+
+    _ensure_writer()
+    with _lock:
+        if len(_pending) >= settings.llm_telemetry_buffer_size:
+            _dropped += 1
+            return
+        _pending.append(row)
+        if len(_pending) >= settings.llm_telemetry_batch_size:
+            _wake.set()
+
+
+def dropped_llm_telemetry() -> int:
+    """Number of rows dropped because the buffer was full"""
+    return _dropped
+
+
+def flush_llm_telemetry() -> int:
+    """Write every buffered row now, returning how many were written"""
+    with _write_lock:
+        with _lock:
+            rows = _pending[:]
+            del _pending[:]
+        batch_size = max(get_settings().llm_telemetry_batch_size, 1)
+        for start in range(0, len(rows), batch_size):
+            _write(rows[start:start + batch_size])
+    return len(rows)
+
+
+def stop_llm_telemetry() -> None:
+    """Stop the background writer and flush what is left in the buffer"""
+    global _writer
+    _stop.set()
+    _wake.set()
+    with _lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.join(timeout=5)
+    flush_llm_telemetry()
+    _stop.clear()
+    _wake.clear()
+
+
+def llm_call_stats(db: Session, hours: int = 24) -> List[Dict[str, Any]]:
+    """
+    Aggregate recorded calls per (operation, section)
+
+    Latency percentiles, token averages and error counts only include calls
+    that reached the provider, so cache hits don't hide upstream slowness and
+    callers coalesced onto another call's request don't count its time or
+    failure again; those are reported as cache_hits and coalesced.
+
+    Args:
+        db: Database session
+        hours: Look-back window
+
+    Returns:
+        One dictionary of counts, latency/TTFT percentiles and token averages per group
+    """
+    flush_llm_telemetry()
+    since = datetime.utcnow() - timedelta(hours=hours)
+    rows = db.query(
+        LLMCallLog.operation,
+        LLMCallLog.section,
+        LLMCallLog.cache_status,
+        LLMCallLog.outcome,
+        LLMCallLog.latency_ms,
+        LLMCallLog.ttft_ms,
+        LLMCallLog.prompt_tokens,
+        LLMCallLog.completion_tokens,
+    ).filter(LLMCallLog.created_at >= since).all()
+
+    groups: Dict[tuple, Dict[str, list]] = {}
+    for row in rows:
+        group = groups.setdefault((row.operation, row.section), {
+            "calls": [], "latency": [], "ttft": [], "prompt": [], "completion": []
+        })
+        group["calls"].append(row)
+        if row.cache_status in ("hit", "coalesced"):
+            continue
+        if row.latency_ms is not None:
+            group["latency"].append(row.latency_ms)
+        if row.ttft_ms is not None:
+            group["ttft"].append(row.ttft_ms)
+        if row.prompt_tokens is not None:
+            group["prompt"].append(row.prompt_tokens)
+        if row.completion_tokens is not None:
+            group["completion"].append(row.completion_tokens)
+
+    stats = []
+    for (operation, section), group in sorted(groups.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+        calls = group["calls"]
+        stats.append({
+            "operation": operation,
+            "section": section,
+            "calls": len(calls),
+            "errors": sum(1 for call in calls if call.outcome == "error" and call.cache_status != "coalesced"),
+            "cancelled": sum(1 for call in calls if call.outcome == "cancelled"),
+            "cache_hits": sum(1 for call in calls if call.cache_status == "hit"),
+            "coalesced": sum(1 for call in calls if call.cache_status == "coalesced"),
+            "latency_p50_ms": _percentile(group["latency"], 50),
+            "latency_p95_ms": _percentile(group["latency"], 95),
+            "ttft_p50_ms": _percentile(group["ttft"], 50),
+            "ttft_p95_ms": _percentile(group["ttft"], 95),
+            "avg_prompt_tokens": _mean(group["prompt"]),
+            "avg_completion_tokens": _mean(group["completion"]),
+        })
+    return stats
+
+
+def _ensure_writer() -> None:
+    """Start the writer thread on first use"""
+    global _writer
+    if _writer is None:
+        with _lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_writer_loop, name="llm-telemetry-writer", daemon=True)
+                _writer.start()
+
+
+def _writer_loop() -> None:
+    """Write the buffered rows every flush interval, or sooner once a full batch is waiting, until stopped"""
+    settings = get_settings()
+    while not _stop.is_set():
+        _wake.wait(timeout=settings.llm_telemetry_flush_seconds)
+        _wake.clear()
+        flush_llm_telemetry()
+
+
+def _write(rows: List[Dict[str, Any]]) -> None:
+    """Bulk insert telemetry rows, logging (not raising) on failure"""
+    if not rows:
+        return
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(LLMCallLog), rows)
+        db.commit()
+    except Exception as e:
+        print(f"Error writing LLM telemetry ({len(rows)} rows): {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _usage_value(usage: Any, field: str) -> Optional[int]:
+    """Read a token count from a usage object or dictionary"""
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return usage.get(field)
+    return getattr(usage, field, None)
+
+
+def _percentile(values: List[float], percent: int) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return round(ordered[rank - 1], 1)
+
+
+def _mean(values: List[int]) -> Optional[float]:
+    if not values:
+        return None
+    return round(sum(values) / len(values), 1)
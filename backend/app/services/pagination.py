@@ -0,0 +1,108 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor records the sort key of the last row on a page, so the next page
+starts right after it with an indexed range condition instead of an OFFSET
+scan, and rows inserted meanwhile don't shift the pages. Cursors are opaque
+to clients: URL-safe base64 of a small JSON document.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def encode_cursor(kind: str, values: List[Any]) -> str:
+    """
+    Build an opaque cursor
+
+    Args:
+        kind: Which ordering the cursor belongs to, checked when it comes back
+        values: Sort key of the last row, ending with its integer id; datetimes are stored as ISO strings
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {"k": kind, "v": [value.isoformat() if isinstance(value, datetime) else value for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, size: int) -> List[Any]:
+    """
+    Read the sort key back from a cursor
+
+    Args:
+        cursor: Value from a previous next_cursor
+        kind: Ordering the current request uses
+        size: Number of values expected
+
+    Returns:
+        The stored values (datetimes still as ISO strings, see parse_cursor_datetime)
+
+    Raises:
+        ValueError: The cursor is malformed or belongs to a different ordering
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        raise ValueError("Cursor does not match this listing")
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != size or not isinstance(values[-1], int):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_cursor_datetime(value: Any) -> Optional[datetime]:
+    """Datetime stored in a cursor, or None for a NULL sort value"""
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_after(
+    column: ColumnElement,
+    id_column: ColumnElement,
+    last_value: Any,
+    last_id: int,
+    descending: bool = False,
+    nullable: bool = True
+) -> ColumnElement:
+    """
+    Condition selecting the rows after (last_value, last_id) in ORDER BY column, id
+
+    Both columns must be sorted in the same direction. NULL sort values follow
+    SQLite's ordering: first when ascending, last when descending. Stored
+    values must compare like the bound last_value: on SQLite, timestamps from a
+    func.now() server default are text without microseconds and don't, so
+    those columns aren't usable as sort keys here.
+
+    Args:
+        column: Sort column
+        id_column: Unique tiebreaker column
+        last_value: Sort value of the last row already returned
+        last_id: Tiebreaker of the last row already returned
+        descending: Whether the listing is sorted descending
+        nullable: Whether column can be NULL; False keeps the condition a plain range
+
+    Returns:
+        SQL condition to filter the next page with
+    """
+    if descending:
+        if last_value is None:
+            return and_(column.is_(None), id_column < last_id)
+        after = tuple_(column, id_column) < (last_value, last_id)
+        return or_(after, column.is_(None)) if nullable else after
+
+    if last_value is None:
+        return or_(and_(column.is_(None), id_column > last_id), column.isnot(None))
+    return tuple_(column, id_column) > (last_value, last_id)
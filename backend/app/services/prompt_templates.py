@@ -0,0 +1,229 @@
+"""
+Prompt templates for application generation
+
+The shared system prompt is assembled from three blocks, most stable first:
+
+1. static instructions (change only with PROMPT_VERSION)
+2. the grant block, rendered once per (grant id, last_updated, PROMPT_VERSION)
+   and kept in a bounded LRU together with the parsed grant data
+3. the organization block, rendered per request
+
+Keeping the order fixed makes every prompt for the same grant share a
+byte-identical prefix, which provider-side prompt caching can reuse.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from app.config import get_settings
+from app.models.grant import Grant
+
+# Bump when the templates or section instructions change in a way that should
+# invalidate cached grant blocks and existing drafts on their next regeneration
+PROMPT_VERSION = 2
+
+INSTRUCTIONS = """
+You are an expert grant writer with a proven track record of winning competitive funding. You understand that funders have limited resources and receive many applications - your job is to make THIS application stand out as the clear choice.
+
+YOUR MISSION: Write an application that makes funders excited to invest in this organization. This application must:
+
+1. DEMONSTRATE EXCEPTIONAL VALUE: Show why this organization delivers outsized impact relative to investment. Highlight proven track record, efficiency, and results.
+
+2. CREATE URGENCY: Illustrate the critical need and what will be lost if this grant isn't awarded. Make the funder feel this is an opportunity they cannot miss.
+
+3. SHOWCASE UNIQUE STRENGTHS: Emphasize what makes this organization different from and better than alternatives. Focus on competitive advantages, innovative approaches, and special expertise.
+
+4. PROVE CREDIBILITY: Use specific data, achievements, and examples that demonstrate capability. Make it clear this organization will deliver on promises.
+
+5. ALIGN PERFECTLY: Connect every aspect of the proposal directly to the funder's priorities and mission. Show you understand what they care about and how this investment advances their goals.
+
+6. PAINT A VIVID PICTURE: Help the funder visualize the specific children, families, and communities who will benefit. Make the impact tangible and emotionally compelling.
+
+7. ELIMINATE DOUBT: Anticipate concerns (sustainability, capacity, outcomes) and proactively address them with confidence and evidence.
+
+8. INSPIRE CONFIDENCE: Use strong, decisive language that conveys competence and readiness. Avoid hedging or uncertainty.
+
+Write in a professional but passionate tone that balances data-driven credibility with heartfelt commitment to mission. Every sentence should advance the case for funding THIS organization.
+"""
+
+
+class CompiledGrant:
+    """Parsed grant data and its rendered prompt block; shared between requests, treat as read-only"""
+
+    def __init__(self, data: Dict[str, Any], block: str):
+        self.data = data
+        self.block = block
+
+
+class GrantBlockCache:
+    """Bounded LRU of compiled grants keyed by (grant id, last_updated, PROMPT_VERSION)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, CompiledGrant]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[CompiledGrant]:
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+    def set(self, key: Tuple, compiled: CompiledGrant) -> None:
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+_cache: Optional[GrantBlockCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_grant_block_cache() -> GrantBlockCache:
+    """Return the process-wide compiled grant cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GrantBlockCache(get_settings().prompt_grant_cache_size)
+    return _cache
+
+
+def compile_grant(grant: Grant) -> CompiledGrant:
+    """
+    Parse a grant and render its prompt block, reusing the cached result while the grant is unchanged
+
+    Args:
+        grant: Grant row
+
+    Returns:
+        The parsed grant data (including id and last_updated) and its rendered block
+    """
+    key = _cache_key(grant.id, grant.last_updated.isoformat() if grant.last_updated else None)
+    cache = get_grant_block_cache()
+    if key:
+        compiled = cache.get(key)
+        if compiled:
+            return compiled
+
+    data = {
+        "id": grant.id,
+        "last_updated": grant.last_updated.isoformat() if grant.last_updated else None,
+        "title": grant.title,
+        "source_name": grant.source_name,
+        "source_type": grant.source_type,
+        "description": grant.description,
+        "amount_min": grant.amount_min,
+        "amount_max": grant.amount_max,
+        "deadline": grant.deadline.isoformat() if grant.deadline else None,
+        "eligibility_criteria": grant.eligibility_criteria or [],
+        "funding_priorities": grant.funding_priorities or [],
+        "required_documents": grant.required_documents or [],
+        "geographic_restriction": grant.geographic_restriction
+    }
+    compiled = CompiledGrant(data, render_grant_block(data))
+    if key:
+        cache.set(key, compiled)
+    return compiled
+
+
+def grant_block(grant_data: Dict[str, Any]) -> str:
+    """Grant block for grant data, from the cache when it came from compile_grant"""
+    key = _cache_key(grant_data.get("id"), grant_data.get("last_updated"))
+    if key:
+        compiled = get_grant_block_cache().get(key)
+        if compiled:
+            return compiled.block
+    return render_grant_block(grant_data)
+
+
+def render_grant_block(grant_data: Dict[str, Any]) -> str:
+    """Render the grant information block"""
+    grant_title = grant_data.get('title', 'Grant Program')
+    grant_source = grant_data.get('source_name', 'Funding Organization')
+    amount_min = _value(grant_data, 'amount_min', 10000)
+    amount_max = _value(grant_data, 'amount_max', 50000)
+    description = grant_data.get('description', 'Support for early childhood education')
+    eligibility = grant_data.get('eligibility_criteria', [])
+    priorities = grant_data.get('funding_priorities', [])
+
+    return f"""
+GRANT INFORMATION:
+- Title: {grant_title}
+- Funding Organization: {grant_source}
+- Description: {description}
+- Funding Range: ${amount_min:,.0f} - ${amount_max:,.0f}
+- Eligibility Criteria: {', '.join(eligibility) if eligibility else 'General eligibility'}
+- Funding Priorities: {', '.join(priorities) if priorities else 'General priorities'}
+"""
+
+
+def render_org_block(org_data: Dict[str, Any]) -> str:
+    """Render the organization and personalization blocks"""
+    org_name = org_data.get('organization_name', 'Our Organization')
+    org_type = org_data.get('organization_type', 'Child Care Center')
+    city = org_data.get('city', 'Portland')
+    mission = org_data.get('mission_statement', 'To provide quality early childhood education')
+    enrollment = org_data.get('current_enrollment', 50)
+    budget = _value(org_data, 'operating_budget', 250000)
+    staff = org_data.get('staff_count', 8)
+
+    achievements = org_data.get('key_achievements', '')
+    specific_needs = org_data.get('specific_needs', '')
+    target_outcomes = org_data.get('target_outcomes', '')
+    community_impact = org_data.get('community_impact', '')
+
+    return f"""
+ORGANIZATION INFORMATION:
+- Name: {org_name}
+- Type: {org_type}
+- Location: {city}, Oregon
+- Mission: {mission}
+- Current Enrollment: {enrollment} children
+- Annual Budget: ${budget:,.0f}
+- Staff Count: {staff} professionals
+
+PERSONALIZATION DETAILS:
+- Key Achievements: {achievements}
+- Specific Needs/Challenges: {specific_needs}
+- Target Outcomes: {target_outcomes}
+- Community Impact: {community_impact}
+"""
+
+
+def render_application_context(grant_data: Dict[str, Any], org_data: Dict[str, Any]) -> str:
+    """Assemble the shared system prompt: instructions, then grant, then organization"""
+    return INSTRUCTIONS + grant_block(grant_data) + render_org_block(org_data)
+
+
+def _cache_key(grant_id: Optional[int], last_updated: Optional[str]) -> Optional[Tuple]:
+    if grant_id is None or last_updated is None:
+        return None
+    return (grant_id, last_updated, PROMPT_VERSION)
+
+
+def _value(data: Dict[str, Any], field: str, default: float) -> float:
+    """Numeric field with a default for missing or NULL values, so formatting never fails"""
+    value = data.get(field)
+    return default if value is None else value
@@ -0,0 +1,25 @@
+"""
+Shared JSON codec (orjson)
+
+Used for the JSON columns (see app.models.types.JSONText) and wherever the
+API serializes JSON by hand, so every path encodes the same way and none pays
+for the standard library's slower encoder and decoder.
+"""
+from typing import Any
+
+import orjson
+
+
+def dumps(value: Any) -> str:
+    """Encode to a compact JSON string (UTF-8, not ASCII-escaped)"""
+    return orjson.dumps(value).decode("utf-8")
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Encode to compact JSON bytes, ready to send"""
+    return orjson.dumps(value)
+
+
+def loads(data: Any) -> Any:
+    """Decode a JSON str or bytes"""
+    return orjson.loads(data)
@@ -0,0 +1,97 @@
+"""
+Compare per-section and single-call application generation
+
+Generates the same application with both strategies against the configured
+LLM provider (real quota unless LLM_PROVIDER=fake) and reports upstream
+calls, prompt and completion tokens, and wall-clock latency for each.
+
+Usage (from backend/):
+    python -m benchmarks.bench_generation_strategies [--grant-id 1] [--runs 1]
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from app.database import SessionLocal
+from app.models.grant import Grant
+from app.services.application_service import grant_prompt_data
+from app.services.llm_providers import get_llm_provider
+from app.services.llm_service import generate_grant_application
+
+SAMPLE_ORG = {
+    "organization_name": "Little Sprouts Learning Center",
+    "organization_type": "Child Care Center",
+    "city": "Salem",
+    "mission_statement": "Providing high-quality, culturally responsive early learning for working families.",
+    "current_enrollment": 48,
+    "operating_budget": 420000,
+    "staff_count": 9,
+}
+
+
+class UsageRecorder:
+    """Wraps the provider's complete() to count calls and tokens"""
+
+    def __init__(self, provider):
+        self._provider = provider
+        self._complete = provider.complete
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def install(self):
+        self._provider.complete = self._recording_complete
+
+    def uninstall(self):
+        del self._provider.complete
+
+    def _recording_complete(self, *args, **kwargs):
+        completion = self._complete(*args, **kwargs)
+        usage = completion.usage or {}
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += usage.get("prompt_tokens") or 0
+            self.completion_tokens += usage.get("completion_tokens") or 0
+        return completion
+
+
+def run(grant_id: int, runs: int) -> None:
+    db = SessionLocal()
+    try:
+        grant = db.query(Grant).filter(Grant.id == grant_id).first()
+        if not grant:
+            raise SystemExit(f"Grant with id {grant_id} not found (run seed_grants.py first)")
+        grant_data = grant_prompt_data(grant)
+    finally:
+        db.close()
+
+    recorder = UsageRecorder(get_llm_provider())
+    recorder.install()
+    try:
+        print(f"{'strategy':<12} {'calls':>6} {'prompt tok':>11} {'compl tok':>10} {'p50 s':>7} {'max s':>7}")
+        for strategy in ("per_section", "single_call"):
+            recorder.reset()
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                generate_grant_application(grant_data, SAMPLE_ORG, use_cache=False, strategy=strategy)
+                timings.append(time.perf_counter() - start)
+            print(
+                f"{strategy:<12} {recorder.calls / runs:>6.1f} {recorder.prompt_tokens / runs:>11.0f} "
+                f"{recorder.completion_tokens / runs:>10.0f} {statistics.median(timings):>7.2f} {max(timings):>7.2f}"
+            )
+    finally:
+        recorder.uninstall()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grant-id", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+    run(args.grant_id, args.runs)
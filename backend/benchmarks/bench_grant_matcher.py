@@ -0,0 +1,96 @@
+"""
+Measure the vectorized grant matcher against a large catalog
+
+Seeds a throwaway SQLite database with synthetic active grants and one
+profile, then reports the median time of each matching step:
+
+- build: loading the active grants into a GrantMatrix (once per catalog version)
+- score: score_profile, all grants at once
+- save: upserting every score into grant_matches
+
+Usage (from backend/):
+    python -m benchmarks.bench_grant_matcher [--grants 50000] [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+POPULATIONS = ["Low-income families", "Children with disabilities", "Dual language learners",
+               "Rural communities", "Infants and toddlers", "Families experiencing homelessness"]
+PRIORITIES = ["Equity and inclusion", "Workforce development", "Facility expansion",
+              "Culturally responsive programming", "Family engagement", "Health and nutrition"]
+AREAS = ["statewide", "rural", "Marion County", "Lane County", "Multnomah County", None]
+
+
+def run(args: argparse.Namespace) -> None:
+    # Settings are read on first use, so the database has to be chosen before importing the app
+    path = os.path.join(tempfile.mkdtemp(), "bench_matcher.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app.database import SessionLocal, init_db
+    from app.models.grant import Grant, GrantMatch
+    from app.models.user import User, UserProfile
+    from app.services.grant_matcher import build_grant_matrix, save_grant_matches, score_profile
+
+    init_db()
+    db = SessionLocal()
+    start = datetime(2027, 1, 1)
+    db.bulk_insert_mappings(Grant, [
+        {
+            "source_name": f"Funder {i % 40}",
+            "source_type": ["state", "federal", "foundation", "local"][i % 4],
+            "title": f"Early Learning Grant {i}",
+            "amount_min": 5000.0 * (i % 10),
+            "amount_max": 25000.0 * (i % 10 + 1),
+            "deadline": start + timedelta(days=i % 365),
+            "eligibility_criteria": ["Licensed child care provider"] if i % 3 == 0 else ["Serves children ages 0-5"],
+            "required_documents": [f"Document {n}" for n in range(i % 8)],
+            "geographic_restriction": AREAS[i % len(AREAS)],
+            "target_populations": POPULATIONS[i % 4:i % 4 + 3],
+            "funding_priorities": PRIORITIES[i % 5:i % 5 + 2],
+            "status": "active",
+        }
+        for i in range(args.grants)
+    ])
+    user = User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    profile = UserProfile(
+        user_id=user.id, organization_name="Sprouts", county="Marion", rural_or_urban="urban", licensed=True,
+        operating_budget=400000.0, mission_statement="Culturally responsive early learning and family engagement",
+        populations_served=["Low-income families", "Dual language learners"]
+    )
+    db.add(profile)
+    db.commit()
+
+    timings = {"build": [], "score": [], "save": []}
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        matrix = build_grant_matrix(db)
+        built = time.perf_counter()
+        scores = score_profile(matrix, profile)
+        scored = time.perf_counter()
+        save_grant_matches(db, user.id, matrix, scores)
+        saved = time.perf_counter()
+        timings["build"].append(built - started)
+        timings["score"].append(scored - built)
+        timings["save"].append(saved - scored)
+
+    eligible = int((scores.eligibility > 0).sum())
+    rows = db.query(GrantMatch).count()
+    db.close()
+
+    print(f"grants={args.grants} repeat={args.repeat} eligible={eligible} grant_matches_rows={rows}")
+    for name, values in timings.items():
+        print(f"{name:6} {statistics.median(values) * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grants", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    run(parser.parse_args())
@@ -0,0 +1,119 @@
+"""
+Measure the per-page serialization cost of GET /grants, before and after JSONText
+
+Seeds a throwaway SQLite database and builds the same page of the grant list
+response both ways, reporting the median time per page:
+
+- before: JSON columns read as TEXT, json.loads per column per row into a
+  dict, validated into GrantListResponse and dumped to JSON the way FastAPI
+  does for a returned dict (the router's previous path)
+- after: JSONText columns decoded with orjson on load, GrantResponse built
+  straight from the ORM rows, encoded once with model_dump_json
+
+Both timings include fetching the page; "serialize" excludes it.
+
+Usage (from backend/):
+    python -m benchmarks.bench_grant_serialization [--grants 2000] [--page-size 100] [--repeat 50]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+JSON_FIELDS = ["eligibility_criteria", "required_documents", "target_populations", "funding_priorities"]
+
+
+def run(args: argparse.Namespace) -> None:
+    # Settings are read on first use, so the database has to be chosen before importing the app
+    path = os.path.join(tempfile.mkdtemp(), "bench_grants.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from sqlalchemy import MetaData, Table, select
+
+    from app.database import SessionLocal, engine, init_db
+    from app.models.grant import Grant
+    from app.schemas.grant import GrantListResponse, GrantResponse
+
+    init_db()
+    db = SessionLocal()
+    start = datetime(2027, 1, 1)
+    db.add_all([
+        Grant(
+            source_name=f"Funder {i % 40}",
+            source_type=["state", "federal", "foundation", "local"][i % 4],
+            title=f"Early Learning Grant {i}",
+            description="Funding for high-quality early learning, family engagement and workforce development. " * 3,
+            amount_min=5000.0 * (i % 10),
+            amount_max=25000.0 * (i % 10 + 1),
+            deadline=start + timedelta(days=i % 365),
+            eligibility_criteria=[f"Eligibility requirement {n}" for n in range(6)],
+            required_documents=[f"Required document {n}" for n in range(6)],
+            target_populations=[f"Population {n}" for n in range(5)],
+            funding_priorities=[f"Funding priority {n}" for n in range(5)],
+            status="active",
+        )
+        for i in range(args.grants)
+    ])
+    db.commit()
+
+    legacy_grants = Table("grants", MetaData(), autoload_with=engine)  # reflected: JSON columns are plain TEXT
+
+    def before() -> tuple:
+        started = time.perf_counter()
+        rows = db.execute(
+            select(legacy_grants).order_by(legacy_grants.c.deadline, legacy_grants.c.id).limit(args.page_size)
+        ).mappings().all()
+        fetched = time.perf_counter()
+        grants = []
+        for row in rows:
+            grant = dict(row)
+            for field in JSON_FIELDS:
+                grant[field] = json.loads(grant[field]) if grant[field] else None
+            grant["search_snippet"] = None
+            grants.append(grant)
+        result = {"grants": grants, "total": None, "page": 1, "page_size": args.page_size, "next_cursor": None}
+        content = GrantListResponse.model_validate(result).model_dump(mode="json")
+        body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+        return time.perf_counter() - started, time.perf_counter() - fetched, body
+
+    def after() -> tuple:
+        started = time.perf_counter()
+        grants = db.query(Grant).order_by(Grant.deadline, Grant.id).limit(args.page_size).all()
+        fetched = time.perf_counter()
+        result = GrantListResponse(
+            grants=[GrantResponse.model_validate(grant) for grant in grants],
+            page=1,
+            page_size=args.page_size,
+        )
+        body = result.model_dump_json().encode("utf-8")
+        return time.perf_counter() - started, time.perf_counter() - fetched, body
+
+    results = {}
+    for name, build in (("before", before), ("after", after)):
+        build()  # warm up
+        timings = []
+        for _ in range(args.repeat):
+            db.expire_all()  # don't let the identity map skip row decoding
+            timings.append(build())
+        results[name] = timings
+    db.close()
+
+    same = json.loads(results["before"][0][2]) == json.loads(results["after"][0][2])
+    print(f"grants={args.grants} page_size={args.page_size} repeat={args.repeat} identical_json={same}")
+    for name, timings in results.items():
+        total = statistics.median(t[0] for t in timings) * 1000
+        serialize = statistics.median(t[1] for t in timings) * 1000
+        print(f"{name:7} page {total:7.2f} ms   serialize {serialize:7.2f} ms   "
+              f"per row {serialize * 1000 / args.page_size:6.1f} us   body {len(timings[0][2])} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grants", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    run(parser.parse_args())
@@ -0,0 +1,92 @@
+"""
+Load-test application generation against an LLM provider
+
+Runs many generate_grant_application calls from concurrent clients and reports
+throughput, latency percentiles, unavailable (503) requests, placeholder
+sections and response-cache hit rate. Defaults to the fake provider, so it
+needs no network or API key; tune it with the LLM_FAKE_* settings.
+
+Usage (from backend/):
+    python -m benchmarks.bench_llm_load [--requests 20] [--clients 4] [--distinct 5]
+        [--section-concurrency 4] [--strategy per_section] [--no-cache] [--provider fake]
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SAMPLE_GRANT = {
+    "title": "Early Learning Expansion Grant",
+    "source_name": "Oregon Early Learning Division",
+    "source_type": "state",
+    "description": "Funding to expand access to high-quality infant and toddler care in underserved communities.",
+    "amount_min": 25000,
+    "amount_max": 150000,
+    "deadline": None,
+    "eligibility_criteria": ["Licensed child care centers in Oregon", "Serving children ages 0-3"],
+    "funding_priorities": ["infant and toddler slots", "workforce retention", "equity"],
+    "required_documents": [],
+    "geographic_restriction": "Oregon",
+}
+
+
+def run(args: argparse.Namespace) -> None:
+    # Settings are read on first use, so the provider has to be chosen before importing the app
+    os.environ["LLM_PROVIDER"] = args.provider
+
+    from app.database import init_db
+    from app.services.llm_cache import get_llm_cache
+    from app.services.llm_governor import LLMUnavailableError
+    from app.services.llm_providers import get_llm_provider
+    from app.services.llm_service import generate_grant_application, is_section_fallback
+    from benchmarks.bench_generation_strategies import SAMPLE_ORG
+
+    init_db()
+    provider = get_llm_provider()
+
+    def one_request(index: int) -> tuple:
+        # Only `distinct` different organizations, so repeated requests can hit the cache
+        org_data = dict(SAMPLE_ORG, organization_name=f"{SAMPLE_ORG['organization_name']} #{index % args.distinct}")
+        start = time.perf_counter()
+        try:
+            sections = generate_grant_application(
+                SAMPLE_GRANT,
+                org_data,
+                max_concurrency=args.section_concurrency,
+                use_cache=not args.no_cache,
+                strategy=args.strategy
+            )
+        except LLMUnavailableError:
+            return time.perf_counter() - start, None
+        return time.perf_counter() - start, sum(1 for content in sections.values() if is_section_fallback(content))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        results = list(executor.map(one_request, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    timings = sorted(duration for duration, _ in results)
+    unavailable = sum(1 for _, fallbacks in results if fallbacks is None)
+    fallbacks = sum(fallbacks for _, fallbacks in results if fallbacks)
+    p95 = timings[max(0, int(round(0.95 * len(timings))) - 1)]
+
+    print(f"provider={provider.name} model={provider.model} strategy={args.strategy} cache={not args.no_cache}")
+    print(f"requests:           {args.requests} from {args.clients} clients in {elapsed:.2f}s "
+          f"({args.requests / elapsed:.2f} req/s)")
+    print(f"latency p50/p95/max {statistics.median(timings):.2f}s / {p95:.2f}s / {timings[-1]:.2f}s")
+    print(f"unavailable (503):  {unavailable}")
+    print(f"placeholder sections: {fallbacks}")
+    print(f"cache:              {get_llm_cache().stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--distinct", type=int, default=5, help="distinct organizations across requests")
+    parser.add_argument("--section-concurrency", type=int, default=None)
+    parser.add_argument("--strategy", choices=["per_section", "single_call"], default="per_section")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--provider", default="fake")
+    run(parser.parse_args())
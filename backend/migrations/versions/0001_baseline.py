@@ -0,0 +1,19 @@
+"""Baseline: the schema init_db created before migrations were introduced
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,29 @@
+"""Composite indexes for the grant listing filters and deadline ordering
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_grants_status_deadline": ["status", "deadline"],
+    "ix_grants_source_type_deadline": ["source_type", "deadline"],
+    "ix_grants_status_source_type_deadline": ["status", "source_type", "deadline"],
+}
+
+
+def upgrade() -> None:
+    # create_all already builds these on new databases
+    for name, columns in INDEXES.items():
+        op.create_index(name, "grants", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="grants", if_exists=True)
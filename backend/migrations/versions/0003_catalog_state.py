@@ -0,0 +1,45 @@
+"""Grant catalog version counter, bumped by triggers on every grant change
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+BUMP = "UPDATE catalog_state SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE name = 'grants';"
+TRIGGERS = {
+    "catalog_state_grants_insert": "AFTER INSERT ON grants",
+    "catalog_state_grants_update": "AFTER UPDATE ON grants",
+    "catalog_state_grants_delete": "AFTER DELETE ON grants",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("catalog_state"):
+        op.create_table(
+            "catalog_state",
+            sa.Column("name", sa.String(), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    # Only SQLite has the trigger syntax below. Without triggers there is no
+    # 'grants' row, and list responses are served without validators.
+    if bind.dialect.name == "sqlite":
+        op.execute("INSERT INTO catalog_state (name, version) VALUES ('grants', 1)")
+        for name, event in TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {BUMP} END")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("catalog_state")
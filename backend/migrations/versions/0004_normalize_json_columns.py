@@ -0,0 +1,69 @@
+"""Normalize the JSON text columns so every value decodes
+
+The JSON columns are now read through the JSONText type, which decodes on
+load. Values written by hand before then could be empty strings or plain
+text; those become NULL, or a one-item list for list columns.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# table -> {column: whether it holds a list}
+JSON_COLUMNS = {
+    "grants": {
+        "eligibility_criteria": True,
+        "required_documents": True,
+        "target_populations": True,
+        "funding_priorities": True,
+    },
+    "applications": {"sections": False},
+    "user_profiles": {
+        "accreditations": True,
+        "populations_served": True,
+        "additional_info": False,
+    },
+}
+
+
+def _normalized(raw: str, is_list: bool):
+    """Replacement for a stored value, or raw itself if it already decodes"""
+    if not raw.strip():
+        return None
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return json.dumps([raw]) if is_list else None
+    return None if value is None else raw
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table, columns in JSON_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        for column, is_list in columns.items():
+            rows = bind.execute(sa.text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")).fetchall()
+            updates = []
+            for row_id, raw in rows:
+                value = _normalized(raw, is_list)
+                if value != raw:
+                    updates.append({"id": row_id, "value": value})
+            if updates:
+                print(f"Normalizing {len(updates)} invalid JSON value(s) in {table}.{column}")
+                bind.execute(sa.text(f"UPDATE {table} SET {column} = :value WHERE id = :id"), updates)
+
+
+def downgrade() -> None:
+    # The normalized values are still valid for the old Text columns
+    pass
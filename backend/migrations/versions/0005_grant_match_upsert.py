@@ -0,0 +1,45 @@
+"""Unique (user_id, grant_id) on grant_matches for upserts, plus scoring metadata
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+COLUMNS = {
+    "scored_at": sa.DateTime(timezone=True),
+    "catalog_version": sa.Integer(),
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = {column["name"] for column in sa.inspect(bind).get_columns("grant_matches")}
+    # create_all already adds these on new databases
+    for name, type_ in COLUMNS.items():
+        if name not in existing:
+            op.add_column("grant_matches", sa.Column(name, type_))
+
+    # Keep the newest row of any duplicate pair so the unique index can be built
+    op.execute(
+        "DELETE FROM grant_matches WHERE id NOT IN "
+        "(SELECT MAX(id) FROM grant_matches GROUP BY user_id, grant_id)"
+    )
+    op.create_index("uq_grant_matches_user_grant", "grant_matches", ["user_id", "grant_id"],
+                    unique=True, if_not_exists=True)
+    op.create_index("ix_grant_matches_user_overall", "grant_matches", ["user_id", "overall_score"],
+                    if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_grant_matches_user_overall", table_name="grant_matches", if_exists=True)
+    op.drop_index("uq_grant_matches_user_grant", table_name="grant_matches", if_exists=True)
+    with op.batch_alter_table("grant_matches") as batch:
+        for name in COLUMNS:
+            batch.drop_column(name)
@@ -0,0 +1,25 @@
+"""claimed_at on idempotency_keys, so stale in-progress claims can be taken over
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # create_all already adds it on new databases; existing claims fall back to created_at
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("idempotency_keys")}
+    if "claimed_at" not in existing:
+        op.add_column("idempotency_keys", sa.Column("claimed_at", sa.DateTime(timezone=True)))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("idempotency_keys") as batch:
+        batch.drop_column("claimed_at")
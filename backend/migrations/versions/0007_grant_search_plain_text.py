@@ -0,0 +1,37 @@
+"""Drop the external-content grants_fts index so it is rebuilt from plain text
+
+The old index mirrored the grants table, so its list columns were raw JSON
+and search snippets showed brackets and quotes. install_grant_search (run
+after the migrations) recreates the index and its triggers and re-indexes
+every grant.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    definition = bind.execute(
+        sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'grants_fts'")
+    ).scalar()
+    if definition is None or "content=" not in definition:
+        return
+    for trigger in ("grants_fts_insert", "grants_fts_delete", "grants_fts_update"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE grants_fts")
+
+
+def downgrade() -> None:
+    # The plain-text index works with the previous code as well
+    pass
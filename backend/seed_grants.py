@@ -5,7 +5,6 @@ import sys
 from datetime import datetime, timedelta
 from app.database import SessionLocal, init_db
 from app.models.grant import Grant
-import json
 
 # Initialize database
 init_db()
@@ -22,40 +21,40 @@ sample_grants = [
         "amount_max": 250000.0,
         "deadline": datetime.now() + timedelta(days=45),
         "application_opens": datetime.now() - timedelta(days=7),
-        "eligibility_criteria": json.dumps([
+        "eligibility_criteria": [
             "Licensed child care provider in Oregon",
             "Serve children ages 3-5",
             "Minimum 75% enrollment from low-income families",
             "Quality rating of 3+ stars in Oregon SPARK system (or commitment to achieve)",
             "Willingness to participate in professional development",
             "Ability to provide full-day programming"
-        ]),
-        "required_documents": json.dumps([
+        ],
+        "required_documents": [
             "Current Oregon child care license",
             "Program budget for grant period",
             "Staff qualifications and background checks",
             "Enrollment demographics",
             "Quality improvement plan",
             "Parent engagement strategy"
-        ]),
+        ],
         "application_url": "https://oregon.gov/delc/programs/Pages/preschool-promise.aspx",
         "contact_email": "psp.program@delc.oregon.gov",
         "contact_phone": "503-947-1400",
         "geographic_restriction": "statewide",
-        "target_populations": json.dumps([
+        "target_populations": [
             "Low-income families (at or below 200% FPL)",
             "Children ages 3-5",
             "Working families",
             "Families experiencing homelessness",
             "Children with disabilities"
-        ]),
-        "funding_priorities": json.dumps([
+        ],
+        "funding_priorities": [
             "Equity and inclusion for historically underserved communities",
             "High-quality, culturally responsive programming",
             "Support for dual language learners",
             "Comprehensive services (health, nutrition, family support)",
             "Staff compensation and professional development"
-        ]),
+        ],
         "status": "active"
     },
     {
@@ -68,7 +67,7 @@ sample_grants = [
         "amount_max": 2000000.0,
         "deadline": datetime.now() + timedelta(days=60),
         "application_opens": datetime.now() - timedelta(days=14),
-        "eligibility_criteria": json.dumps([
+        "eligibility_criteria": [
             "Licensed or license-ready child care provider",
             "Project creates minimum 20 new child care slots",
             "Located in Oregon",
@@ -76,8 +75,8 @@ sample_grants = [
             "Financial capacity to operate expanded facility",
             "Site control or ownership",
             "All required permits obtainable"
-        ]),
-        "required_documents": json.dumps([
+        ],
+        "required_documents": [
             "Detailed project budget and timeline",
             "Site plans and architectural drawings",
             "Proof of site control or ownership",
@@ -86,26 +85,26 @@ sample_grants = [
             "Business plan for expanded operations",
             "Letters of support from community partners",
             "Environmental and zoning documentation"
-        ]),
+        ],
         "application_url": "https://www.oregon.gov/biz/programs/child_care_infrastructure/pages/default.aspx",
         "contact_email": "childcare.infrastructure@biz.oregon.gov",
         "contact_phone": "503-986-0123",
         "geographic_restriction": "statewide",
-        "target_populations": json.dumps([
+        "target_populations": [
             "Infants and toddlers (0-3)",
             "Preschool children (3-5)",
             "School-age children",
             "Rural communities",
             "Child care deserts"
-        ]),
-        "funding_priorities": json.dumps([
+        ],
+        "funding_priorities": [
             "Projects in child care deserts",
             "Infant and toddler care expansion",
             "Rural and underserved communities",
             "Culturally specific providers",
             "Projects serving low-income families",
             "Energy-efficient and sustainable design"
-        ]),
+        ],
         "status": "active"
     },
     {
@@ -118,40 +117,40 @@ sample_grants = [
         "amount_max": 25000.0,
         "deadline": datetime.now() + timedelta(days=30),
         "application_opens": datetime.now() - timedelta(days=3),
-        "eligibility_criteria": json.dumps([
+        "eligibility_criteria": [
             "Licensed child care provider in Oregon",
             "Enrolled or willing to enroll in Oregon SPARK",
             "Serve children ages 0-5",
             "Committed to quality improvement",
             "Complete quality improvement plan",
             "Participate in SPARK coaching and assessment"
-        ]),
-        "required_documents": json.dumps([
+        ],
+        "required_documents": [
             "Current Oregon license",
             "SPARK enrollment confirmation",
             "Quality improvement plan",
             "Budget for proposed improvements",
             "Current quality rating (if applicable)",
             "Photos of areas to be improved"
-        ]),
+        ],
         "application_url": "https://oregonspark.org/early-educators/grants/",
         "contact_email": "grants@oregonspark.org",
         "contact_phone": "503-415-4702",
         "geographic_restriction": "statewide",
-        "target_populations": json.dumps([
+        "target_populations": [
             "Infants and toddlers",
             "Preschool children",
             "Children with special needs",
             "Dual language learners"
-        ]),
-        "funding_priorities": json.dumps([
+        ],
+        "funding_priorities": [
             "Learning environment improvements",
             "Evidence-based curriculum adoption",
             "Inclusive practices for children with disabilities",
             "Culturally responsive materials",
             "Outdoor learning environments",
             "STEM and literacy materials"
-        ]),
+        ],
         "status": "active"
     },
     {
@@ -164,7 +163,7 @@ sample_grants = [
         "amount_max": 100000.0,
         "deadline": datetime.now() + timedelta(days=75),
         "application_opens": datetime.now() - timedelta(days=21),
-        "eligibility_criteria": json.dumps([
+        "eligibility_criteria": [
             "Nonprofit organization or fiscal sponsor",
             "Serving Oregon communities",
             "Focus on children ages 0-5",
@@ -172,8 +171,8 @@ sample_grants = [
             "Strong community partnerships",
             "Sustainable program model",
             "Clear outcomes and evaluation plan"
-        ]),
-        "required_documents": json.dumps([
+        ],
+        "required_documents": [
             "501(c)(3) determination letter",
             "Program narrative (5-10 pages)",
             "Detailed budget and budget narrative",
@@ -182,19 +181,19 @@ sample_grants = [
             "Letters of support (minimum 3)",
             "Equity statement and action plan",
             "Evaluation and sustainability plan"
-        ]),
+        ],
         "application_url": "https://collinsfoundation.org/apply",
         "contact_email": "info@collinsfoundation.org",
         "contact_phone": "503-227-7171",
         "geographic_restriction": "statewide",
-        "target_populations": json.dumps([
+        "target_populations": [
             "Communities of color",
             "Low-income families",
             "Rural communities",
             "Immigrant and refugee families",
             "Families experiencing homelessness"
-        ]),
-        "funding_priorities": json.dumps([
+        ],
+        "funding_priorities": [
             "Racial equity and inclusion",
             "Culturally specific programming",
             "Community-based approaches",
@@ -202,7 +201,7 @@ sample_grants = [
             "Staff diversity and training",
             "Trauma-informed practices",
             "Two-generation approaches"
-        ]),
+        ],
         "status": "active"
     },
     {
@@ -215,7 +214,7 @@ sample_grants = [
         "amount_max": 75000.0,
         "deadline": datetime.now() + timedelta(days=50),
         "application_opens": datetime.now() - timedelta(days=10),
-        "eligibility_criteria": json.dumps([
+        "eligibility_criteria": [
             "Located in rural Oregon (population <30,000)",
             "Licensed or license-ready child care provider",
             "Serve children ages 0-5",
@@ -223,8 +222,8 @@ sample_grants = [
             "Financially stable or path to stability",
             "Commitment to quality improvement",
             "Willingness to participate in technical assistance"
-        ]),
-        "required_documents": json.dumps([
+        ],
+        "required_documents": [
             "Current license or license application",
             "Community needs assessment",
             "Program budget and financial statements",
@@ -232,19 +231,19 @@ sample_grants = [
             "Letters of community support",
             "Staff qualifications",
             "Sustainability plan"
-        ]),
+        ],
         "application_url": "https://tfff.org/grants/apply",
         "contact_email": "grants@tfff.org",
         "contact_phone": "541-957-5574",
         "geographic_restriction": "rural",
-        "target_populations": json.dumps([
+        "target_populations": [
             "Rural families",
             "Working families",
             "Low-income families",
             "Agricultural workers",
             "Families with limited child care options"
-        ]),
-        "funding_priorities": json.dumps([
+        ],
+        "funding_priorities": [
             "Increasing child care slots in rural areas",
             "Infant and toddler care",
             "Non-traditional hours care",
@@ -252,7 +251,7 @@ sample_grants = [
             "Staff recruitment and retention",
             "Business sustainability",
             "Community partnerships"
-        ]),
+        ],
         "status": "active"
     },
     {
@@ -265,7 +264,7 @@ sample_grants = [
         "amount_max": 150000.0,
         "deadline": datetime.now() + timedelta(days=90),
         "application_opens": datetime.now() - timedelta(days=5),
-        "eligibility_criteria": json.dumps([
+        "eligibility_criteria": [
             "Oregon-based nonprofit or tribal organization",
             "Early learning or child care focus",
             "Community-led or culturally specific program",
@@ -273,8 +272,8 @@ sample_grants = [
             "Meaningful community engagement",
             "Leadership from impacted communities",
             "Collaboration and partnership approach"
-        ]),
-        "required_documents": json.dumps([
+        ],
+        "required_documents": [
             "Organizational background and mission",
             "Program description and theory of change",
             "Equity framework and implementation plan",
@@ -283,20 +282,20 @@ sample_grants = [
             "Outcomes and evaluation approach",
             "Letters of partnership/support",
             "Board and leadership demographics"
-        ]),
+        ],
         "application_url": "https://mmt.org/apply",
         "contact_email": "mmt@mmt.org",
         "contact_phone": "503-228-5512",
         "geographic_restriction": "statewide",
-        "target_populations": json.dumps([
+        "target_populations": [
             "Black, Indigenous, and people of color",
             "Immigrant and refugee families",
             "LGBTQ+ families",
             "Families with disabilities",
             "Low-income families",
             "Tribal communities"
-        ]),
-        "funding_priorities": json.dumps([
+        ],
+        "funding_priorities": [
             "Community-led and culturally specific programs",
             "Anti-racist and inclusive practices",
             "Leadership development from impacted communities",
@@ -304,7 +303,7 @@ sample_grants = [
             "Healing-centered approaches",
             "Parent and family leadership",
             "Cross-sector collaboration"
-        ]),
+        ],
         "status": "active"
     },
     {
@@ -317,7 +316,7 @@ sample_grants = [
         "amount_max": 50000.0,
         "deadline": datetime.now() + timedelta(days=40),
         "application_opens": datetime.now() - timedelta(days=7),
-        "eligibility_criteria": json.dumps([
+        "eligibility_criteria": [
             "501(c)(3) nonprofit in Oregon",
             "Early learning or child care programming",
             "Serve children ages 0-5",
@@ -325,8 +324,8 @@ sample_grants = [
             "Strong organizational capacity",
             "Clear program outcomes",
             "Financial stability"
-        ]),
-        "required_documents": json.dumps([
+        ],
+        "required_documents": [
             "Letter of intent (2 pages)",
             "Full proposal (if invited)",
             "Program budget",
@@ -335,18 +334,18 @@ sample_grants = [
             "Board list and demographics",
             "Financial statements",
             "Program evaluation data"
-        ]),
+        ],
         "application_url": "https://oregoncf.org/grants-and-scholarships/apply",
         "contact_email": "grants@oregoncf.org",
         "contact_phone": "503-802-2335",
         "geographic_restriction": "statewide",
-        "target_populations": json.dumps([
+        "target_populations": [
             "Children ages 0-5",
             "Low to moderate income families",
             "Underserved communities",
             "Children at risk of poor outcomes"
-        ]),
-        "funding_priorities": json.dumps([
+        ],
+        "funding_priorities": [
             "Evidence-based programming",
             "School readiness outcomes",
             "Family engagement and support",
@@ -354,7 +353,7 @@ sample_grants = [
             "Collaborative approaches",
             "Innovation and best practices",
             "Sustainability and impact"
-        ]),
+        ],
         "status": "active"
     },
     {
@@ -367,7 +366,7 @@ sample_grants = [
         "amount_max": 35000.0,
         "deadline": datetime.now() + timedelta(days=55),
         "application_opens": datetime.now() - timedelta(days=12),
-        "eligibility_criteria": json.dumps([
+        "eligibility_criteria": [
             "Nonprofit organization serving Oregon",
             "Focus on children ages 3-5",
             "Evidence-based curriculum or approach",
@@ -375,8 +374,8 @@ sample_grants = [
             "Parent and family engagement component",
             "Outcomes measurement plan",
             "Sustainable program model"
-        ]),
-        "required_documents": json.dumps([
+        ],
+        "required_documents": [
             "Program description and goals",
             "Budget and budget narrative",
             "Curriculum overview",
@@ -385,18 +384,18 @@ sample_grants = [
             "Family engagement strategy",
             "Letters of support",
             "Photos or videos of program (optional)"
-        ]),
+        ],
         "application_url": "https://pnc.com/about-pnc/corporate-responsibility/philanthropic-investments/grow-up-great.html",
         "contact_email": "growupgreat@pnc.com",
         "contact_phone": "877-762-2968",
         "geographic_restriction": "statewide",
-        "target_populations": json.dumps([
+        "target_populations": [
             "Preschool children (ages 3-5)",
             "Low to moderate income families",
             "Children in underserved communities",
             "Children at risk of school failure"
-        ]),
-        "funding_priorities": json.dumps([
+        ],
+        "funding_priorities": [
             "School readiness skills",
             "STEM and early literacy",
             "Social-emotional development",
@@ -404,7 +403,7 @@ sample_grants = [
             "Family engagement in learning",
             "Technology and innovation",
             "Measurable outcomes"
-        ]),
+        ],
         "status": "active"
     }
 ]
@@ -0,0 +1,132 @@
+"""
+Tests for the vectorized grant matcher
+
+Scores a profile against a small catalog where each grant differs from a
+baseline in one way (area, deadline, license, populations), and checks that
+saving the scores twice upserts instead of duplicating rows.
+"""
+import os
+from datetime import datetime, timezone
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.grant import Grant, GrantMatch
+from app.models.user import UserProfile
+from app.services.grant_matcher import (
+    REASONS,
+    REASON_CLOSED,
+    REASON_LICENSE,
+    REASON_OUTSIDE_AREA,
+    build_grant_matrix,
+    reasons_for,
+    save_grant_matches,
+    score_profile,
+)
+
+NOW = datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+BASELINE = {
+    "source_name": "Oregon DELC",
+    "source_type": "state",
+    "amount_min": 10000.0,
+    "amount_max": 50000.0,
+    "deadline": datetime(2027, 3, 1),
+    "eligibility_criteria": ["Serve children ages 3-5"],
+    "required_documents": ["Budget"],
+    "geographic_restriction": "statewide",
+    "target_populations": ["Rural families"],
+    "funding_priorities": ["Dual language learners"],
+    "status": "active",
+}
+
+GRANTS = {
+    "baseline": {},
+    "other_county": {"geographic_restriction": "Lane County"},
+    "past_deadline": {"deadline": datetime(2026, 12, 1)},
+    "needs_license": {"eligibility_criteria": ["Licensed child care provider"]},
+    "populations": {"target_populations": ["Low-income families"]},
+    "closed": {"status": "closed"},
+}
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'matches.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        for title, overrides in GRANTS.items():
+            session.add(Grant(title=title, **{**BASELINE, **overrides}))
+        session.commit()
+        yield session
+
+
+@pytest.fixture()
+def profile():
+    return UserProfile(
+        user_id=1,
+        organization_name="Sprouts",
+        county="Marion County",
+        licensed=False,
+        operating_budget=200000.0,
+        mission_statement="Quality early learning",
+        populations_served=["Low-income families"],
+    )
+
+
+def _scores_by_title(db, profile):
+    matrix = build_grant_matrix(db)
+    scores = score_profile(matrix, profile, now=NOW)
+    titles = dict(db.query(Grant.id, Grant.title).all())
+    return {
+        titles[grant_id]: {
+            "eligibility": scores.eligibility[row],
+            "overall": scores.overall[row],
+            "mask": int(scores.reason_masks[row]),
+        }
+        for row, grant_id in enumerate(matrix.ids.tolist())
+    }
+
+
+def test_only_active_grants_are_scored(db, profile):
+    assert set(_scores_by_title(db, profile)) == set(GRANTS) - {"closed"}
+
+
+def test_ineligible_grants_score_zero_with_a_reason(db, profile):
+    scores = _scores_by_title(db, profile)
+    for title, reason in (("other_county", REASON_OUTSIDE_AREA), ("past_deadline", REASON_CLOSED)):
+        assert scores[title]["eligibility"] == 0
+        assert scores[title]["overall"] == 0
+        assert REASONS[reason] in reasons_for(scores[title]["mask"])
+    assert scores["baseline"]["overall"] > 0
+
+
+def test_license_and_population_adjust_eligibility(db, profile):
+    scores = _scores_by_title(db, profile)
+    baseline = scores["baseline"]["eligibility"]
+    assert scores["needs_license"]["eligibility"] == pytest.approx(baseline * 0.5, abs=0.1)
+    assert REASONS[REASON_LICENSE] in reasons_for(scores["needs_license"]["mask"])
+    assert scores["populations"]["eligibility"] > baseline
+
+    profile.licensed = True
+    assert _scores_by_title(db, profile)["needs_license"]["eligibility"] == baseline
+
+
+def test_saving_twice_upserts(db, profile):
+    matrix = build_grant_matrix(db)
+    save_grant_matches(db, profile.user_id, matrix, score_profile(matrix, profile, now=NOW))
+    profile.licensed = True
+    save_grant_matches(db, profile.user_id, matrix, score_profile(matrix, profile, now=NOW))
+
+    assert db.query(GrantMatch).count() == len(matrix)
+    needs_license = db.query(GrantMatch).join(Grant).filter(Grant.title == "needs_license").one()
+    assert REASONS[REASON_LICENSE] not in needs_license.match_reasons
+
+    db.query(Grant).filter(Grant.title == "baseline").update({"status": "closed"})
+    matrix = build_grant_matrix(db)
+    save_grant_matches(db, profile.user_id, matrix, score_profile(matrix, profile, now=NOW))
+    assert db.query(GrantMatch).count() == len(matrix) == len(GRANTS) - 2
@@ -0,0 +1,100 @@
+"""
+Query-plan regression test for the grant listing filters
+
+Builds the listing query for every filter combination (with and without a
+keyset cursor) the way GET /grants does, and checks with EXPLAIN QUERY PLAN
+that SQLite answers it from an index: no full table scan and no temporary
+B-tree for the deadline ordering. Dropping or reshaping one of the composite
+indexes, or changing the filters so they no longer match them, fails here.
+"""
+import itertools
+import os
+from datetime import datetime
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.database import Base, run_migrations
+from app.models.grant import Grant
+from app.services.grant_queries import filter_grants, order_by_deadline
+from app.services.pagination import keyset_after
+
+COMPOSITE_INDEXES = [
+    "ix_grants_status_deadline",
+    "ix_grants_source_type_deadline",
+    "ix_grants_status_source_type_deadline",
+]
+
+FILTERS = {
+    "status": "active",
+    "source_type": "state",
+    "min_amount": 10000.0,
+    "max_amount": 50000.0,
+}
+
+CURSORS = {
+    "first_page": None,
+    "after_deadline": (datetime(2025, 6, 30), 42),
+    "after_null_deadline": (None, 42),
+}
+
+
+def _filter_combinations():
+    names = list(FILTERS)
+    for size in range(len(names) + 1):
+        for combination in itertools.combinations(names, size):
+            yield {name: FILTERS[name] for name in combination}
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    """Database laid out like an existing deployment: tables first, indexes from the migration"""
+    path = tmp_path_factory.mktemp("plans") / "grants.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for name in COMPOSITE_INDEXES:
+            connection.execute(text(f"DROP INDEX {name}"))
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+def _query_plan(engine, query):
+    compiled = query.statement.compile(dialect=engine.dialect)
+    params = [compiled.params[name] for name in compiled.positiontup]
+    params = [value.isoformat(" ") if isinstance(value, datetime) else value for value in params]
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", tuple(params)).fetchall()
+    return [row[-1] for row in rows]
+
+
+def test_migration_creates_composite_indexes(engine):
+    with engine.connect() as connection:
+        names = {row[0] for row in connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'grants'")
+        )}
+    assert set(COMPOSITE_INDEXES) <= names
+
+
+@pytest.mark.parametrize("cursor", list(CURSORS.values()), ids=list(CURSORS))
+@pytest.mark.parametrize(
+    "filters",
+    list(_filter_combinations()),
+    ids=lambda filters: "+".join(filters) or "no_filters"
+)
+def test_listing_uses_an_index(engine, filters, cursor):
+    with Session(engine) as session:
+        query = order_by_deadline(filter_grants(session.query(Grant), **filters))
+        if cursor:
+            query = query.filter(keyset_after(Grant.deadline, Grant.id, *cursor))
+        plan = _query_plan(engine, query.limit(21))
+
+    details = "\n".join(plan)
+    assert not any(step.startswith("SCAN grants") and "USING" not in step for step in plan), details
+    assert "USE TEMP B-TREE" not in details, details
+    if "status" in filters or "source_type" in filters:
+        assert any(step.startswith("SEARCH grants USING INDEX") for step in plan), details
@@ -0,0 +1,62 @@
+"""
+Tests for full-text grant search
+
+The list columns are stored as JSON, but the index holds their items as
+plain text, so snippets read like prose and stay in sync through the
+triggers.
+"""
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.grant import Grant
+from app.services.grant_search import SNIPPET_END, SNIPPET_START, install_grant_search, search_grants
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        # Indexed by the rebuild when the search is installed
+        session.add(Grant(
+            title="Facility Grant",
+            source_name="Oregon DELC",
+            funding_priorities=["Increasing child care slots", "Rural families"],
+        ))
+        session.commit()
+        assert install_grant_search(engine)
+        yield session
+
+
+def _snippets(db, q):
+    query, _ = search_grants(db.query(Grant), q)
+    return {grant.title: snippet for grant, snippet, _ in query.all()}
+
+
+def test_list_columns_are_indexed_as_plain_text(db):
+    mark = lambda word: f"{SNIPPET_START}{word}{SNIPPET_END}"
+    assert _snippets(db, "child care") == {
+        "Facility Grant": f"Increasing {mark('child')} {mark('care')} slots; Rural families"
+    }
+
+
+def test_triggers_index_plain_text(db):
+    grant = Grant(title="Meals", source_name="USDA", eligibility_criteria=["Serves free lunch"])
+    db.add(grant)
+    db.commit()
+    assert _snippets(db, "lunch") == {"Meals": f"Serves free {SNIPPET_START}lunch{SNIPPET_END}"}
+
+    grant.eligibility_criteria = ["Serves breakfast"]
+    db.commit()
+    assert _snippets(db, "lunch") == {}
+    assert set(_snippets(db, "breakfast")) == {"Meals"}
+
+    db.delete(grant)
+    db.commit()
+    assert _snippets(db, "breakfast") == {}
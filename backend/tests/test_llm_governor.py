@@ -0,0 +1,63 @@
+"""
+Tests for the upstream governor's circuit breaker
+
+A half-open breaker lets one probe through. Whatever ends that probe,
+including the rate limiter refusing to wait for budget, has to clear it, or
+every later call fails with "LLM provider is recovering" until a restart.
+"""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+
+from app.services.llm_governor import LLMUnavailableError, UpstreamGovernor
+from app.services.llm_providers import LLMProviderError
+
+RESET_SECONDS = 0.05
+
+
+def _outage() -> None:
+    raise LLMProviderError("Service unavailable", status_code=503, retryable=True)
+
+
+@pytest.fixture()
+def governor():
+    """Breaker that opens on one failure; one request per minute, so the second acquire can't wait"""
+    governor = UpstreamGovernor(
+        requests_per_minute=1,
+        tokens_per_minute=1_000_000,
+        max_retries=0,
+        base_delay=0.001,
+        max_delay=0.001,
+        max_wait=1.0,
+        failure_threshold=1,
+        reset_seconds=RESET_SECONDS
+    )
+    with pytest.raises(LLMUnavailableError):
+        governor.call(_outage)
+    assert governor.breaker.state == "open"
+    time.sleep(RESET_SECONDS * 2)
+    return governor
+
+
+def test_acquire_timeout_releases_half_open_probe(governor):
+    with pytest.raises(LLMUnavailableError, match="budget exhausted"):
+        governor.call(lambda: "ok")
+    assert governor.breaker.state == "half_open"
+    assert not governor.breaker._probe_in_flight
+
+    # The next caller becomes the probe instead of being told the provider is recovering
+    with pytest.raises(LLMUnavailableError, match="budget exhausted"):
+        governor.call(lambda: "ok")
+
+
+def test_async_acquire_timeout_releases_half_open_probe(governor):
+    async def ok():
+        return "ok"
+
+    with pytest.raises(LLMUnavailableError, match="budget exhausted"):
+        asyncio.run(governor.acall(ok))
+    assert not governor.breaker._probe_in_flight
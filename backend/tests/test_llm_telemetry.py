@@ -0,0 +1,59 @@
+"""
+Tests for LLM call telemetry
+
+Rows are buffered and written by a background thread, but the stats have
+to include every call recorded so far, including the rows the writer is
+about to insert.
+"""
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base
+from app.services import llm_telemetry
+from app.services.llm_telemetry import flush_llm_telemetry, llm_call_stats, record_llm_call, stop_llm_telemetry
+
+
+@pytest.fixture()
+def db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'telemetry.db'}")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(llm_telemetry, "SessionLocal", sessionmaker(bind=engine))
+    with Session(engine) as session:
+        yield session
+    stop_llm_telemetry()
+
+
+def _stats(db):
+    return {(row["operation"], row["section"]): row for row in llm_call_stats(db)}
+
+
+def test_stats_include_calls_recorded_just_now(db):
+    for latency in (100.0, 200.0, 300.0, 400.0, 500.0):
+        record_llm_call("section", "success", section="need_statement", cache_status="miss", latency_ms=latency)
+    # Give the writer thread time to pick the rows up without writing them yet
+    time.sleep(0.05)
+
+    stats = _stats(db)[("section", "need_statement")]
+    assert stats["calls"] == 5
+    assert stats["latency_p50_ms"] == 300.0
+    assert flush_llm_telemetry() == 0
+
+
+def test_coalesced_waiters_are_counted_apart(db):
+    record_llm_call("refine", "error", cache_status="miss", latency_ms=1000.0, error=TimeoutError("upstream"))
+    for waited in (1500.0, 2500.0):
+        record_llm_call("refine", "error", cache_status="coalesced", latency_ms=waited, error=TimeoutError("upstream"))
+    record_llm_call("refine", "success", cache_status="hit", latency_ms=1.0)
+
+    stats = _stats(db)[("refine", None)]
+    assert stats["calls"] == 4
+    assert stats["errors"] == 1
+    assert stats["coalesced"] == 2
+    assert stats["cache_hits"] == 1
+    assert stats["latency_p50_ms"] == stats["latency_p95_ms"] == 1000.0
@@ -1,6 +1,6 @@
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
-import { applicationAPI } from '../../services/api';
+import { applicationAPI, profileAPI } from '../../services/api';
 import { ArrowLeft, Sparkles, Wand2 } from 'lucide-react';
 import Layout from '../common/Layout';
 
@@ -10,6 +10,8 @@ export default function ApplicationForm() {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [generatingField, setGeneratingField] = useState(null);
+  // Same key for repeated submits of unchanged data, so retries and double clicks don't create duplicates
+  const idempotencyKey = useRef(crypto.randomUUID());
 
   const [formData, setFormData] = useState({
     organization_name: '',
@@ -26,8 +28,64 @@ export default function ApplicationForm() {
     community_impact: ''
   });
 
+  const suggestionOrgData = (data) => ({
+    organization_name: data.organization_name,
+    organization_type: data.organization_type,
+    city: data.city,
+    mission_statement: data.mission_statement,
+    current_enrollment: parseInt(data.current_enrollment) || 0,
+    operating_budget: parseFloat(data.operating_budget) || 0,
+    staff_count: parseInt(data.staff_count) || 0
+  });
+
+  // Pre-fill from the saved profile; its suggestions were precomputed when it was saved
+  useEffect(() => {
+    let cancelled = false;
+
+    const prefill = async () => {
+      let profile;
+      try {
+        profile = (await profileAPI.get()).data;
+      } catch {
+        return; // No profile yet
+      }
+      if (cancelled) return;
+
+      const orgData = {
+        organization_name: profile.organization_name || '',
+        organization_type: profile.organization_type || 'Child Care Center',
+        city: profile.city || '',
+        mission_statement: profile.mission_statement || '',
+        current_enrollment: profile.current_enrollment ?? '',
+        operating_budget: profile.operating_budget ?? '',
+        staff_count: profile.staff_count ?? ''
+      };
+      setFormData(prev => ({ ...prev, ...orgData }));
+
+      if (!orgData.organization_name || !orgData.city || !orgData.mission_statement) return;
+      try {
+        const response = await applicationAPI.getPersonalizationSuggestions(suggestionOrgData(orgData));
+        if (cancelled) return;
+        // Keep anything the user already typed
+        setFormData(prev => {
+          const next = { ...prev };
+          Object.entries(response.data.suggestions).forEach(([field, suggestion]) => {
+            if (!next[field]) next[field] = suggestion;
+          });
+          return next;
+        });
+      } catch (err) {
+        console.error(err);
+      }
+    };
+
+    prefill();
+    return () => { cancelled = true; };
+  }, []);
+
   const handleChange = (e) => {
     const { name, value } = e.target;
+    idempotencyKey.current = crypto.randomUUID();
     setFormData(prev => ({
       ...prev,
       [name]: value
@@ -45,16 +103,9 @@ export default function ApplicationForm() {
     setError(null);
 
     try {
-      const response = await applicationAPI.getPersonalizationSuggestion(fieldName, {
-        organization_name: formData.organization_name,
-        organization_type: formData.organization_type,
-        city: formData.city,
-        mission_statement: formData.mission_statement,
-        current_enrollment: parseInt(formData.current_enrollment) || 0,
-        operating_budget: parseFloat(formData.operating_budget) || 0,
-        staff_count: parseInt(formData.staff_count) || 0
-      });
+      const response = await applicationAPI.getPersonalizationSuggestion(fieldName, suggestionOrgData(formData));
 
+      idempotencyKey.current = crypto.randomUUID();
       setFormData(prev => ({
         ...prev,
         [fieldName]: response.data.suggestion
@@ -82,7 +133,7 @@ export default function ApplicationForm() {
       };
 
       // Generate the application
-      const response = await applicationAPI.generate(parseInt(grantId), orgData);
+      const response = await applicationAPI.generate(parseInt(grantId), orgData, idempotencyKey.current);
 
       // Navigate to the application viewer
       navigate(`/applications/${response.data.id}`);
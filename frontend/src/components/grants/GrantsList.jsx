@@ -4,6 +4,12 @@ import api from '../../services/api';
 import { Calendar, DollarSign, MapPin, Award } from 'lucide-react';
 import Layout from '../common/Layout';
 
+// Only what the cards render; the rest of each grant is loaded on its detail page
+const CARD_FIELDS = [
+  'id', 'title', 'source_name', 'source_type', 'description', 'amount_min',
+  'amount_max', 'deadline', 'geographic_restriction', 'funding_priorities',
+].join(',');
+
 export default function GrantsList() {
   const [grants, setGrants] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -17,7 +23,7 @@ export default function GrantsList() {
   const fetchGrants = async () => {
     try {
       setLoading(true);
-      const response = await api.get('/grants');
+      const response = await api.get('/grants', { params: { fields: CARD_FIELDS } });
       setGrants(response.data.grants);
     } catch (err) {
       setError('Failed to load grants. Please try again.');
@@ -78,11 +78,18 @@ export const profileAPI = {
 export const grantAPI = {
   list: (params) => api.get('/grants', { params }),
   get: (id) => api.get(`/grants/${id}`),
+  facets: (params) => api.get('/grants/facets', { params }),
+  matches: (params) => api.get('/grants/matches', { params }),
+  refreshMatches: () => api.post('/grants/matches/refresh'),
 };
 
 // Application endpoints
 export const applicationAPI = {
-  generate: (grantId, orgData) => api.post('/applications/generate', { grant_id: grantId, org_data: orgData }),
+  generate: (grantId, orgData, idempotencyKey) => api.post(
+    '/applications/generate',
+    { grant_id: grantId, org_data: orgData },
+    idempotencyKey ? { headers: { 'Idempotency-Key': idempotencyKey } } : undefined
+  ),
   list: (params) => api.get('/applications', { params }),
   get: (id) => api.get(`/applications/${id}`),
   refine: (id, sectionName, feedback) => api.post(`/applications/${id}/refine`, { section_name: sectionName, feedback }),
@@ -92,4 +99,8 @@ export const applicationAPI = {
     field_name: fieldName,
     ...orgData
   }),
+  getPersonalizationSuggestions: (orgData, fieldNames) => api.post('/applications/personalization-suggestions', {
+    ...orgData,
+    ...(fieldNames ? { field_names: fieldNames } : {})
+  }),
 };